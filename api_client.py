@@ -0,0 +1,227 @@
+from jobstate import label, parse_timestamp
+from urllib3.util.retry import Retry
+from configs import configurations
+from helpers import take_recent
+from ordering import order_jobs
+import logging
+import urllib3
+import json
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+APPLIED_JOBS_QUERY = """
+query GetAppliedJobs($first: Int, $after: String, $locale: Locale) {
+  viewer {
+    appliedJobs(first: $first, after: $after) {
+      pageInfo { hasNextPage endCursor }
+      edges {
+        node {
+          id
+          isExpired
+          appliedAt { dateTimeUtc }
+          events { status label timestamp { dateTimeUtc } }
+          attachments { resume { fileName } coverLetter { fileName } }
+          applicantCount
+          job {
+            id
+            title
+            advertiser { name }
+            location { label(locale: $locale) }
+            salary { label }
+            classifications { label(locale: $locale) }
+            workTypes { label(locale: $locale) }
+            listedAt { dateTimeUtc }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def save_session(cookies, path):
+    """Save authenticated session cookies to a JSON file"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cookies, f, indent=2)
+    logger.info("Saved session cookies to %s", path)
+
+
+def load_session(path):
+    """Load session cookies saved by save_session"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class JobStreetApiClient:
+    """Read applied jobs from the JobStreet backend over plain HTTP
+
+    Needs only the cookies of an authenticated session, taken from a live
+    driver or from a saved session file, so the browser can be closed as
+    soon as login is done.
+    """
+
+    def __init__(self, cookies, page_size=20, timeout=None):
+        self.api_url = configurations["api_url"]
+        self.job_url = configurations["job_url"]
+        self.page_size = page_size
+        self.timeout = timeout or configurations["default_wait"]
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.http = urllib3.PoolManager(
+            num_pools=2,
+            maxsize=4,
+            retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=None,
+            ),
+        )
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Cookie": "; ".join(f"{c['name']}={c['value']}" for c in cookies),
+            "seek-request-brand": "jobstreet",
+            "seek-request-country": configurations["country"],
+            "User-Agent": configurations["user_agent"],
+        }
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """Build a client from the cookies of a logged in WebDriver"""
+        return cls(driver.get_cookies(), **kwargs)
+
+    @classmethod
+    def from_session_file(cls, path, **kwargs):
+        """Build a client from a session file written by save_session"""
+        return cls(load_session(path), **kwargs)
+
+    def _post(self, payload):
+        response = self.http.request(
+            "POST",
+            self.api_url,
+            body=json.dumps(payload).encode("utf-8"),
+            headers=self.headers,
+            timeout=self.timeout,
+        )
+        if response.status in (401, 403):
+            raise PermissionError(
+                "Session is not authenticated, log in again to refresh cookies"
+            )
+        if response.status != 200:
+            raise RuntimeError(f"Applied jobs request failed: HTTP {response.status}")
+
+        data = response.json()
+        if data.get("errors"):
+            raise RuntimeError(f"Applied jobs query error: {data['errors']}")
+        return data["data"]
+
+    def _iter_nodes(self):
+        after = None
+        page_num = 0
+        while True:
+            page_num += 1
+            data = self._post(
+                {
+                    "operationName": "GetAppliedJobs",
+                    "query": APPLIED_JOBS_QUERY,
+                    "variables": {
+                        "first": self.page_size,
+                        "after": after,
+                        "locale": configurations["locale"],
+                    },
+                }
+            )
+            applied = data["viewer"]["appliedJobs"]
+            edges = applied.get("edges") or []
+            self.logger.info("Fetched page %s, %s jobs", page_num, len(edges))
+
+            for edge in edges:
+                yield edge["node"]
+
+            page_info = applied.get("pageInfo") or {}
+            if not page_info.get("hasNextPage") or not edges:
+                break
+            after = page_info.get("endCursor")
+
+    # shared with the job page state, the api returns the same shapes
+    _label = staticmethod(label)
+    _parse_timestamp = staticmethod(parse_timestamp)
+
+    def _format_status_date(self, value):
+        # same display format as the drawer, e.g. "5 Mar 2025"
+        timestamp = self._parse_timestamp(value)
+        if timestamp is None:
+            return "N/A"
+        return f"{timestamp.day} {timestamp.strftime('%b %Y')}"
+
+    def _build_record(self, node):
+        """Map an applied job node to the record shape of the scraper"""
+        job = node.get("job") or {}
+        attachments = node.get("attachments") or {}
+        resume = attachments.get("resume") or {}
+        cover_letter = attachments.get("coverLetter") or {}
+        listed_at = self._parse_timestamp(job.get("listedAt"))
+        applicants = node.get("applicantCount")
+
+        return {
+            "job_platform": "JobStreet",
+            "data_retrieved_at": time.strftime("%d-%m-%Y %H:%M:%S", time.localtime()),
+            "job_title": job.get("title") or "N/A",
+            "company_name": self._label(job.get("advertiser")),
+            "job_location": self._label(job.get("location")),
+            "job_classification": self._label(job.get("classifications")),
+            "job_type": self._label(job.get("workTypes")),
+            "job_posted_date": (listed_at.strftime("%d-%m-%Y") if listed_at else "N/A"),
+            "job_listed_at": listed_at.isoformat() if listed_at else "N/A",
+            "salary_range": self._label(job.get("salary")),
+            "job_url": f"{self.job_url}/{job['id']}" if job.get("id") else "N/A",
+            "resume": resume.get("fileName") or "N/A",
+            "cover_letter": cover_letter.get("fileName") or "N/A",
+            "total_applicants": applicants if applicants is not None else "N/A",
+            "is_expired": bool(node.get("isExpired")),
+            "application_status": [
+                {
+                    "status": event.get("label") or event.get("status") or "N/A",
+                    "updated_at": self._format_status_date(event.get("timestamp")),
+                }
+                for event in node.get("events") or []
+            ],
+        }
+
+    def iter_jobs(self, limit=None, since=None):
+        """Yield applied jobs as they are fetched, see JobStreetScraper.iter_jobs"""
+        # the backend returns newest first, like the web page
+        records = (self._build_record(node) for node in self._iter_nodes())
+        yield from take_recent(records, limit=limit, since=since, window=self.page_size)
+
+    def fetch_all_jobs(self, reverse=False, limit=None, since=None):
+        """Fetch every applied job, same result shape as scrape_all_jobs"""
+        start_time = time.time()
+        jobs_data = order_jobs(
+            list(self.iter_jobs(limit=limit, since=since)), descending=reverse
+        )
+
+        total_elapsed = time.time() - start_time
+        self.logger.info(
+            "API fetch completed. Total jobs collected: %s", len(jobs_data)
+        )
+        return {
+            "jobs_data": jobs_data,
+            "total_jobs": len(jobs_data),
+            "total_elapsed": total_elapsed,
+            "scraping_completed_at": time.strftime(
+                "%d-%m-%Y %H:%M:%S", time.localtime()
+            ),
+            # a failed request raises, a returned fetch is always complete
+            "completed": True,
+            "error": None,
+        }
+
+    def close(self):
+        self.http.clear()
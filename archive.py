@@ -0,0 +1,440 @@
+from helpers import clean_text, parse_posted_date, record_key
+from jobstate import extra_info_from_job, job_from_html
+from concurrent.futures import ProcessPoolExecutor
+from locators import DEFAULT_LOCALE, get_labels
+from xml.etree.ElementTree import TreeBuilder
+from html.parser import HTMLParser
+from ordering import assign_ids
+from datetime import datetime
+import hashlib
+import logging
+import gzip
+import json
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.jsonl"
+OBJECTS_DIR = "objects"
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}  # fmt: skip
+
+
+class HtmlArchive:
+    """Content addressed store of raw drawer and detail page HTML
+
+    Each HTML document is gzipped under objects/<sha256[:2]>/<sha256>.html.gz,
+    so identical pages are stored once. index.jsonl maps every scraped job to
+    the digests of its drawer and detail page. Entries are keyed by job url,
+    ids only order the jobs within the run that wrote them, so several runs
+    can share one archive.
+    """
+
+    def __init__(self, root="archive"):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        os.makedirs(os.path.join(root, OBJECTS_DIR), exist_ok=True)
+        self.run = datetime.now().strftime("%Y%m%dT%H%M%S.%f")
+        self._latest = None
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, OBJECTS_DIR, digest[:2], f"{digest}.html.gz")
+
+    def store(self, html):
+        """Store one HTML document and return its digest"""
+        if not html:
+            return None
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def load(self, digest):
+        with gzip.open(self._object_path(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def _append(self, entry):
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        if self._latest is not None:
+            self._latest[entry["key"]] = entry
+        return entry
+
+    def add(self, job_info, drawer_html, detail_html=None, site=None):
+        """Archive the HTML behind one scraped job record"""
+        return self._append(
+            {
+                "key": record_key(job_info),
+                "run": self.run,
+                "id": job_info["id"],
+                "site": site or DEFAULT_LOCALE,
+                "job_url": job_info.get("job_url", "N/A"),
+                "data_retrieved_at": job_info.get("data_retrieved_at"),
+                "drawer": self.store(drawer_html),
+                "detail": self.store(detail_html),
+            }
+        )
+
+    def reuse(self, job_info):
+        """Point a record reused from a previous run at its archived HTML
+
+        None when the job was never archived.
+        """
+        if self._latest is None:
+            self._latest = self._read_latest()
+        previous = self._latest.get(record_key(job_info))
+        if previous is None:
+            return None
+        return self._append({**previous, "run": self.run, "id": job_info["id"]})
+
+    def _read_latest(self):
+        latest = {}
+        if not os.path.exists(self.index_path):
+            return latest
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if "key" not in entry:
+                        # written before keys were added, by a single run
+                        url = entry.get("job_url", "N/A")
+                        entry["key"] = url if url != "N/A" else f"id:{entry['id']}"
+                        entry["run"] = ""
+                    latest[entry["key"]] = entry
+        return latest
+
+    def entries(self):
+        """Latest entry of every job, newest run first, in scrape order within it"""
+        latest = self._read_latest().values()
+        by_run = sorted(latest, key=lambda entry: entry["id"])
+        return sorted(by_run, key=lambda entry: entry["run"], reverse=True)
+
+
+class _TreeParser(HTMLParser):
+    """Build an ElementTree from HTML with the standard library only"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.builder = TreeBuilder()
+        self.builder.start("root", {})
+        self.open_tags = ["root"]
+
+    def handle_starttag(self, tag, attrs):
+        self.builder.start(tag, {k: v or "" for k, v in attrs})
+        if tag in VOID_TAGS:
+            self.builder.end(tag)
+        else:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.builder.start(tag, {k: v or "" for k, v in attrs})
+        self.builder.end(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in self.open_tags[1:]:
+            return
+        # close implicitly closed children as well
+        while self.open_tags[-1] != tag:
+            self.builder.end(self.open_tags.pop())
+        self.builder.end(self.open_tags.pop())
+
+    def handle_data(self, data):
+        self.builder.data(data)
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.builder.end(self.open_tags.pop())
+        return self.builder.close()
+
+
+def parse_html(html):
+    """Parse HTML with lxml when installed, the stdlib parser otherwise"""
+    try:
+        from lxml import etree
+    except ImportError:
+        parser = _TreeParser()
+        parser.feed(html)
+        return parser.close()
+    # plain etree elements, lxml.html adds a costly class lookup per node
+    return etree.fromstring(html, etree.HTMLParser())
+
+
+class HtmlDocument:
+    """Small navigation layer shared by the lxml and stdlib trees"""
+
+    def __init__(self, html):
+        self.root = parse_html(html)
+        self._parents = None
+
+    @staticmethod
+    def is_element(node):
+        return isinstance(node.tag, str)
+
+    @staticmethod
+    def text(node):
+        # close to WebElement.text: whitespace collapsed, no markup
+        return " ".join("".join(node.itertext()).split())
+
+    @staticmethod
+    def first_line(node):
+        for chunk in node.itertext():
+            if chunk.strip():
+                return chunk.strip()
+        return ""
+
+    def parent(self, node):
+        if hasattr(node, "getparent"):
+            return node.getparent()
+        # ElementTree has no parent links, map them once on first use
+        if self._parents is None:
+            self._parents = {
+                child: parent for parent in self.root.iter() for child in parent
+            }
+        return self._parents.get(node)
+
+    def children(self, node, tag=None):
+        return [
+            child
+            for child in node
+            if self.is_element(child) and (tag is None or child.tag == tag)
+        ]
+
+    def descendants(self, node, tag=None):
+        return [el for el in node.iter(tag) if el is not node and self.is_element(el)]
+
+    def following_siblings(self, node, tag=None):
+        parent = self.parent(node)
+        if parent is None:
+            return []
+        siblings = self.children(parent)
+        after = siblings[siblings.index(node) + 1 :]
+        return [el for el in after if tag is None or el.tag == tag]
+
+    def find_by_attr(self, tag, attr, value, scope=None):
+        for el in (scope if scope is not None else self.root).iter(tag):
+            if el.get(attr) == value:
+                return el
+        return None
+
+    def find_containing_text(self, tag, needle, scope=None):
+        # same as //tag[contains(text(), needle)], direct text only
+        for el in (scope if scope is not None else self.root).iter(tag):
+            if needle in (el.text or ""):
+                return el
+        return None
+
+
+def _extract_job_info(doc, labels):
+    results = {
+        "job_title": "N/A",
+        "company_name": "N/A",
+        "job_location": "N/A",
+        "job_salary": "N/A",
+        "job_url": "N/A",
+    }
+    info_holder = doc.find_containing_text("span", labels["applied_for"])
+    if info_holder is None:
+        return results
+
+    siblings = doc.following_siblings(info_holder)
+    if len(siblings) >= 3:
+        results.update(
+            {
+                "job_title": doc.text(siblings[0]),
+                "company_name": doc.text(siblings[1]),
+                "job_location": doc.text(siblings[2]),
+            }
+        )
+
+    if len(siblings) >= 4:
+        links = doc.descendants(siblings[3], "a")
+        if links:
+            results["job_url"] = links[0].get("href", "").strip().split("?")[0]
+        else:
+            salary_text = doc.text(siblings[3])
+            per_month = labels["per_month"]
+            if per_month in salary_text.lower():
+                salary_raw = salary_text.split(per_month)[0].strip()
+                results["job_salary"] = clean_text(salary_raw)
+
+            if len(siblings) >= 5:
+                links = doc.descendants(siblings[4], "a")
+                if links:
+                    results["job_url"] = links[0].get("href", "").strip().split("?")[0]
+    return results
+
+
+def _extract_status(doc, labels):
+    application_status = []
+    is_expired = False
+
+    status_holder = doc.find_containing_text("span", labels["application_status"])
+    wrappers = (
+        doc.following_siblings(status_holder, "div")
+        if status_holder is not None
+        else []
+    )
+    if not wrappers:
+        return {"application_status": application_status, "is_expired": is_expired}
+
+    wrapper = wrappers[0]
+    status_blocks = [
+        block
+        for div in doc.children(wrapper, "div")
+        for block in doc.children(div, "div")
+    ]
+    for block in status_blocks:
+        # ./div/div[2]/div, first match
+        candidates = [
+            status_wrapper
+            for div in doc.children(block, "div")
+            for second in doc.children(div, "div")[1:2]
+            for status_wrapper in doc.children(second, "div")
+        ]
+        if not candidates:
+            continue
+        status_elements = doc.descendants(candidates[0], "span")[:2]
+        if len(status_elements) >= 2:
+            application_status.append(
+                {
+                    "status": doc.text(status_elements[0]),
+                    "updated_at": doc.first_line(status_elements[1]),
+                }
+            )
+
+    is_expired = doc.find_containing_text("span", labels["expired"]) is not None
+
+    return {"application_status": application_status, "is_expired": is_expired}
+
+
+def _extract_docs(doc):
+    results = {"resume": "N/A", "cover_letter": "N/A"}
+    for field, value in (
+        ("resume", "job-item-resume"),
+        ("cover_letter", "job-item-cover-letter"),
+    ):
+        element = doc.find_by_attr("span", "data-automation", value)
+        if element is not None:
+            results[field] = clean_text(doc.text(element))
+    return results
+
+
+def _extract_applicants(doc, labels):
+    element = doc.find_containing_text("span", labels["applicants"])
+    if element is None:
+        return None
+    match = re.search(r"^(\d+)", doc.text(element))
+    return int(match.group(1)) if match else None
+
+
+def _extract_extra_info(html, retrieved_at, labels):
+    results = {
+        "job_classification": "N/A",
+        "job_type": "N/A",
+        "job_posted_date": "N/A",
+        "job_listed_at": "N/A",
+    }
+    if html is None:
+        return results
+    # the embedded page state is exact and skips building the tree
+    job = job_from_html(html)
+    if job:
+        return extra_info_from_job(job)
+
+    doc = HtmlDocument(html)
+
+    for field, value in (
+        ("job_classification", "job-detail-classifications"),
+        ("job_type", "job-detail-work-type"),
+    ):
+        element = doc.find_by_attr("span", "data-automation", value)
+        links = doc.descendants(element, "a") if element is not None else []
+        if links:
+            results[field] = clean_text(doc.text(links[0]))
+
+    posted = doc.find_containing_text("span", labels["posted"])
+    if posted is not None:
+        try:
+            results["job_posted_date"] = parse_posted_date(
+                clean_text(doc.text(posted)), reference=retrieved_at
+            )
+        except ValueError:
+            pass
+    return results
+
+
+def extract_entry(root, entry):
+    """Rebuild one job record from its archived HTML"""
+    archive = HtmlArchive(root)
+    drawer = HtmlDocument(archive.load(entry["drawer"]))
+    detail = archive.load(entry["detail"]) if entry["detail"] else None
+
+    retrieved_at = None
+    if entry.get("data_retrieved_at"):
+        retrieved_at = datetime.strptime(
+            entry["data_retrieved_at"], "%d-%m-%Y %H:%M:%S"
+        )
+
+    # archives written before locales were added are from the id site
+    labels = get_labels(entry.get("site", DEFAULT_LOCALE))
+    info = _extract_job_info(drawer, labels)
+    extra_info = _extract_extra_info(detail, retrieved_at, labels)
+    status = _extract_status(drawer, labels)
+    docs = _extract_docs(drawer)
+    applicants = _extract_applicants(drawer, labels)
+
+    return {
+        "id": entry["id"],
+        "job_platform": "JobStreet",
+        "data_retrieved_at": entry.get("data_retrieved_at") or "N/A",
+        "job_title": info["job_title"],
+        "company_name": info["company_name"],
+        "job_location": info["job_location"],
+        "job_classification": extra_info["job_classification"],
+        "job_type": extra_info["job_type"],
+        "job_posted_date": extra_info["job_posted_date"],
+        "job_listed_at": extra_info["job_listed_at"],
+        "salary_range": info["job_salary"],
+        "job_url": info["job_url"],
+        "resume": docs["resume"],
+        "cover_letter": docs["cover_letter"],
+        "total_applicants": applicants if applicants is not None else "N/A",
+        "is_expired": status["is_expired"],
+        "application_status": status["application_status"],
+    }
+
+
+def _extract_entry_safe(root, entry):
+    try:
+        return extract_entry(root, entry)
+    except Exception as e:
+        logger.error("Error re-extracting job %s: %s", entry.get("id"), e)
+        return None
+
+
+def reextract(root="archive", workers=None):
+    """Re-extract every archived job offline, in a process pool"""
+    entries = [e for e in HtmlArchive(root).entries() if e.get("drawer")]
+    if not entries:
+        return []
+
+    chunksize = max(1, len(entries) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        records = pool.map(
+            _extract_entry_safe,
+            [root] * len(entries),
+            entries,
+            chunksize=chunksize,
+        )
+        # ids are renumbered, jobs of different runs share them
+        return list(assign_ids(record for record in records if record is not None))
@@ -0,0 +1,657 @@
+from statistics import median
+import subprocess
+import filecmp
+import tracemalloc
+import argparse
+import tempfile
+import random
+import json
+import csv
+import time
+import sys
+import os
+
+# Run with `python benchmarks.py <benchmark> -h`, each benchmark is a subcommand
+
+MICRO_SIZES = (100, 1_000, 10_000, 100_000)
+JSON_SIZES = (10_000, 100_000)
+MIN_TIMING = 0.1  # seconds, small datasets are looped until a run takes this long
+REGRESSION_THRESHOLD = 0.2
+ALLOCATION_SLACK = 64 * 1024  # bytes, smaller growth is interpreter noise
+TRACE_EVERY = 25  # pages between tracemalloc snapshots in the memory benchmark
+
+TITLES = (
+    "Senior Software Engineer (TypeScript/React)",
+    "Data Analyst \u2013 Jakarta",
+    "Backend Developer\u200b (Go)",
+    "Quality Assurance Engineer",
+    "Product Manager \u2014 Payments",
+)
+SALARIES = (
+    "Rp 8.000.000 \u2013 Rp 10.000.000 per month",
+    "Rp 15.000.000 - Rp 20.000.000",
+    "N/A",
+)
+POSTED = ("Posted 3d ago", "Posted 12d ago", "Posted 30+ days ago", "N/A")
+STATUSES = (
+    "Dilamar di JobStreet",
+    "Dilihat oleh perusahaan",
+    "Kemungkinan tidak dilanjutkan",
+)
+
+
+STARTUP_PHASES = (
+    "import_s",
+    "launch_s",
+    "first_navigation_s",
+    "page_load_s",
+    "total_s",
+)
+# the browser's own timing of the page load, from navigation start to load end
+PAGE_LOAD_SCRIPT = """
+const entry = performance.getEntriesByType('navigation')[0];
+return entry ? entry.loadEventEnd / 1000 : null;
+"""
+
+
+def _startup_child(browser, headless, url, cold):
+    """One cold process: import, launch and first navigation, as JSON
+
+    The navigation is a real page, get() returns once its load event fired.
+    The profile template is left alone, this run never logs in.
+    """
+    start = time.perf_counter()
+    from configs import forget_binaries, init_driver
+    from profiles import ProfileManager
+
+    imported = time.perf_counter()
+    if cold:
+        forget_binaries(browser)
+
+    profiles = ProfileManager()
+    profile_path = profiles.create(browser)
+    driver = init_driver(browser, headless=headless, profile_dir=profile_path)
+    launched = time.perf_counter()
+    try:
+        driver.get(url)
+        navigated = time.perf_counter()
+        page_load = driver.execute_script(PAGE_LOAD_SCRIPT)
+    finally:
+        driver.quit()
+        profiles.release(profile_path)
+
+    print(
+        json.dumps(
+            {
+                "import_s": imported - start,
+                "launch_s": launched - imported,
+                "first_navigation_s": navigated - launched,
+                "page_load_s": page_load,
+                "total_s": navigated - start,
+            }
+        )
+    )
+
+
+def run_startup(args):
+    from configs import configurations
+    from rich.console import Console
+    from rich.table import Table
+
+    url = args.url or configurations["base_url"]
+    results = {}
+    for browser in args.browsers:
+        runs = []
+        for run in range(args.runs):
+            command = [
+                sys.executable,
+                os.path.abspath(__file__),
+                "startup",
+                "--child",
+                browser,
+                "--url",
+                url,
+            ]
+            if args.headless:
+                command.append("--headless")
+            if args.cold:
+                command.append("--cold")
+            process = subprocess.run(command, capture_output=True, text=True)
+            if process.returncode != 0:
+                error = (process.stderr.strip().splitlines() or ["no output"])[-1]
+                print(f"{browser} run {run + 1} failed: {error}")
+                break
+            runs.append(json.loads(process.stdout.strip().splitlines()[-1]))
+        if runs:
+            results[browser] = runs
+
+    table = Table(
+        title=f"Startup to first navigation ({'cold' if args.cold else 'cached'} "
+        f"binaries, {args.runs} runs)",
+        caption="median (min-max) seconds per phase",
+    )
+    table.add_column("Browser", style="cyan")
+    for phase in ("import", "launch", "first navigation", "page load", "total"):
+        table.add_column(phase.capitalize(), justify="right")
+    for browser, runs in results.items():
+        cells = []
+        for key in STARTUP_PHASES:
+            values = [run[key] for run in runs if run.get(key) is not None]
+            if not values:
+                cells.append("N/A")
+                continue
+            cells.append(f"{median(values):.2f} ({min(values):.2f}-{max(values):.2f})")
+        table.add_row(browser, *cells)
+    Console().print(table)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+def _iter_synthetic_jobs(count, seed=0, description_kb=0):
+    """Scraped records shaped like the real output, deterministic per seed"""
+    rng = random.Random(seed)
+    # a pool of status histories shared between records keeps 1M records in RAM
+    histories = []
+    for day in range(1, 29):
+        steps = [{"status": STATUSES[0], "updated_at": f"{day} Mar 2025"}]
+        for status in STATUSES[1 : 1 + day % 3]:
+            steps.append({"status": status, "updated_at": f"{day + 1} Mei 2025"})
+        histories.append(steps)
+
+    for i in range(count):
+        job = {
+            "id": i + 1,
+            "job_platform": "JobStreet",
+            "data_retrieved_at": "02-06-2025 15:07:38",
+            "job_title": rng.choice(TITLES),
+            "company_name": f"PT Company {i % 997}",
+            "job_location": "Jakarta Selatan, Jakarta Raya",
+            "job_classification": "Teknologi Informasi & Komunikasi",
+            "job_type": "Full time",
+            "job_posted_date": rng.choice(POSTED),
+            "salary_range": rng.choice(SALARIES),
+            "job_url": f"https://id.jobstreet.com/id/job/{80000000 + i}",
+            "resume": "cv.pdf",
+            "cover_letter": "Tidak ada surat lamaran terkirim",
+            "total_applicants": rng.choice((163, 12, "N/A")),
+            "is_expired": rng.random() < 0.3,
+            "application_status": rng.choice(histories),
+        }
+        if description_kb:
+            # a unique text per record, like a scraped job description
+            job["description"] = f"{i:08d}" * (description_kb * 128)
+        yield job
+
+
+def _synthetic_jobs(count, seed=0):
+    return list(_iter_synthetic_jobs(count, seed))
+
+
+def _micro_cases(export_dir):
+    """name -> function run over a whole dataset"""
+    from helpers import clean_text, email_validation, latest_update, parse_posted_date
+    from normalizer import normalize_jobs
+    import exporter
+
+    exporter.EXPORT_DIR = export_dir
+
+    def run_clean_text(jobs):
+        for job in jobs:
+            clean_text(job["job_title"])
+            clean_text(job["salary_range"])
+
+    def run_email_validation(jobs):
+        for job in jobs:
+            email_validation(f"user{job['id']}@example.com")
+
+    return {
+        "clean_text": run_clean_text,
+        "parse_posted_date": lambda jobs: [
+            parse_posted_date(job["job_posted_date"]) for job in jobs
+        ],
+        "latest_update": lambda jobs: [latest_update(job) for job in jobs],
+        "email_validation": run_email_validation,
+        "normalize_status": exporter._normalize_application_status,
+        "normalize_typed": normalize_jobs,
+        "export_csv": exporter._export_to_csv,
+        "export_json": exporter._export_to_json,
+        "export_json_compact": lambda jobs: exporter._export_to_json(
+            jobs, compact=True
+        ),
+        "export_jsonl": exporter._export_to_jsonl,
+    }
+
+
+def _time_case(func, jobs, repeat):
+    """Best time of one call, small inputs are looped to get past timer noise"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(jobs)
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIMING:
+            break
+        loops *= 2
+    timings = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(jobs)
+        timings.append((time.perf_counter() - start) / loops)
+    return min(timings)
+
+
+def _peak_allocation(func, jobs):
+    """Peak bytes allocated by one call, the dataset itself excluded"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        func(jobs)
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def _regressions(results, baseline, threshold):
+    """Cases slower or allocating more than the baseline allows"""
+    found = []
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            before = baseline.get(name, {}).get(size)
+            if not before:
+                continue
+            if result["records_per_s"] < before["records_per_s"] * (1 - threshold):
+                found.append(
+                    f"{name} @ {size}: {result['records_per_s']:,.0f} records/s, "
+                    f"baseline {before['records_per_s']:,.0f}"
+                )
+            allowed = max(
+                before["peak_bytes"] * (1 + threshold),
+                before["peak_bytes"] + ALLOCATION_SLACK,
+            )
+            if result["peak_bytes"] > allowed:
+                found.append(
+                    f"{name} @ {size}: {result['peak_bytes']:,} peak bytes, "
+                    f"baseline {before['peak_bytes']:,}"
+                )
+    return found
+
+
+def run_micro(args):
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="jobstreet_bench_") as export_dir:
+        cases = _micro_cases(export_dir)
+        names = args.cases or list(cases)
+        for size in args.sizes:
+            jobs = _synthetic_jobs(size)
+            for name in names:
+                seconds = _time_case(cases[name], jobs, args.repeat)
+                peak = _peak_allocation(cases[name], jobs)
+                results.setdefault(name, {})[str(size)] = {
+                    "seconds": seconds,
+                    "records_per_s": size / seconds,
+                    "peak_bytes": peak,
+                }
+            del jobs
+
+    baseline = {}
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    table = Table(
+        title=f"Hot path microbenchmarks (best of {args.repeat})",
+        caption="records/s and peak allocation per call, change against baseline",
+    )
+    table.add_column("Case", style="cyan", no_wrap=True)
+    table.add_column("Records", justify="right")
+    table.add_column("Records/s", justify="right")
+    table.add_column("Peak alloc", justify="right")
+    table.add_column("Bytes/record", justify="right")
+    table.add_column("vs baseline", justify="right")
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            before = baseline.get(name, {}).get(size)
+            change = "-"
+            if before:
+                change = f"{result['records_per_s'] / before['records_per_s'] - 1:+.0%}"
+            table.add_row(
+                name,
+                f"{int(size):,}",
+                f"{result['records_per_s']:,.0f}",
+                f"{result['peak_bytes'] / 1024:,.0f} KiB",
+                f"{result['peak_bytes'] / int(size):,.0f}",
+                change,
+            )
+    console.print(table)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"python": sys.version.split()[0], "results": results}, f, indent=2
+            )
+        console.print(f"[dim]Results saved to {args.output}[/]")
+
+    regressions = _regressions(results, baseline, args.threshold)
+    for regression in regressions:
+        console.print(f"[bold red]Regression:[/] {regression}")
+    return 1 if regressions else 0
+
+
+def _legacy_json_export(jobs, path):
+    """The json exporter before jsoncodec, stdlib text re-indented per record"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, job in enumerate(jobs):
+            f.write(",\n  " if i else "\n  ")
+            f.write(json.dumps(job, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+        f.write("\n]")
+
+
+def _json_variants():
+    """name -> (export(jobs, path), indented), the legacy exporter first"""
+    import jsoncodec
+
+    variants = {"legacy": (_legacy_json_export, True)}
+    for backend in jsoncodec.BACKENDS:
+        for indent in (True, False):
+
+            def export(jobs, path, backend=backend, indent=indent):
+                with jsoncodec.open_output(path) as f:
+                    jsoncodec.write_array(f, jobs, indent, backend)
+
+            name = backend if indent else f"{backend} compact"
+            variants[name] = (export, indent)
+    return variants
+
+
+def run_json(args):
+    """Encode time and file size of the json export per encoder backend"""
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    variants = _json_variants()
+    results = {}
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="jobstreet_json_") as directory:
+        for size in args.sizes:
+            jobs = _synthetic_jobs(size)
+            if args.typed:
+                from normalizer import normalize_jobs
+
+                jobs = normalize_jobs(jobs)
+            legacy_path = os.path.join(directory, "legacy.json")
+            for name, (export, indent) in variants.items():
+                path = os.path.join(directory, f"{name.replace(' ', '_')}.json")
+                seconds = _time_case(lambda jobs: export(jobs, path), jobs, args.repeat)
+                same = filecmp.cmp(path, legacy_path, shallow=False) if indent else None
+                if same is False:
+                    failures.append(f"{name} @ {size}: output differs from legacy")
+                results.setdefault(name, {})[str(size)] = {
+                    "seconds": seconds,
+                    "records_per_s": size / seconds,
+                    "file_bytes": os.path.getsize(path),
+                    "same_bytes": same,
+                }
+            del jobs
+
+    table = Table(
+        title=f"JSON export per encoder (best of {args.repeat})",
+        caption="indented variants must write the same bytes as the legacy exporter",
+    )
+    table.add_column("Encoder", style="cyan", no_wrap=True)
+    table.add_column("Records", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Records/s", justify="right")
+    table.add_column("vs legacy", justify="right")
+    table.add_column("File size", justify="right")
+    table.add_column("Same bytes", justify="center")
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            legacy = results["legacy"][size]
+            table.add_row(
+                name,
+                f"{int(size):,}",
+                f"{result['seconds']:.3f}",
+                f"{result['records_per_s']:,.0f}",
+                f"{legacy['seconds'] / result['seconds']:.1f}x",
+                f"{result['file_bytes'] / 1024 / 1024:,.1f} MiB",
+                {True: "yes", False: "[red]no[/]", None: "-"}[result["same_bytes"]],
+            )
+    console.print(table)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"python": sys.version.split()[0], "results": results}, f, indent=2
+            )
+        console.print(f"[dim]Results saved to {args.output}[/]")
+    for failure in failures:
+        console.print(f"[bold red]Failed:[/] {failure}")
+    return 1 if failures else 0
+
+
+def _count_records(path):
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            return sum(1 for _ in csv.reader(f)) - 1
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            return sum(1 for line in f if line.strip())
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for line in f if line.startswith('    "id": '))
+
+
+def run_memory(args):
+    """Scrape loop simulation: spool under a memory cap, then export"""
+    from memprofile import MB, MemoryProfiler, RecordSpool, read_rss
+    from scraper import PAGE_SIZE
+    from rich.console import Console
+    import exporter
+
+    console = Console()
+    start_rss, _ = read_rss()
+    if start_rss is None:
+        console.print("[bold red]Needs /proc to read the resident size (Linux)[/]")
+        return 1
+    cap_mb = args.cap_mb or int(start_rss / MB) + 32
+
+    memprofiler = MemoryProfiler() if args.trace else None
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="jobstreet_memory_") as directory:
+        exporter.EXPORT_DIR = directory
+        spool = RecordSpool(cap_mb, directory=directory)
+        if memprofiler:
+            memprofiler.start()
+
+        # the scraper loop: collect per page, spill near the cap
+        jobs_data = []
+        jobs = _iter_synthetic_jobs(args.records, description_kb=args.description_kb)
+        for collected, job in enumerate(jobs, 1):
+            jobs_data.append(job)
+            spool.add(jobs_data)
+            # a snapshot walks the whole heap, take one every few pages
+            if memprofiler and collected % (PAGE_SIZE * TRACE_EVERY) == 0:
+                memprofiler.page_done(collected // PAGE_SIZE, collected)
+        del jobs
+
+        ordered = spool.ordered(jobs_data, descending=True)
+        paths = [
+            exporter._export_to_jsonl(ordered, "memory"),
+            exporter._export_to_json(ordered, "memory"),
+            exporter._export_to_csv(ordered, "memory"),
+        ]
+        if memprofiler:
+            memprofiler.stop()
+        _, peak_rss = read_rss()
+
+        for path in paths:
+            count = _count_records(path)
+            if count != args.records:
+                failures.append(f"{os.path.basename(path)} has {count} records")
+        first = next(iter(ordered))
+        if (
+            first["job_url"]
+            != f"https://id.jobstreet.com/id/job/{80000000 + args.records - 1}"
+        ):
+            failures.append("descending order broken, first record is not the last")
+        spilled = spool.spilled
+        spool.cleanup()
+
+    console.print(
+        f"{args.records:,} records, cap {cap_mb} MB (start {start_rss / MB:.0f} MB): "
+        f"{spilled:,} spooled to disk, peak rss {peak_rss / MB:.1f} MB"
+    )
+    if memprofiler:
+        summary = memprofiler.summary()
+        console.print(
+            f"{summary['pages']} snapshots, peak traced heap "
+            f"{summary['traced_peak_mb']} MB"
+        )
+        for site in memprofiler.pages[-1]["top_growth"][:5]:
+            console.print(f"  {site['size_diff'] / 1024:+8.0f} KiB  {site['site']}")
+    if peak_rss > cap_mb * MB:
+        failures.append(f"peak rss {peak_rss / MB:.1f} MB is over the {cap_mb} MB cap")
+    for failure in failures:
+        console.print(f"[bold red]Failed:[/] {failure}")
+    return 1 if failures else 0
+
+
+def benchmark_parser():
+    parser = argparse.ArgumentParser(
+        prog="benchmarks.py", description="Performance benchmarks for the scraper"
+    )
+    subparsers = parser.add_subparsers(dest="benchmark", metavar="BENCHMARK")
+    subparsers.required = True
+
+    startup = subparsers.add_parser(
+        "startup",
+        help="Time import, driver launch and first navigation per browser",
+    )
+    startup.add_argument(
+        "--browsers",
+        nargs="+",
+        choices=["chrome", "firefox"],
+        default=["chrome", "firefox"],
+    )
+    startup.add_argument("--runs", type=int, default=3, help="Runs per browser")
+    startup.add_argument("--headless", action="store_true")
+    startup.add_argument(
+        "--cold",
+        action="store_true",
+        help="Forget cached driver and browser paths before each run",
+    )
+    startup.add_argument("--url", type=str, help="First page (default: base_url)")
+    startup.add_argument("-o", "--output", type=str, help="Also save runs as JSON")
+    startup.add_argument(
+        "--child", choices=["chrome", "firefox"], help=argparse.SUPPRESS
+    )
+    startup.set_defaults(func=run_startup)
+
+    micro = subparsers.add_parser(
+        "micro",
+        help="Throughput and allocations of per-record code on synthetic datasets",
+    )
+    micro.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=list(MICRO_SIZES),
+        help="Dataset sizes in records, up to 1000000 (default: %(default)s)",
+    )
+    micro.add_argument(
+        "--cases",
+        nargs="+",
+        choices=[
+            "clean_text",
+            "parse_posted_date",
+            "latest_update",
+            "email_validation",
+            "normalize_status",
+            "normalize_typed",
+            "export_csv",
+            "export_json",
+            "export_json_compact",
+            "export_jsonl",
+        ],
+        help="Only run these cases (default: all)",
+    )
+    micro.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    micro.add_argument(
+        "--baseline",
+        type=str,
+        help="Results JSON of an earlier run, exit 1 on a regression against it",
+    )
+    micro.add_argument(
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help="Allowed throughput drop or allocation growth, as a fraction "
+        "(default: %(default)s)",
+    )
+    micro.add_argument("-o", "--output", type=str, help="Save results as JSON")
+    micro.set_defaults(func=run_micro)
+
+    encoders = subparsers.add_parser(
+        "json",
+        help="Encode time and file size of the json export per encoder backend",
+    )
+    encoders.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=list(JSON_SIZES),
+        help="Dataset sizes in records (default: %(default)s)",
+    )
+    encoders.add_argument(
+        "--typed", action="store_true", help="Export normalized records"
+    )
+    encoders.add_argument("--repeat", type=int, default=3, help="Timed runs per size")
+    encoders.add_argument("-o", "--output", type=str, help="Save results as JSON")
+    encoders.set_defaults(func=run_json)
+
+    memory = subparsers.add_parser(
+        "memory",
+        help="Simulate a long scrape under --memory-cap and check the peak memory",
+    )
+    memory.add_argument(
+        "--records", type=int, default=20_000, help="Records to collect"
+    )
+    memory.add_argument(
+        "--cap-mb",
+        type=int,
+        help="Memory cap in MB (default: resident size at start + 32)",
+    )
+    memory.add_argument(
+        "--description-kb",
+        type=int,
+        default=4,
+        help="Unique text per record, to make records heavy (default: %(default)s)",
+    )
+    memory.add_argument(
+        "--trace",
+        action="store_true",
+        help="Also take tracemalloc snapshots per page like --memprofile",
+    )
+    memory.set_defaults(func=run_memory)
+    return parser
+
+
+def main():
+    args = benchmark_parser().parse_args()
+    if args.benchmark == "startup" and args.child:
+        return _startup_child(args.child, args.headless, args.url, args.cold)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
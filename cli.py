@@ -1,13 +1,173 @@
+from datetime import date, datetime, timedelta
+from locators import DEFAULT_LOCALE, LOCALES
+from fields import parse_fields
 import argparse
+import sys
 
+COMMANDS = (
+    "scrape",
+    "export",
+    "stats",
+    "reextract",
+    "selectors",
+    "coordinate",
+    "work",
+    "collect",
+)
+EXPORT_FORMATS = ["json", "jsonl", "csv", "all"]
 
-def cli_scraper_parser():
-    parser = argparse.ArgumentParser(
-        prog="Jobstreet scraper",
-        description="Scrape applied jobs from JobStreet and export it to json or csv",
+
+def _parse_date(value):
+    """argparse type for --since, YYYY-MM-DD, today or yesterday"""
+    relative = {"today": 0, "yesterday": 1}
+    if value.lower() in relative:
+        return date.today() - timedelta(days=relative[value.lower()])
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid date {value!r}, use YYYY-MM-DD, today or yesterday"
+        )
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def _add_sort_arguments(parser):
+    sorting_group = parser.add_mutually_exclusive_group()
+    sorting_group.add_argument(
+        "--asc",
+        action="store_const",
+        dest="sort",
+        const="asc",
+        help="Output jobs in ascending order, chronologically (newest first)",
+    )
+    sorting_group.add_argument(
+        "--desc",
+        action="store_const",
+        dest="sort",
+        const="desc",
+        help="Output jobs in descending order, chronologically (oldest first)",
+    )
+    parser.set_defaults(sort="desc")
+
+
+def _add_locale_argument(parser):
+    parser.add_argument(
+        "--locale",
+        type=str,
+        choices=list(LOCALES),
+        default=DEFAULT_LOCALE,
+        help="JobStreet site and language: id (Indonesian), en (Indonesia in English), "
+        "my or sg (default: %(default)s)",
+    )
+
+
+def _add_typed_argument(parser):
+    parser.add_argument(
+        "--typed",
+        action="store_true",
+        help="Add salary_min, salary_max, currency, ISO dates and status codes "
+        "to each record",
+    )
+
+
+def _add_compact_argument(parser):
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write JSON without indentation, one record per line",
     )
 
+
+def _add_otp_arguments(parser):
+    otp_group = parser.add_argument_group(
+        "OTP", "Where the login verification code comes from"
+    )
+    otp_group.add_argument(
+        "--otp",
+        choices=["console", "imap", "mailbox"],
+        default="console",
+        help="Type the code in the terminal, or read it from an IMAP account or "
+        "a local Maildir/mbox (default: %(default)s)",
+    )
+    otp_group.add_argument(
+        "--otp-mailbox",
+        type=str,
+        metavar="PATH",
+        help="Maildir directory or mbox file for --otp mailbox",
+    )
+    otp_group.add_argument(
+        "--imap-host", type=str, metavar="HOST", help="IMAP server for --otp imap"
+    )
+    otp_group.add_argument(
+        "--imap-port",
+        type=int,
+        metavar="PORT",
+        help="IMAP port (default: 993, or 143 with --imap-plain)",
+    )
+    otp_group.add_argument(
+        "--imap-user",
+        type=str,
+        metavar="USER",
+        help="IMAP login, the password is read from JOBSTREET_OTP_PASSWORD "
+        "(default: the JobStreet email)",
+    )
+    otp_group.add_argument(
+        "--imap-folder",
+        type=str,
+        default="INBOX",
+        metavar="FOLDER",
+        help="Folder the verification email lands in (default: %(default)s)",
+    )
+    otp_group.add_argument(
+        "--imap-plain",
+        action="store_true",
+        help="Connect without TLS, for a local IMAP server or bridge",
+    )
+    otp_group.add_argument(
+        "--otp-timeout",
+        type=_positive_int,
+        default=180,
+        metavar="SECONDS",
+        help="How long to wait for the verification email (default: %(default)s)",
+    )
+
+
+def _add_rate_argument(parser):
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=4.0,
+        metavar="N",
+        help="Upper bound for page and detail requests per second, the rate adapts "
+        "below it and backs off on timeouts or bot challenges (default: %(default)s)",
+    )
+
+
+def _add_logging_arguments(parser):
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable logging to console",
+    )
+
+    parser.add_argument(
+        "--log-json",
+        action="store_true",
+        help="Also write JSON Lines logs with job id, page and phase fields",
+    )
+
+
+def _add_browser_arguments(parser):
     parser.add_argument("-e", "--email", type=str, help="Your jobstreet email address")
+    _add_locale_argument(parser)
+    _add_otp_arguments(parser)
 
     browser_group = parser.add_mutually_exclusive_group()
     browser_group.add_argument(
@@ -32,37 +192,349 @@ def cli_scraper_parser():
         help="Run browser without a GUI (background mode)",
     )
 
-    sorting_group = parser.add_mutually_exclusive_group()
-    sorting_group.add_argument(
-        "--asc",
-        action="store_const",
-        dest="sort",
-        const="asc",
-        help="Scrape jobs in ascending order, chronologically (newest first)",
-    )
-    sorting_group.add_argument(
-        "--desc",
-        action="store_const",
-        dest="sort",
-        const="desc",
-        help="Scrape jobs in descending order, chronologically (oldest first)",
-    )
-    parser.set_defaults(sort="desc")
+
+def _add_scrape_arguments(parser):
+    _add_browser_arguments(parser)
+
+    _add_sort_arguments(parser)
 
     parser.add_argument(
         "-f",
         "--format",
         type=str,
-        choices=["json", "csv", "all"],
+        choices=EXPORT_FORMATS,
         default="all",
         help="Export format for the scraped data (default: %(default)s)",
     )
 
     parser.add_argument(
-        "-v",
-        "--verbose",
+        "--fields",
+        type=parse_fields,
+        metavar="COLUMNS",
+        help="Comma separated output columns, e.g. "
+        "job_title,company_name,job_url,status. Extraction steps for other "
+        "columns are skipped (default: all)",
+    )
+
+    _add_typed_argument(parser)
+    _add_compact_argument(parser)
+
+    parser.add_argument(
+        "--limit",
+        type=_positive_int,
+        metavar="N",
+        help="Stop after the N newest applications",
+    )
+
+    parser.add_argument(
+        "--since",
+        type=_parse_date,
+        metavar="DATE",
+        help="Only jobs whose application status changed on or after DATE "
+        "(YYYY-MM-DD, today or yesterday), pagination stops after a page without any",
+    )
+
+    parser.add_argument(
+        "--refresh-from",
+        type=str,
+        metavar="PATH",
+        help="Previous json/jsonl export, or latest: only scrape cards that changed "
+        "or whose refresh tier is due, the rest are copied from PATH",
+    )
+
+    parser.add_argument(
+        "--cold-every",
+        type=_positive_int,
+        default=10,
+        metavar="N",
+        help="With --refresh-from, scrape expired and long idle applications every "
+        "N runs (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--full-refresh",
         action="store_true",
-        help="Enable logging to console",
+        help="With --refresh-from, scrape every card this run and reset the tiers",
+    )
+
+    parser.add_argument(
+        "--api",
+        action="store_true",
+        help="Use the browser for login only, then read applied jobs over HTTP",
+    )
+
+    parser.add_argument(
+        "--session",
+        type=str,
+        metavar="PATH",
+        help="Session cookies file for --api mode, reused if it exists and saved "
+        "after login",
+    )
+
+    _add_rate_argument(parser)
+
+    parser.add_argument(
+        "--archive",
+        type=str,
+        metavar="DIR",
+        help="Save compressed raw drawer and detail page HTML to DIR for offline "
+        "re-extraction",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Count and time WebDriver commands per caller, saved to profiles/",
+    )
+
+    parser.add_argument(
+        "--profile-python",
+        action="store_true",
+        help="With --profile, also capture a cProfile of the Python side",
+    )
+
+    parser.add_argument(
+        "--memprofile",
+        action="store_true",
+        help="Snapshot memory with tracemalloc after every page and report the top "
+        "allocation sites and the Python and browser resident size, saved to profiles/",
+    )
+
+    parser.add_argument(
+        "--memory-cap",
+        type=_positive_int,
+        metavar="MB",
+        help="Move collected records to a spool file on disk once the process "
+        "nears MB resident memory, the export streams them back",
+    )
+
+    _add_logging_arguments(parser)
+
+
+def _add_export_arguments(parser):
+    parser.add_argument(
+        "input", type=str, help="Stored json or jsonl export to convert"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        choices=EXPORT_FORMATS,
+        default="csv",
+        help="Export format for the stored data (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="jobstreet_jobs",
+        help="Output filename prefix inside exports/ (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--fields",
+        type=parse_fields,
+        metavar="COLUMNS",
+        help="Comma separated columns to keep from the stored records, e.g. "
+        "job_title,company_name,job_url,status (default: all)",
+    )
+    _add_typed_argument(parser)
+    _add_compact_argument(parser)
+
+
+def _add_coordinate_arguments(parser):
+    parser.add_argument(
+        "queue", type=str, help="SQLite queue file, created if it does not exist"
+    )
+    _add_browser_arguments(parser)
+    _add_rate_argument(parser)
+    parser.add_argument(
+        "--serve",
+        type=str,
+        metavar="HOST:PORT",
+        help="After publishing, serve the queue over HTTP for workers on other "
+        "machines, e.g. 0.0.0.0:8765. Any address but localhost needs a token "
+        "in JOBSTREET_QUEUE_TOKEN",
+    )
+    _add_logging_arguments(parser)
+
+
+def _add_work_arguments(parser):
+    parser.add_argument(
+        "queue",
+        type=str,
+        help="SQLite queue file, or http://HOST:PORT of a coordinate --serve",
+    )
+    _add_browser_arguments(parser)
+    _add_rate_argument(parser)
+    parser.add_argument(
+        "--lease",
+        type=_positive_int,
+        default=300,
+        metavar="SECONDS",
+        help="Lease per claimed page, renewed after every job. An item whose "
+        "lease runs out is given to another worker (default: %(default)s)",
     )
+    parser.add_argument(
+        "--max-items",
+        type=_positive_int,
+        metavar="N",
+        help="Stop after N pages (default: until the queue is drained)",
+    )
+    _add_logging_arguments(parser)
+
+
+def _add_collect_arguments(parser):
+    parser.add_argument("queue", type=str, help="SQLite queue file")
+    parser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        choices=EXPORT_FORMATS,
+        default="all",
+        help="Export format for the collected data (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--fields",
+        type=parse_fields,
+        metavar="COLUMNS",
+        help="Comma separated output columns (default: all)",
+    )
+    _add_typed_argument(parser)
+    _add_compact_argument(parser)
+    _add_sort_arguments(parser)
+
+
+def _add_stats_arguments(parser):
+    parser.add_argument("input", type=str, help="Stored json or jsonl export")
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="Number of companies and classifications to list (default: %(default)s)",
+    )
+
+
+def _add_reextract_arguments(parser):
+    parser.add_argument(
+        "archive", type=str, help="Archive directory written by scrape --archive"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        choices=EXPORT_FORMATS,
+        default="all",
+        help="Export format for the re-extracted data (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Parser processes (default: one per CPU)",
+    )
+    _add_sort_arguments(parser)
+
+
+def _add_selectors_arguments(parser):
+    parser.add_argument(
+        "archive", type=str, help="Archive directory written by scrape --archive"
+    )
+    _add_locale_argument(parser)
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Number of archived jobs to check (default: all)",
+    )
+
+
+def cli_scraper_parser(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="Jobstreet scraper",
+        description="Scrape applied jobs from JobStreet and export it to json or csv",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    _add_scrape_arguments(
+        subparsers.add_parser(
+            "scrape", help="Scrape applied jobs with a browser (default command)"
+        )
+    )
+    _add_export_arguments(
+        subparsers.add_parser(
+            "export", help="Re-export a stored json or jsonl file, no browser needed"
+        )
+    )
+    _add_stats_arguments(
+        subparsers.add_parser(
+            "stats", help="Summarize a stored json or jsonl file, no browser needed"
+        )
+    )
+
+    _add_reextract_arguments(
+        subparsers.add_parser(
+            "reextract",
+            help="Rebuild records from an HTML archive offline, no browser or login",
+        )
+    )
+    _add_selectors_arguments(
+        subparsers.add_parser(
+            "selectors",
+            help="Check and time the page selectors of a locale against an HTML "
+            "archive",
+        )
+    )
+
+    _add_coordinate_arguments(
+        subparsers.add_parser(
+            "coordinate",
+            help="Log in, discover the result pages and publish them to a work queue",
+        )
+    )
+    _add_work_arguments(
+        subparsers.add_parser(
+            "work", help="Claim pages from a work queue, scrape them and post results"
+        )
+    )
+    _add_collect_arguments(
+        subparsers.add_parser(
+            "collect",
+            help="Export the deduplicated, ordered results of a work queue",
+        )
+    )
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # keep `main.py -e user@example.com` working, scrape is the default command
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["scrape", *argv]
+
+    args = parser.parse_args(argv)
+    if args.command in ("scrape", "coordinate", "work"):
+        if args.otp == "imap" and not args.imap_host:
+            parser.error("--otp imap needs --imap-host")
+        if args.otp == "mailbox" and not args.otp_mailbox:
+            parser.error("--otp mailbox needs --otp-mailbox")
+    if args.command == "scrape" and args.refresh_from:
+        if args.api:
+            parser.error("--refresh-from works with the browser scraper, not --api")
+        if args.refresh_from != "latest" and not args.refresh_from.endswith(
+            (".json", ".jsonl")
+        ):
+            parser.error("--refresh-from needs a json or jsonl export")
+    if args.command == "scrape" and args.api and (args.profile or args.memprofile):
+        parser.error(
+            "--profile and --memprofile measure the browser scraper, not --api"
+        )
+    if args.command == "scrape" and args.full_refresh and not args.refresh_from:
+        parser.error("--full-refresh needs --refresh-from")
+    if args.command == "coordinate" and args.serve:
+        from workqueue import TOKEN_ENV, is_loopback
+        import os
 
-    return parser.parse_args()
+        host, _, port = args.serve.rpartition(":")
+        if not port.isdigit():
+            parser.error("--serve needs HOST:PORT")
+        if not os.environ.get(TOKEN_ENV) and not is_loopback(host or "127.0.0.1"):
+            parser.error(f"--serve on {host} needs a token in {TOKEN_ENV}")
+    return args
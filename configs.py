@@ -1,40 +1,147 @@
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.firefox_profile import FirefoxProfile
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.common.exceptions import WebDriverException
 from selenium import webdriver
-from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
+from locators import DEFAULT_LOCALE, site_settings
 import tempfile
-import logging
+import weakref
+import atexit
 import shutil
-import time
+import queue
+import copy
+import json
+import logging
 import os
 
 configurations = {
-    "base_url": "https://id.jobstreet.com/id/my-activity/applied-jobs",
+    # site, base_url, api_url, job_url, country and locale, see configure_locale
+    **site_settings(DEFAULT_LOCALE),
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "default_wait": 20,
     "short_wait": 3,
+    # upper bounds for driver.get/window loads, execute_script and any
+    # single WebDriver command, nothing waits forever on a stalled browser
+    "page_load_timeout": 45,
+    "script_timeout": 15,
+    "command_timeout": 90,
+    # set at launch, resizing a running window costs a round trip and a relayout
+    "window_size": (1920, 1080),
+}
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "jobstreet_scraper")
+# driver and browser paths found by Selenium Manager, which otherwise runs
+# (and may hit the network) on every launch
+BINARY_CACHE = os.path.join(CACHE_DIR, "binaries.json")
+DRIVER_CLASSES = {
+    "firefox": (webdriver.Firefox, FirefoxService),
+    "chrome": (webdriver.Chrome, ChromeService),
 }
 
 logger = logging.getLogger(__name__)
 
 
-def init_logging(log_dir="logs", log_file="jobstreet_scraper.log", log_console=False):
+def configure_locale(site):
+    """Point configurations at the SEEK site of a locale (id, en, my, sg)"""
+    configurations.update(site_settings(site))
+    return configurations
+
+
+LOG_FORMAT = "%(asctime)s - [%(levelname)s] %(name)s - %(message)s"
+LOG_DATEFMT = "%d-%m-%Y %H:%M:%S"
+# context fields the scraper attaches with `extra=`, kept as JSON keys
+LOG_CONTEXT_FIELDS = ("job_id", "page", "phase")
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format each record as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, LOG_DATEFMT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in LOG_CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class MessageQueueHandler(QueueHandler):
+    """Enqueue records with the message merged and the traceback kept apart
+
+    QueueHandler.prepare folds the traceback into the message and drops
+    exc_info, this keeps it in exc_text so every formatter on the listener
+    side lays it out its own way.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            # tracebacks hold frames, which must not cross the queue
+            record.exc_info = None
+        return record
+
+
+def init_logging(
+    log_dir="logs",
+    log_file="jobstreet_scraper.log",
+    log_console=False,
+    log_json=False,
+    level=logging.INFO,
+):
+    """Route logging through a queue so handlers run on a background thread
+
+    The calling thread only puts records on a queue, file and console writes
+    happen in a QueueListener. Returns the started listener, which is
+    stopped at exit so buffered records are flushed.
+    """
     os.makedirs(log_dir, exist_ok=True)
     log_path = os.path.join(log_dir, log_file)
-    handlers = [logging.FileHandler(log_path, encoding="utf-8")]
+    file_handler = logging.FileHandler(log_path, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFMT))
+    handlers = [file_handler]
+
+    if log_json:
+        json_path = os.path.splitext(log_path)[0] + ".jsonl"
+        json_handler = logging.FileHandler(json_path, encoding="utf-8")
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
 
     if log_console:
-        handlers.append(logging.StreamHandler())
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFMT))
+        handlers.append(stream_handler)
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - [%(levelname)s] %(name)s - %(message)s",
-        datefmt="%d-%m-%Y %H:%M:%S",
-        handlers=handlers,
-    )
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
 
+    # the queue carries the merged message, layout is left to the listener side
+    queue_handler = MessageQueueHandler(log_queue)
 
-def init_driver(browser="firefox", headless=False):
+    logging.basicConfig(level=level, handlers=[queue_handler], force=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def init_driver(browser="firefox", headless=False, profile_dir=None):
 
     browser = browser.lower()
     if browser not in ["firefox", "chrome"]:
@@ -42,30 +149,126 @@ def init_driver(browser="firefox", headless=False):
             f"Unsupported browser {browser}. Please use 'firefox' or 'chrome'."
         )
 
-    logger.info(f"Initializing {browser} driver")
+    logger.info("Initializing %s driver", browser)
 
     try:
         if browser == "firefox":
-            return init_firefox_driver(headless)
+            driver = init_firefox_driver(headless, profile_dir)
         elif browser == "chrome":
-            return init_chrome_driver(headless)
+            driver = init_chrome_driver(headless, profile_dir)
         else:
             raise ValueError(f"Unsupported browser {browser}")
     except Exception as e:
-        logger.error(f"Error initializing {browser} driver: {e}")
+        logger.error("Error initializing %s driver: %s", browser, e)
         raise
 
+    set_driver_timeouts(driver)
+    return driver
+
 
-def init_firefox_driver(headless=False):
+def _read_binary_cache():
+    try:
+        with open(BINARY_CACHE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_binary_cache(cache):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{BINARY_CACHE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, BINARY_CACHE)
+
+
+def resolve_binaries(browser, options, service):
+    """Driver and browser paths, cached after the first Selenium Manager run
+
+    Returns the paths and whether they came from the cache.
+    """
+    cache = _read_binary_cache()
+    paths = cache.get(browser) or {}
+    if all(
+        paths.get(key) and os.access(paths[key], os.X_OK)
+        for key in ("driver_path", "browser_path")
+    ):
+        return paths, True
+
+    finder = DriverFinder(service, options)
+    paths = {
+        "driver_path": finder.get_driver_path(),
+        "browser_path": finder.get_browser_path(),
+    }
+    cache[browser] = paths
+    try:
+        _write_binary_cache(cache)
+    except OSError as e:
+        logger.warning("Could not cache %s binary paths: %s", browser, e)
+    return paths, False
+
+
+def forget_binaries(browser):
+    cache = _read_binary_cache()
+    if cache.pop(browser, None) is not None:
+        _write_binary_cache(cache)
+
+
+def _start_driver(browser, options):
+    """Launch on the cached binaries, resolving them again if they are stale"""
+    driver_class, service_class = DRIVER_CLASSES[browser]
+    while True:
+        service = service_class()
+        options.binary_location = ""
+        paths, cached = resolve_binaries(browser, options, service)
+        service.path = paths["driver_path"]
+        options.binary_location = paths["browser_path"]
+        try:
+            return driver_class(options=options, service=service)
+        except WebDriverException as e:
+            if not cached:
+                raise
+            # e.g. the browser updated and the cached driver no longer matches
+            logger.warning("Cached %s binaries failed to start: %s", browser, e)
+            forget_binaries(browser)
+
+
+def _remove_on_quit(driver, path):
+    """Delete a temporary profile when the browser quits, at exit at the latest"""
+    remove = weakref.finalize(driver, shutil.rmtree, path, ignore_errors=True)
+    quit = driver.quit
+
+    def quit_and_remove():
+        try:
+            quit()
+        finally:
+            remove()
+
+    driver.quit = quit_and_remove
+
+
+def set_driver_timeouts(driver):
+    """Bound page loads, scripts and the HTTP round trip to the driver"""
+    driver.set_page_load_timeout(configurations["page_load_timeout"])
+    driver.set_script_timeout(configurations["script_timeout"])
+    driver.command_executor.client_config.timeout = configurations["command_timeout"]
+
+
+def init_firefox_driver(headless=False, profile_dir=None):
     try:
         options = FirefoxOptions()
-        firefox_profile = FirefoxProfile()
-        options.profile = firefox_profile
+        if profile_dir:
+            # run on the managed profile in place, FirefoxProfile copies it
+            options.add_argument("-profile")
+            options.add_argument(profile_dir)
+            logger.info("Using firefox profile dir: %s", profile_dir)
+        else:
+            options.profile = FirefoxProfile()
 
         if headless:
             options.add_argument("--headless")
             options.add_argument("--disable-gpu")
-            logger.info(f"Firefox running in headless mode")
+            logger.info("Firefox running in headless mode")
 
         #  disable notification
         options.set_preference("dom.webnotifications.enabled", False)
@@ -75,10 +278,12 @@ def init_firefox_driver(headless=False):
         options.set_preference("dom.webdriver.enabled", False)
         options.set_preference("useAutomationExtension", False)
 
-        driver = webdriver.Firefox(options=options)
-        # firefox not support --start-maximize preference, manual here
-        if not headless:
-            driver.maximize_window()
+        # firefox has no --start-maximized, size the window at launch instead
+        width, height = configurations["window_size"]
+        options.add_argument(f"--width={width}")
+        options.add_argument(f"--height={height}")
+
+        driver = _start_driver("firefox", options)
 
         if headless:
             driver.execute_script(
@@ -89,28 +294,32 @@ def init_firefox_driver(headless=False):
             """
             )
 
-        time.sleep(2)
         logger.info("Firefox driver initialized successfully")
         return driver
 
     except Exception as e:
-        logger.error(f"Error initializing Firefox driver: {e}")
+        logger.error("Error initializing Firefox driver: %s", e)
         raise
 
 
-def init_chrome_driver(headless=False):
+def init_chrome_driver(headless=False, profile_dir=None):
     try:
         options = ChromeOptions()
-        temp_user_data_dir = tempfile.mkdtemp(prefix="chrome_selenium_")
-        options.add_argument(f"--user-data-dir={temp_user_data_dir}")
-        logger.info(f"Using temporary chrome profile dir: {temp_user_data_dir}")
+        # without a managed profile chrome gets a throwaway one
+        user_data_dir = profile_dir or tempfile.mkdtemp(prefix="chrome_selenium_")
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+        logger.info("Using chrome profile dir: %s", user_data_dir)
 
         if headless:
             options.add_argument("--headless=new")
             options.add_argument("--disable-gpu")
-            logger.info(f"Chrome running in headless mode")
+            logger.info("Chrome running in headless mode")
 
         options.add_argument("--start-maximized")
+        # headless windows ignore --start-maximized
+        options.add_argument(
+            "--window-size={},{}".format(*configurations["window_size"])
+        )
 
         # disable notifications and other features
         options.add_argument("--disable-notifications")
@@ -126,11 +335,16 @@ def init_chrome_driver(headless=False):
         options.add_experimental_option("useAutomationExtension", False)
         options.add_experimental_option("prefs", {"translate": {"enabled": False}})
 
-        options.add_argument(
-            "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        options.add_argument(f"--user-agent={configurations['user_agent']}")
 
-        driver = webdriver.Chrome(options=options)
+        try:
+            driver = _start_driver("chrome", options)
+        except Exception:
+            if not profile_dir:
+                shutil.rmtree(user_data_dir, ignore_errors=True)
+            raise
+        if not profile_dir:
+            _remove_on_quit(driver, user_data_dir)
 
         if headless:
             driver.execute_script(
@@ -144,42 +358,9 @@ def init_chrome_driver(headless=False):
             """
             )
 
-        time.sleep(2)
         logger.info("Chrome driver initialized successfully")
         return driver
 
     except Exception as e:
-        logger.error(f"Error initializing Chrome driver: {e}")
+        logger.error("Error initializing Chrome driver: %s", e)
         raise
-
-
-def cleanup_chrome_temp_dir():
-    try:
-        temp_dir = Path(tempfile.gettempdir())
-        for dir in temp_dir.glob("chrome_selenium_*"):
-            if dir.is_dir():
-                try:
-                    shutil.rmtree(dir)
-                    logger.info(f"Cleanup up chrome temp directory: {dir}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean temp directory {dir}: {e}")
-    except Exception as e:
-        logger.warning(f"Error during temp directory cleanup: {e}")
-
-
-def cleanup_firefox_temp_dir(profile_path):
-    if profile_path and os.path.exists(profile_path):
-        try:
-            shutil.rmtree(profile_path)
-            logger.info(f"Cleaned up Firefox profile directory: {profile_path}")
-        except Exception as e:
-            logger.warning(
-                f"Failed to clean Firefox profile directory {profile_path}: {e}"
-            )
-
-
-def cleanup_webdriver_temp_dir(browser, profile_path=None):
-    if browser == "firefox":
-        cleanup_firefox_temp_dir(profile_path)
-    elif browser == "chrome":
-        cleanup_chrome_temp_dir()
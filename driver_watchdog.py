@@ -0,0 +1,129 @@
+from contextlib import contextmanager
+import threading
+import logging
+import signal
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+JOB_DEADLINE = 120  # seconds for one card, waits in the throttle excluded
+POLL_INTERVAL = 1.0
+
+
+class DriverWedged(Exception):
+    """A watched block overran its deadline and the browser was killed"""
+
+
+def _descendants(pid):
+    """Child processes of pid, recursively, read from /proc (Linux only)"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                # the process name may contain spaces, the ppid follows ")"
+                ppid = int(f.read().rsplit(b")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    found = []
+    pending = [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            found.append(child)
+            pending.append(child)
+    return found
+
+
+def kill_driver(driver):
+    """Kill the driver service and the browser it started, without quit()
+
+    quit() is a WebDriver command and hangs like the rest on a wedged
+    browser. Killing the service process fails any pending command at once.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None or process.poll() is not None:
+        return
+    pids = _descendants(process.pid) if os.path.isdir("/proc") else []
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+    process.kill()
+    process.wait(timeout=10)
+    logger.warning(
+        "Killed driver process %s and %s browser processes", process.pid, len(pids)
+    )
+
+
+class Watchdog:
+    """Kill the browser when a watched block runs past its deadline
+
+    A background thread checks the running block once a second. Time the
+    block spends in `excused()` (the throttle's waiting time) does not
+    count against the deadline. When the deadline passes, `kill` is called
+    from the watchdog thread, the blocked WebDriver call fails, and leaving
+    the block raises DriverWedged so the caller can restart the browser.
+    """
+
+    def __init__(self, kill, deadline=JOB_DEADLINE, excused=None):
+        self.kill = kill
+        self.deadline = deadline
+        self.excused = excused or (lambda: 0.0)
+        self.expired = None
+        self._watch = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="watchdog", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(POLL_INTERVAL):
+            with self._lock:
+                watch = self._watch
+                if watch is None:
+                    continue
+                label, started, excused_at_start, deadline = watch
+                elapsed = time.monotonic() - started
+                if elapsed - (self.excused() - excused_at_start) < deadline:
+                    continue
+                self._watch = None
+                self.expired = label
+
+            logger.error(
+                "%s exceeded its %ss deadline, killing the browser", label, deadline
+            )
+            try:
+                self.kill()
+            except Exception as e:
+                logger.error("Failed to kill the browser: %s", e)
+
+    @contextmanager
+    def watch(self, label, deadline=None):
+        """Run a block under the deadline, raising DriverWedged if it overran"""
+        with self._lock:
+            self.expired = None
+            self._watch = (
+                label,
+                time.monotonic(),
+                self.excused(),
+                deadline or self.deadline,
+            )
+        try:
+            yield
+        except Exception as e:
+            if self.expired:
+                raise DriverWedged(f"{label} hung") from e
+            raise
+        finally:
+            with self._lock:
+                self._watch = None
+        if self.expired:
+            raise DriverWedged(f"{label} hung")
+
+    def stop(self):
+        self._stopped.set()
@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import List, Dict
-import json
+from typing import Dict, Iterable, Iterator, List, Optional
+from fields import TYPED_FIELDS, record_keys
+from ordering import SpooledJobs
+import jsoncodec
 import csv
 import os
 
@@ -16,9 +18,8 @@ def _get_timestamp_filename(prefix: str, extension: str) -> str:
     return os.path.join(EXPORT_DIR, filename)
 
 
-def _normalize_application_status(job_data: List[Dict]) -> List[Dict]:
-    normalize_data = []
-
+def _iter_normalized_status(job_data: Iterable[Dict]) -> Iterator[Dict]:
+    """Flatten application_status of each record into csv columns, lazily"""
     for job in job_data:
         job_copy = job.copy()
         results = {
@@ -46,12 +47,23 @@ def _normalize_application_status(job_data: List[Dict]) -> List[Dict]:
 
             del job_copy["application_status"]
 
-        normalize_data.append({**job_copy, **results})
+        yield {**job_copy, **results}
+
+
+def _normalize_application_status(job_data: List[Dict]) -> List[Dict]:
+    return list(_iter_normalized_status(job_data))
+
 
-    return normalize_data
+def _project(jobs_data: Iterable[Dict], keys: Optional[List[str]]) -> Iterable[Dict]:
+    """Keep only the selected keys of each record, in the selected order"""
+    if not keys:
+        return jobs_data
+    return ({key: job[key] for key in keys if key in job} for job in jobs_data)
 
 
-def _export_to_csv(jobs_data: List[Dict], filename="jobstreet_jobs") -> str:
+def _export_to_csv(
+    jobs_data: List[Dict], filename="jobstreet_jobs", fields=None
+) -> str:
     """Export jobs data to CSV file"""
     filename = _get_timestamp_filename(filename, "csv")
 
@@ -61,52 +73,94 @@ def _export_to_csv(jobs_data: List[Dict], filename="jobstreet_jobs") -> str:
             writer.writerow(["No Data. Check log for details."])
         return filename
 
-    normalized_jobs = _normalize_application_status(jobs_data)
-
-    fieldnames = set()
-    for job in normalized_jobs:
-        fieldnames.update(job.keys())
-    fieldnames = sorted(list(fieldnames))
+    # records are flattened on the fly, spooled records never load at once
+    if fields:
+        fieldnames = fields
+    else:
+        fieldnames = set()
+        for job in _iter_normalized_status(jobs_data):
+            fieldnames.update(job.keys())
+        fieldnames = sorted(list(fieldnames))
 
     with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
         writer.writeheader()
-        writer.writerows(normalized_jobs)
+        writer.writerows(_iter_normalized_status(jobs_data))
 
     return filename
 
 
-def _export_to_json(jobs_data: List[Dict], filename="jobstreet_jobs") -> str:
-    """Export jobs data to JSON file"""
+def _export_to_json(
+    jobs_data: List[Dict], filename="jobstreet_jobs", fields=None, compact=False
+) -> str:
+    """Export jobs data to JSON file, one record per line when compact"""
     filename = _get_timestamp_filename(filename, "json")
 
     if not jobs_data:
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(
-                {"message": "No Data. Check log for details."},
-                f,
-                indent=2,
-                ensure_ascii=False,
-            )
+        with open(filename, "wb") as f:
+            message = {"message": "No Data. Check log for details."}
+            f.write(jsoncodec.dumps(message, indent=not compact))
         return filename
 
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(jobs_data, f, indent=2, ensure_ascii=False)
+    jobs_data = _project(jobs_data, record_keys(fields) if fields else None)
+    with jsoncodec.open_output(filename) as f:
+        # one record in memory at a time, the layout of json.dump(indent=2)
+        jsoncodec.write_array(f, jobs_data, indent=not compact)
+
+    return filename
+
+
+def _export_to_jsonl(
+    jobs_data: List[Dict], filename="jobstreet_jobs", fields=None
+) -> str:
+    """Export jobs data to JSON Lines file, one job per line"""
+    filename = _get_timestamp_filename(filename, "jsonl")
+    jobs_data = _project(jobs_data, record_keys(fields) if fields else None)
+
+    with jsoncodec.open_output(filename) as f:
+        jsoncodec.write_lines(f, jobs_data)
 
     return filename
 
 
-def export_to(types: str, jobs_data: List[Dict], filename="jobstreet_jobs") -> str:
+def load_jobs(path: str) -> List[Dict]:
+    """Load jobs data from a previous json or jsonl export"""
+    with open(path, "rb") as f:
+        if path.endswith(".jsonl"):
+            return [jsoncodec.loads(line) for line in f if line.strip()]
+        data = jsoncodec.loads(f.read())
+
+    # empty exports are written as {"message": ...}
+    return data if isinstance(data, list) else []
+
+
+def export_to(
+    types: str,
+    jobs_data: List[Dict],
+    filename="jobstreet_jobs",
+    fields=None,
+    typed=False,
+    compact=False,
+) -> str:
+    if typed or TYPED_FIELDS.intersection(fields or ()):
+        from normalizer import normalize_job, normalize_jobs
+
+        if isinstance(jobs_data, SpooledJobs):
+            jobs_data = jobs_data.map(normalize_job)
+        else:
+            jobs_data = normalize_jobs(jobs_data)
 
     match types.lower():
         case "json":
-            return _export_to_json(jobs_data, filename)
+            return _export_to_json(jobs_data, filename, fields, compact)
+        case "jsonl":
+            return _export_to_jsonl(jobs_data, filename, fields)
         case "csv":
-            return _export_to_csv(jobs_data, filename)
+            return _export_to_csv(jobs_data, filename, fields)
         case "all":
-            csv_file = _export_to_csv(jobs_data, filename)
-            json_file = _export_to_json(jobs_data, filename)
+            csv_file = _export_to_csv(jobs_data, filename, fields)
+            json_file = _export_to_json(jobs_data, filename, fields, compact)
             return f"CSV: {csv_file}\nJSON: {json_file}"
         case _:
             print("No types selected, default to json")
-            return _export_to_json(jobs_data, filename)
+            return _export_to_json(jobs_data, filename, fields, compact)
@@ -0,0 +1,98 @@
+import argparse
+
+# output column -> scraping phases that must run to fill it
+FIELD_PHASES = {
+    "id": (),
+    "job_platform": (),
+    "data_retrieved_at": (),
+    "job_title": ("job_info",),
+    "company_name": ("job_info",),
+    "job_location": ("job_info",),
+    "salary_range": ("job_info",),
+    "job_url": ("job_info",),
+    # the detail tab is opened from the job url found in the drawer
+    "job_classification": ("job_info", "detail"),
+    "job_type": ("job_info", "detail"),
+    "job_posted_date": ("job_info", "detail"),
+    "job_listed_at": ("job_info", "detail"),
+    "resume": ("docs",),
+    "cover_letter": ("docs",),
+    "total_applicants": ("stats",),
+    "is_expired": ("status",),
+    "application_status": ("status",),
+    # flattened csv columns, see exporter._normalize_application_status
+    "status": ("status",),
+    "updated_at": ("status",),
+    "job_applied_at": ("status",),
+    # typed columns, see normalizer.normalize_job
+    "salary_min": ("job_info",),
+    "salary_max": ("job_info",),
+    "currency": ("job_info",),
+    "posted_on": ("job_info", "detail"),
+    "status_code": ("status",),
+    "applied_on": ("status",),
+    "updated_on": ("status",),
+}
+ALL_PHASES = {phase for phases in FIELD_PHASES.values() for phase in phases}
+# flattened columns come from application_status in the json output
+DERIVED_FIELDS = {
+    "status": "application_status",
+    "updated_at": "application_status",
+    "job_applied_at": "application_status",
+}
+# columns only present in --typed output, selecting one turns it on
+TYPED_FIELDS = {
+    "salary_min",
+    "salary_max",
+    "currency",
+    "posted_on",
+    "status_code",
+    "applied_on",
+    "updated_on",
+}
+
+# values used for a phase that was skipped
+PHASE_DEFAULTS = {
+    "job_info": {
+        "job_title": "N/A",
+        "company_name": "N/A",
+        "job_location": "N/A",
+        "job_salary": "N/A",
+        "job_url": "N/A",
+    },
+    "detail": {
+        "job_classification": "N/A",
+        "job_type": "N/A",
+        "job_posted_date": "N/A",
+        "job_listed_at": "N/A",
+    },
+    "status": {"application_status": [], "is_expired": False},
+    "docs": {"resume": "N/A", "cover_letter": "N/A"},
+}
+
+
+def parse_fields(value):
+    """argparse type for --fields, a comma separated list of output columns"""
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in FIELD_PHASES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown field(s) {', '.join(unknown)}, "
+            f"choose from: {', '.join(FIELD_PHASES)}"
+        )
+    if not fields:
+        raise argparse.ArgumentTypeError("at least one field is required")
+    # id is always kept so records stay addressable
+    return list(dict.fromkeys(["id", *fields]))
+
+
+def required_phases(fields=None):
+    """Scraping phases needed for the selected fields, all of them by default"""
+    if not fields:
+        return set(ALL_PHASES)
+    return {phase for field in fields for phase in FIELD_PHASES[field]}
+
+
+def record_keys(fields):
+    """Keys to keep from a raw (json) record for the selected fields"""
+    return list(dict.fromkeys(DERIVED_FIELDS.get(field, field) for field in fields))
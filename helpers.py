@@ -1,6 +1,93 @@
+from normalizer import parse_date, reference_day
+from datetime import date, datetime, timedelta
 import re
 
+EMAIL_PATTERN = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+# zero-width space, word joiner and other invisible characters
+INVISIBLE_PATTERN = re.compile(r"[\u2060\u200B-\u200F\uFEFF]")
+NUMBER_PATTERN = re.compile(r"\d+")
+
 
 def email_validation(email: str):
-    pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-    return re.match(pattern, email.strip()) is not None
+    return EMAIL_PATTERN.match(email.strip()) is not None
+
+
+def clean_text(text):
+    if not text or text == "N/A":
+        return text
+
+    cleaned = INVISIBLE_PATTERN.sub("", text)
+    # Replace em dash and en dash with regular hyphen
+    return cleaned.replace("–", "-").replace("—", "-")
+
+
+def record_key(record):
+    """Identity of a scraped job, its url or title, company and location"""
+    url = record.get("job_url")
+    if url and url != "N/A":
+        return url
+    return "|".join(
+        str(record.get(field, "N/A"))
+        for field in ("job_title", "company_name", "job_location")
+    )
+
+
+def parse_posted_date(date_text: str, reference=None):
+    """Turn "Posted N days ago" into a date, counted back from reference"""
+    if not date_text or date_text == "N/A" or "Posted" not in date_text:
+        return "N/A"
+
+    rm_posted = date_text.replace("Posted", "").strip()
+
+    if "30+" in rm_posted:
+        return "30+ days ago"
+
+    get_num = NUMBER_PATTERN.search(rm_posted)
+    if not get_num:
+        return "N/A"
+
+    days_ago = int(get_num[0])
+    posted_date = (reference or datetime.now()) - timedelta(days=days_ago)
+    return posted_date.strftime("%d-%m-%Y")
+
+
+def latest_update(job):
+    """Date of the latest application status update of a record
+
+    Relative texts ("Kemarin", "2 hari yang lalu") are counted back from
+    the day the record was scraped.
+    """
+    reference = reference_day(job)
+    dates = [
+        parse_date(status.get("updated_at"), reference)
+        for status in job.get("application_status") or []
+        if isinstance(status, dict)
+    ]
+    return max((date.fromisoformat(d) for d in dates if d), default=None)
+
+
+def take_recent(jobs, limit=None, since=None, window=20):
+    """Yield jobs updated on or after `since`, at most `limit` of them
+
+    Jobs come newest application first, so the walk stops once `window`
+    jobs in a row (a full results page) were not updated since the cutoff,
+    and as soon as `limit` jobs were taken. Stopping closes `jobs`, so no
+    further pages are fetched.
+    """
+    if limit is not None and limit <= 0:
+        return
+    taken = misses = 0
+    for job in jobs:
+        if since is not None:
+            updated = latest_update(job)
+            if updated is None or updated < since:
+                misses += 1
+                if misses >= window:
+                    return
+                continue
+            misses = 0
+
+        yield job
+        taken += 1
+        if limit and taken >= limit:
+            return
@@ -0,0 +1,85 @@
+from datetime import datetime
+import jsoncodec
+import json
+import re
+
+# the job page ships its data as a redux store, the detail fields live in
+# jobdetails.result.job with the same shapes as the GraphQL api
+STATE_VARIABLE = "SEEK_REDUX_DATA"
+STATE_SCRIPT = f"""
+const state = window.{STATE_VARIABLE};
+const job = state && state.jobdetails && state.jobdetails.result
+    && state.jobdetails.result.job;
+return job ? JSON.stringify(job) : null;
+"""
+STATE_PATTERN = re.compile(rf"window\.{STATE_VARIABLE}\s*=\s*")
+# the store is serialized as javascript, which may leave undefined values
+UNDEFINED_PATTERN = re.compile(r"(?<=[:,\[])\s*undefined\b")
+POSTED_FORMAT = "%d-%m-%Y"
+
+
+def label(value):
+    """Display text of a labelled value, or of a list of them"""
+    if isinstance(value, list):
+        labels = [
+            v.get("label") for v in value if isinstance(v, dict) and v.get("label")
+        ]
+        return ", ".join(labels) if labels else "N/A"
+    if isinstance(value, dict):
+        return value.get("label") or value.get("name") or "N/A"
+    return "N/A"
+
+
+def parse_timestamp(value):
+    """Aware datetime of a {"dateTimeUtc": ...} value, None when missing"""
+    if not isinstance(value, dict) or not value.get("dateTimeUtc"):
+        return None
+    try:
+        return datetime.fromisoformat(value["dateTimeUtc"].replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def job_from_html(html):
+    """The job object of the page state embedded in raw HTML, None if absent"""
+    match = STATE_PATTERN.search(html or "")
+    if not match:
+        return None
+    decoder = json.JSONDecoder()
+    text = html[match.end() :]
+    try:
+        state, _ = decoder.raw_decode(text)
+    except ValueError:
+        end = text.find("</script>")
+        end = end if end >= 0 else len(text)
+        try:
+            state, _ = decoder.raw_decode(UNDEFINED_PATTERN.sub("null", text[:end]))
+        except ValueError:
+            return None
+    try:
+        return state["jobdetails"]["result"]["job"] or None
+    except (KeyError, TypeError):
+        return None
+
+
+def job_from_script(result):
+    """The job object returned by STATE_SCRIPT, None if the page had none"""
+    if not result:
+        return None
+    try:
+        job = jsoncodec.loads(result)
+    except ValueError:
+        return None
+    return job if isinstance(job, dict) else None
+
+
+def extra_info_from_job(job):
+    """Detail page fields of a state job object, exact to the listing time"""
+    listed_at = parse_timestamp(job.get("listedAt"))
+    return {
+        "job_classification": label(job.get("classifications")),
+        "job_type": label(job.get("workTypes")),
+        # the api client formats the posting day the same way
+        "job_posted_date": listed_at.strftime(POSTED_FORMAT) if listed_at else "N/A",
+        "job_listed_at": listed_at.isoformat() if listed_at else "N/A",
+    }
@@ -0,0 +1,70 @@
+from typing import IO, Any, Iterable
+import json
+
+try:
+    import orjson
+except ImportError:  # optional, the standard library encodes the same bytes
+    orjson = None
+
+BACKENDS = ("orjson", "json") if orjson else ("json",)
+BACKEND = BACKENDS[0]
+# file buffer size, encoded records are written through it in large chunks
+CHUNK_SIZE = 1024 * 1024
+
+
+def dumps(obj: Any, indent: bool = False, backend: str = None) -> bytes:
+    """UTF-8 JSON of obj, indented by two spaces or without any whitespace"""
+    if (backend or BACKEND) == "orjson":
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # ints over 64 bits, non-str keys, let the stdlib have a go
+            pass
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def open_output(path: str) -> IO[bytes]:
+    return open(path, "wb", buffering=CHUNK_SIZE)
+
+
+def write_array(
+    f: IO[bytes], records: Iterable, indent: bool = True, backend: str = None
+) -> int:
+    """Write records as a JSON array, encoding one record at a time
+
+    Indented output has the layout of json.dump(list, indent=2), compact
+    output puts one record per line. Returns the number of records.
+    """
+    separator = b",\n  " if indent else b",\n"
+    count = 0
+    f.write(b"[")
+    for count, record in enumerate(records, 1):
+        data = dumps(record, indent, backend)
+        if indent:
+            # nest the record one level under the array
+            data = data.replace(b"\n", b"\n  ")
+        f.write(separator if count > 1 else separator[1:])
+        f.write(data)
+    # json.dump writes an empty list as []
+    f.write(b"\n]" if count else b"]")
+    return count
+
+
+def write_lines(f: IO[bytes], records: Iterable, backend: str = None) -> int:
+    """Write records as JSON Lines, returns the number of records"""
+    count = 0
+    for count, record in enumerate(records, 1):
+        f.write(dumps(record, backend=backend))
+        f.write(b"\n")
+    return count
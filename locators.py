@@ -0,0 +1,216 @@
+from collections import namedtuple
+import statistics
+import time
+
+CSS = "css selector"
+XPATH = "xpath"
+
+# expected number of matches in the scope the locator is run from
+ONE = "one"
+OPTIONAL = "optional"  # zero or one
+MANY = "many"  # one or more
+
+DEFAULT_LOCALE = "id"
+SITE_KEYS = ("base_url", "api_url", "job_url", "country", "locale")
+
+Locator = namedtuple("Locator", ["name", "by", "value", "expect", "page"])
+
+# SEEK sites per locale, labels are the texts the drawer shows next to
+# the data we read. The English labels are the SEEK wording and were not
+# checked against every site, compare them with `main.py selectors`.
+LOCALES = {
+    "id": {
+        "base_url": "https://id.jobstreet.com/id/my-activity/applied-jobs",
+        "api_url": "https://id.jobstreet.com/graphql",
+        "job_url": "https://id.jobstreet.com/id/job",
+        "country": "ID",
+        "locale": "id-ID",
+        "labels": {
+            "applied_for": "Lamaran untuk",
+            "application_status": "Status lamaran",
+            "expired": "Lowongan kerja ini telah kedaluwarsa",
+            "applicants": "kandidat melamar untuk posisi ini",
+            "posted": "Posted",
+            "per_month": "per month",
+        },
+    },
+    "en": {
+        "base_url": "https://id.jobstreet.com/my-activity/applied-jobs",
+        "api_url": "https://id.jobstreet.com/graphql",
+        "job_url": "https://id.jobstreet.com/job",
+        "country": "ID",
+        "locale": "en-ID",
+    },
+    "my": {
+        "base_url": "https://my.jobstreet.com/my-activity/applied-jobs",
+        "api_url": "https://my.jobstreet.com/graphql",
+        "job_url": "https://my.jobstreet.com/job",
+        "country": "MY",
+        "locale": "en-MY",
+    },
+    "sg": {
+        "base_url": "https://sg.jobstreet.com/my-activity/applied-jobs",
+        "api_url": "https://sg.jobstreet.com/graphql",
+        "job_url": "https://sg.jobstreet.com/job",
+        "country": "SG",
+        "locale": "en-SG",
+    },
+}
+ENGLISH_LABELS = {
+    "applied_for": "Applied for",
+    "application_status": "Application status",
+    "expired": "This job ad has expired",
+    "applicants": "candidates applied for this role",
+    "posted": "Posted",
+    "per_month": "per month",
+}
+for _site in ("en", "my", "sg"):
+    LOCALES[_site]["labels"] = ENGLISH_LABELS
+
+# name -> (by, value, expected matches, page it runs on), {label} placeholders
+# are filled from the locale. Text matches are relative (.//) to the drawer,
+# so they never scan the whole results page.
+SELECTORS = {
+    "job_cards": (CSS, "[data-automation^='job-item-']", MANY, "list"),
+    "card_header": (CSS, "h4 span[role='button']", ONE, "card"),
+    "drawer": (CSS, "[role='dialog']", ONE, "list"),
+    "drawer_close": (CSS, "[aria-label='Close']", ONE, "list"),
+    "applied_for": (XPATH, ".//span[contains(text(), '{applied_for}')]", ONE, "drawer"),
+    "application_status": (
+        XPATH,
+        ".//span[contains(text(), '{application_status}')]",
+        ONE,
+        "drawer",
+    ),
+    "expired_notice": (
+        XPATH,
+        ".//span[contains(text(), '{expired}')]",
+        OPTIONAL,
+        "drawer",
+    ),
+    "applicants": (
+        XPATH,
+        ".//span[contains(text(), '{applicants}')]",
+        OPTIONAL,
+        "drawer",
+    ),
+    "resume": (CSS, "span[data-automation='job-item-resume']", ONE, "drawer"),
+    "cover_letter": (
+        CSS,
+        "span[data-automation='job-item-cover-letter']",
+        ONE,
+        "drawer",
+    ),
+    "job_classification": (
+        CSS,
+        "span[data-automation='job-detail-classifications'] a",
+        MANY,
+        "detail",
+    ),
+    "job_type": (CSS, "span[data-automation='job-detail-work-type'] a", ONE, "detail"),
+    "posted_date": (XPATH, "//span[contains(text(), '{posted}')]", ONE, "detail"),
+}
+
+
+def site_settings(site=DEFAULT_LOCALE):
+    """Urls and request settings of a locale, as configurations keys"""
+    if site not in LOCALES:
+        raise ValueError(
+            f"Unsupported locale {site}, choose from: {', '.join(LOCALES)}"
+        )
+    return {"site": site, **{key: LOCALES[site][key] for key in SITE_KEYS}}
+
+
+def get_labels(site=DEFAULT_LOCALE):
+    return LOCALES[site]["labels"]
+
+
+def get_locators(site=DEFAULT_LOCALE):
+    """Locators for a locale, with its labels filled in"""
+    labels = get_labels(site)
+    return {
+        name: Locator(name, by, value.format(**labels), expect, page)
+        for name, (by, value, expect, page) in SELECTORS.items()
+    }
+
+
+def count_mismatch(locator, count):
+    """Describe a match count the locator does not expect, None when fine"""
+    if locator.expect == ONE and count != 1:
+        return f"expected 1 match, got {count}"
+    if locator.expect == OPTIONAL and count > 1:
+        return f"expected at most 1 match, got {count}"
+    if locator.expect == MANY and count == 0:
+        return "expected at least 1 match, got 0"
+    return None
+
+
+def _compile(locator):
+    """Offline matcher for a locator, None when it cannot run without a browser"""
+    from lxml import etree
+
+    if locator.by == XPATH:
+        return etree.XPath(locator.value)
+    try:
+        from lxml.cssselect import CSSSelector
+    except ImportError:
+        return None
+    return CSSSelector(locator.value)
+
+
+def benchmark_locators(root="archive", site=DEFAULT_LOCALE, limit=None, repeat=3):
+    """Time each drawer and detail page locator against archived HTML
+
+    Returns one row per locator with its median lookup time and the number
+    of documents where the match count was not the expected one. Needs
+    lxml, CSS locators also need the cssselect package.
+    """
+    try:
+        from lxml import etree
+    except ImportError:
+        raise RuntimeError("Benchmarking locators needs lxml (pip install lxml)")
+    from archive import HtmlArchive
+
+    archive = HtmlArchive(root)
+    entries = archive.entries()[:limit] if limit else archive.entries()
+    parser = etree.HTMLParser()
+    pages = {"drawer": [], "detail": []}
+    for entry in entries:
+        for page in pages:
+            if entry.get(page):
+                pages[page].append(etree.fromstring(archive.load(entry[page]), parser))
+
+    rows = []
+    for locator in get_locators(site).values():
+        documents = pages.get(locator.page)
+        if not documents:
+            continue
+        matcher = _compile(locator)
+        if matcher is None:
+            rows.append({"name": locator.name, "by": locator.by, "skipped": True})
+            continue
+
+        timings = []
+        mismatches = 0
+        matched = 0
+        for document in documents:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                count = len(matcher(document))
+            timings.append((time.perf_counter() - start) / repeat)
+            matched += count > 0
+            mismatches += count_mismatch(locator, count) is not None
+
+        rows.append(
+            {
+                "name": locator.name,
+                "by": locator.by,
+                "page": locator.page,
+                "documents": len(documents),
+                "matched": matched,
+                "mismatches": mismatches,
+                "median_us": round(statistics.median(timings) * 1e6, 1),
+                "skipped": False,
+            }
+        )
+    return rows
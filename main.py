@@ -1,17 +1,112 @@
-from configs import cleanup_webdriver_temp_dir
-from scraper import JobStreetScraper
 from helpers import email_validation
 from cli import cli_scraper_parser
-from rich.console import Console
-from configs import init_logging
-from exporter import export_to
-from rich.panel import Panel
 import logging
+import sys
+import os
+
+# selenium, rich and the scraper are imported inside the commands that need
+# them, so `--help`, `export` and `stats` start without loading a browser stack
 
 
 def main():
-    console = Console()
     args = cli_scraper_parser()
+
+    match args.command:
+        case "export":
+            return run_export(args)
+        case "stats":
+            return run_stats(args)
+        case "reextract":
+            return run_reextract(args)
+        case "selectors":
+            return run_selectors(args)
+        case "coordinate":
+            return run_coordinate(args)
+        case "work":
+            return run_work(args)
+        case "collect":
+            return run_collect(args)
+        case _:
+            return run_scrape(args)
+
+
+def run_export(args):
+    from exporter import export_to, load_jobs
+
+    jobs_data = load_jobs(args.input)
+    export_data = export_to(
+        args.format,
+        jobs_data,
+        filename=args.output,
+        fields=args.fields,
+        typed=args.typed,
+        compact=args.compact,
+    )
+    print(f"Exported {len(jobs_data)} jobs to:\n{export_data}")
+
+
+def run_stats(args):
+    from stats import compute_stats, format_stats
+    from exporter import load_jobs
+
+    print(format_stats(compute_stats(load_jobs(args.input), top=args.top)))
+
+
+def run_reextract(args):
+    from ordering import order_jobs
+    from exporter import export_to
+    from archive import reextract
+    import time
+
+    start_time = time.time()
+    jobs_data = order_jobs(
+        reextract(args.archive, workers=args.workers),
+        descending=args.sort == "desc",
+    )
+    export_data = export_to(args.format, jobs_data, filename="jobstreet_jobs")
+    print(
+        f"Re-extracted {len(jobs_data)} jobs in {time.time() - start_time:.2f}s, "
+        f"exported to:\n{export_data}"
+    )
+
+
+def run_selectors(args):
+    from locators import benchmark_locators
+    from rich.console import Console
+    from rich.table import Table
+
+    rows = benchmark_locators(args.archive, site=args.locale, limit=args.limit)
+    table = Table(title=f"Selectors ({args.locale}) against {args.archive}")
+    table.add_column("Selector", style="cyan", no_wrap=True)
+    table.add_column("Type")
+    table.add_column("Page")
+    table.add_column("Matched", justify="right")
+    table.add_column("Wrong count", justify="right")
+    table.add_column("Median (µs)", justify="right")
+    for row in rows:
+        if row["skipped"]:
+            table.add_row(row["name"], "css", "-", "-", "-", "needs cssselect")
+            continue
+        table.add_row(
+            row["name"],
+            "xpath" if row["by"] == "xpath" else "css",
+            row["page"],
+            f"{row['matched']}/{row['documents']}",
+            f"[red]{row['mismatches']}[/]" if row["mismatches"] else "0",
+            f"{row['median_us']:.1f}",
+        )
+    Console().print(table)
+
+
+def run_scrape(args):
+    from configs import configure_locale, init_logging
+    from throttle import AdaptiveThrottle
+    from scraper import JobStreetScraper
+    from rich.console import Console
+    from exporter import export_to
+    from rich.panel import Panel
+
+    console = Console()
     email = args.email
 
     total_jobs = 0
@@ -27,23 +122,104 @@ def main():
         email = console.input("Enter your Jobstreet email: ").strip()
 
     sort_by = args.sort == "desc"
-    init_logging(log_console=args.verbose)
+    configure_locale(args.locale)
+    init_logging(log_console=args.verbose, log_json=args.log_json)
     logger = logging.getLogger(__name__)
 
-    scraper = JobStreetScraper(
-        email=email,
-        browser=args.browser,
-        headless=args.headless,
-    )
+    scraper = None
+    archive = None
+    profiler = None
+    memprofiler = None
+    spool = None
+    refresh = None
+    if args.archive:
+        from archive import HtmlArchive
+
+        archive = HtmlArchive(args.archive)
+    if args.profile:
+        from profiler import CommandProfiler
+
+        profiler = CommandProfiler(python=args.profile_python)
+    if args.memprofile or args.memory_cap:
+        from memprofile import MemoryProfiler, RecordSpool
+
+        if args.memprofile:
+            memprofiler = MemoryProfiler()
+        if args.memory_cap:
+            spool = RecordSpool(args.memory_cap)
+    if args.refresh_from:
+        from refresh import RefreshPolicy
+
+        refresh = RefreshPolicy.from_export(
+            args.refresh_from,
+            cold_every=args.cold_every,
+            full=args.full_refresh,
+            fields=args.fields,
+        )
+    throttle = AdaptiveThrottle(max_rate=args.max_rate)
+    otp = create_otp_provider(args, email, console)
 
     try:
-        jobs = scraper.scrape_all_jobs(reverse=sort_by)
+        if args.api:
+            jobs = fetch_jobs_over_api(args, email, sort_by, otp)
+        else:
+            scraper = JobStreetScraper(
+                email=email,
+                browser=args.browser,
+                headless=args.headless,
+                archive=archive,
+                profiler=profiler,
+                fields=args.fields,
+                throttle=throttle,
+                otp=otp,
+                memprofiler=memprofiler,
+                spool=spool,
+                refresh=refresh,
+            )
+            if profiler:
+                profiler.context = scraper.log_context
+                profiler.start()
+            if memprofiler:
+                memprofiler.start()
+            try:
+                jobs = scraper.scrape_all_jobs(
+                    reverse=sort_by, limit=args.limit, since=args.since
+                )
+            finally:
+                if profiler:
+                    profiler.stop()
+                    console.print(profiler.render())
+                    profile_paths = profiler.save()
+                    console.print(
+                        f"[dim]Profile saved to {', '.join(profile_paths)}[/]"
+                    )
+                if memprofiler:
+                    memprofiler.stop()
+                    console.print(memprofiler.render())
+                    console.print(
+                        f"[dim]Memory profile saved to {memprofiler.save()}[/]"
+                    )
+        if refresh:
+            # a cut short or failed run keeps the cards it did not get to
+            refresh.save(complete=jobs["completed"] and not (args.limit or args.since))
         jobs_data = jobs["jobs_data"]
         total_jobs = jobs["total_jobs"]
         total_elapsed = jobs["total_elapsed"]
         completed_at = jobs["scraping_completed_at"]
 
-        export_data = export_to(args.format, jobs_data, filename="jobstreet_jobs")
+        status = (
+            "[green]✅ Status:[/] Completed successfully"
+            if jobs["completed"]
+            else f"[yellow]⚠️ Status:[/] Stopped early: {jobs['error']}"
+        )
+        export_data = export_to(
+            args.format,
+            jobs_data,
+            filename="jobstreet_jobs",
+            fields=args.fields,
+            typed=args.typed,
+            compact=args.compact,
+        )
 
         console.print(
             Panel.fit(
@@ -52,17 +228,19 @@ def main():
                 f"[magenta]⏱️ Total time:[/] {total_elapsed:.2f} seconds\n"
                 f"[blue]📝 Export format:[/] {args.format}\n"
                 f"[yellow]📁 Exported to:[/] {export_data}\n"
-                f"[green]✅ Status:[/] Completed successfully\n"
+                f"{status}\n"
                 f"[green]📅 Completed at:[/] {completed_at}\n",
                 title="[bold blue]JobStreet Scraper Results[/]",
                 border_style="green",
             )
         )
         logger.info(
-            f"Scraping completed: {total_jobs} jobs collected in {total_elapsed:.2f} seconds."
+            "Scraping completed: %s jobs collected in %.2f seconds.",
+            total_jobs,
+            total_elapsed,
         )
-        logger.info(f"Exported data to {export_data} in {args.format} format.")
-        logger.info(f"Scraping completed at {completed_at}.")
+        logger.info("Exported data to %s in %s format.", export_data, args.format)
+        logger.info("Scraping completed at %s.", completed_at)
 
     except Exception as e:
         console.print(f"[bold red]An error occurred:[/] {e}")
@@ -76,13 +254,225 @@ def main():
                 border_style="red",
             )
         )
-        logger.error(f"Error during scraping: {e}")
+        logger.error("Error during scraping: %s", e)
     finally:
         if scraper:
-            cleanup_webdriver_temp_dir(scraper.driver, scraper.profile_path)
             scraper.close_browser()
             console.print("[dim]Browser closed and temporary files cleaned up.[/]")
+        if spool:
+            spool.cleanup()
+
+
+def _queue_scraper(args, email, console):
+    """Browser scraper for the coordinate and work commands"""
+    from configs import configure_locale, init_logging
+    from throttle import AdaptiveThrottle
+    from scraper import JobStreetScraper
+
+    configure_locale(args.locale)
+    init_logging(log_console=args.verbose, log_json=args.log_json)
+    return JobStreetScraper(
+        email=email,
+        browser=args.browser,
+        headless=args.headless,
+        throttle=AdaptiveThrottle(max_rate=args.max_rate),
+        otp=create_otp_provider(args, email, console),
+    )
+
+
+def run_coordinate(args):
+    from workqueue import WorkQueue, serve_queue
+    from rich.console import Console
+
+    console = Console()
+    email = args.email
+    while not (email and email_validation(email)):
+        email = console.input("Enter your Jobstreet email: ").strip()
+
+    queue = WorkQueue(args.queue)
+    scraper = _queue_scraper(args, email, console)
+    try:
+        if not scraper.login():
+            raise RuntimeError("Login failed, nothing was published")
+        # workers continue this session instead of each logging in
+        queue.set_meta("cookies", scraper.driver.get_cookies())
+        queue.set_meta("locale", args.locale)
+        pages = [
+            {"key": url, "page": page_num, "url": url}
+            for page_num, url in scraper.discover_pages()
+        ]
+    finally:
+        scraper.close_browser()
+
+    added = queue.publish("page", pages)
+    console.print(
+        f"Published {added} new of {len(pages)} pages to {args.queue}: {queue.counts()}"
+    )
+    if args.serve:
+        host, _, port = args.serve.rpartition(":")
+        console.print(f"[dim]Serving the queue on {args.serve}, Ctrl+C to stop[/]")
+        try:
+            serve_queue(queue, host or "127.0.0.1", int(port))
+        except KeyboardInterrupt:
+            pass
+    queue.close()
+
+
+def run_work(args):
+    from workqueue import open_queue, worker_name
+    from rich.console import Console
+    import time
+
+    console = Console()
+    queue = open_queue(args.queue)
+    owner = worker_name()
+    locale = queue.get_meta("locale")
+    if locale:
+        args.locale = locale
+
+    scraper = _queue_scraper(args, args.email, console)
+    done = 0
+    try:
+        cookies = queue.get_meta("cookies")
+        if cookies:
+            scraper.open_session(cookies)
+        elif not (args.email and scraper.login()):
+            raise RuntimeError("No session in the queue, log in with -e EMAIL")
+
+        while args.max_items is None or done < args.max_items:
+            item = queue.claim(owner, args.lease)
+            if item is None:
+                # pages leased by others come back if their worker dies
+                if queue.counts()["leased"]:
+                    time.sleep(10)
+                    continue
+                break
+
+            def heartbeat():
+                if not queue.extend(item["id"], owner, args.lease):
+                    scraper.logger.warning("Lost the lease of page %s", item["page"])
+
+            console.print(f"[cyan]Page {item['page']}[/] (attempt {item['attempt']})")
+            try:
+                records = scraper.scrape_page(item["page"], item["url"], heartbeat)
+                if not records:
+                    raise RuntimeError("no job cards loaded")
+            except Exception as e:
+                console.print(f"[bold red]Page {item['page']} failed:[/] {e}")
+                queue.fail(item["id"], owner, str(e))
+                continue
+            if not queue.complete(item["id"], owner, records):
+                console.print(
+                    f"[yellow]Page {item['page']} was taken over by another "
+                    "worker, its records were dropped[/]"
+                )
+                continue
+            done += 1
+            console.print(f"[green]Page {item['page']}: {len(records)} jobs posted[/]")
+    finally:
+        scraper.close_browser()
+        console.print(f"Worker {owner} finished {done} pages: {queue.counts()}")
+        queue.close()
+
+
+def run_collect(args):
+    from workqueue import WorkQueue, collect_results
+    from ordering import order_jobs
+    from exporter import export_to
+
+    queue = WorkQueue(args.queue)
+    counts = queue.counts()
+    jobs_data = order_jobs(collect_results(queue), descending=args.sort == "desc")
+    queue.close()
+    if counts["pending"] or counts["leased"] or counts["failed"]:
+        print(f"Warning: the queue is not complete, {counts}")
+
+    export_data = export_to(
+        args.format,
+        jobs_data,
+        filename="jobstreet_jobs",
+        fields=args.fields,
+        typed=args.typed,
+        compact=args.compact,
+    )
+    print(f"Collected {len(jobs_data)} unique jobs, exported to:\n{export_data}")
+
+
+def create_otp_provider(args, email, console):
+    """OTP provider selected by --otp"""
+    from otp import PASSWORD_ENV, ConsoleProvider, ImapProvider, MailboxProvider
+
+    if args.otp == "mailbox":
+        return MailboxProvider(args.otp_mailbox, timeout=args.otp_timeout)
+    if args.otp == "imap":
+        password = os.environ.get(PASSWORD_ENV)
+        if password is None:
+            password = console.input(
+                f"IMAP password for {args.imap_user or email} "
+                f"(or set {PASSWORD_ENV}): ",
+                password=True,
+            )
+        return ImapProvider(
+            args.imap_host,
+            args.imap_user or email,
+            password,
+            port=args.imap_port,
+            ssl=not args.imap_plain,
+            folder=args.imap_folder,
+            timeout=args.otp_timeout,
+        )
+    return ConsoleProvider(console)
+
+
+def _login_for_api(args, email, otp=None):
+    """Session cookies of a fresh browser login, saved to --session if given"""
+    from api_client import save_session
+    from scraper import JobStreetScraper
+
+    scraper = JobStreetScraper(
+        email=email,
+        browser=args.browser,
+        headless=args.headless,
+        otp=otp,
+    )
+    try:
+        if not scraper.login():
+            raise RuntimeError("Login failed, cannot start API mode")
+        cookies = scraper.driver.get_cookies()
+    finally:
+        scraper.close_browser()
+
+    if args.session:
+        save_session(cookies, args.session)
+    return cookies
+
+
+def fetch_jobs_over_api(args, email, sort_by, otp=None):
+    """Log in with the browser only when needed, then fetch jobs over HTTP"""
+    from api_client import JobStreetApiClient
+
+    if args.session and os.path.exists(args.session):
+        client = JobStreetApiClient.from_session_file(args.session)
+        try:
+            return client.fetch_all_jobs(
+                reverse=sort_by, limit=args.limit, since=args.since
+            )
+        except PermissionError as e:
+            # saved cookies expire, the file is replaced by a fresh login
+            logging.getLogger(__name__).warning(
+                "Session %s is no longer valid (%s), logging in again", args.session, e
+            )
+        finally:
+            client.close()
+
+    client = JobStreetApiClient(_login_for_api(args, email, otp))
+    try:
+        return client.fetch_all_jobs(
+            reverse=sort_by, limit=args.limit, since=args.since
+        )
+    finally:
+        client.close()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,245 @@
+from driver_watchdog import _descendants
+from ordering import SpooledJobs, order_jobs
+from datetime import datetime
+from rich.table import Table
+import tracemalloc
+import tempfile
+import logging
+import json
+import os
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = "profiles"
+TOP_SITES = 10
+# records move to disk once the process reaches this share of the cap
+SPILL_AT = 0.9
+# records between resident size reads, a read opens /proc/self/status
+CHECK_EVERY = 20
+# once spooling, the resident size stays up (freed memory is reused, not
+# returned), so records are moved in batches of this many instead
+SPILL_BATCH = 200
+MB = 1024 * 1024
+
+
+def read_rss(pid="self"):
+    """(resident, peak resident) bytes of a process, Nones without /proc"""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, amount, _unit = line.split()
+                    values[key] = int(amount) * 1024
+    except (OSError, ValueError):
+        return None, None
+    return values.get("VmRSS:"), values.get("VmHWM:")
+
+
+def browser_rss(driver):
+    """Resident bytes of the driver service and every browser process under it"""
+    if not os.path.isdir("/proc"):
+        return None
+    try:
+        root = driver.service.process.pid
+    except AttributeError:
+        return None
+    total = 0
+    for pid in [root, *_descendants(root)]:
+        rss, _ = read_rss(pid)
+        total += rss or 0
+    return total or None
+
+
+class MemoryProfiler:
+    """Track memory at page boundaries with tracemalloc and /proc
+
+    Each page gets the traced Python heap, its peak since the previous
+    page, the resident size of this process and of the browser, and the
+    allocation sites that grew the most over the page.
+    """
+
+    def __init__(self, top=TOP_SITES, frames=1):
+        self.top = top
+        self.frames = frames
+        self.pages = []
+        self.browser_peak = 0
+        self.previous = None
+
+    def start(self):
+        tracemalloc.start(self.frames)
+        self.previous = tracemalloc.take_snapshot()
+
+    def page_done(self, page_num, records, driver=None):
+        if not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        growth = [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff": stat.size_diff,
+                "size": stat.size,
+                "count": stat.count,
+            }
+            for stat in snapshot.compare_to(self.previous, "lineno")[: self.top]
+        ]
+        self.previous = snapshot
+
+        rss, rss_peak = read_rss()
+        browser = browser_rss(driver) if driver else None
+        self.browser_peak = max(self.browser_peak, browser or 0)
+        self.pages.append(
+            {
+                "page": page_num,
+                "records": records,
+                "traced": current,
+                "traced_peak": peak,
+                "rss": rss,
+                "rss_peak": rss_peak,
+                "browser_rss": browser,
+                "top_growth": growth,
+            }
+        )
+        logger.debug(
+            "Memory after page %s: traced %.1f MB (peak %.1f MB), rss %s MB",
+            page_num,
+            current / MB,
+            peak / MB,
+            f"{rss / MB:.1f}" if rss else "N/A",
+        )
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.previous = None
+
+    def summary(self):
+        peaks = [page["rss_peak"] for page in self.pages if page["rss_peak"]]
+        return {
+            "pages": len(self.pages),
+            "traced_peak_mb": round(
+                max((page["traced_peak"] for page in self.pages), default=0) / MB, 1
+            ),
+            "python_rss_peak_mb": round(max(peaks) / MB, 1) if peaks else None,
+            "browser_rss_peak_mb": (
+                round(self.browser_peak / MB, 1) if self.browser_peak else None
+            ),
+        }
+
+    def render(self):
+        """Rich table of memory per page with its top growing allocation site"""
+        summary = self.summary()
+        table = Table(
+            title="Memory per page",
+            caption=(
+                f"peak traced {summary['traced_peak_mb']} MB, "
+                f"python rss {summary['python_rss_peak_mb'] or 'N/A'} MB, "
+                f"browser rss {summary['browser_rss_peak_mb'] or 'N/A'} MB"
+            ),
+        )
+        table.add_column("Page", justify="right")
+        table.add_column("Records", justify="right")
+        table.add_column("Traced (MB)", justify="right")
+        table.add_column("Peak (MB)", justify="right")
+        table.add_column("RSS (MB)", justify="right")
+        table.add_column("Browser (MB)", justify="right")
+        table.add_column("Top growth", style="cyan", no_wrap=True)
+
+        def mb(value):
+            return f"{value / MB:.1f}" if value else "N/A"
+
+        for page in self.pages:
+            top = page["top_growth"][0] if page["top_growth"] else None
+            table.add_row(
+                str(page["page"]),
+                str(page["records"]),
+                mb(page["traced"]),
+                mb(page["traced_peak"]),
+                mb(page["rss"]),
+                mb(page["browser_rss"]),
+                f"{top['site']} {top['size_diff'] / 1024:+.0f} KiB" if top else "-",
+            )
+        return table
+
+    def save(self, output_dir=PROFILE_DIR):
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(output_dir, f"memory_profile_{timestamp}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"summary": self.summary(), "pages": self.pages}, f, indent=2)
+        logger.info("Saved memory profile to %s", path)
+        return path
+
+
+class RecordSpool:
+    """Keep collected records under a memory cap by moving them to disk
+
+    Once the resident size of the process nears `cap_mb`, the records held
+    in memory are appended to a JSONL spool file and dropped, and from then
+    on every SPILL_BATCH records. The output is read back from the spool in
+    order by the exporters.
+    """
+
+    def __init__(
+        self, cap_mb, directory=None, check_every=CHECK_EVERY, batch=SPILL_BATCH
+    ):
+        self.cap = cap_mb * MB
+        self.directory = directory
+        self.check_every = check_every
+        self.batch = batch
+        self.path = None
+        self.spilled = 0
+        self.added = 0
+
+    def over_cap(self):
+        rss, _ = read_rss()
+        return rss is not None and rss >= self.cap * SPILL_AT
+
+    def add(self, records):
+        """Count one collected record, spill the list when it is due"""
+        self.added += 1
+        if self.path is not None:
+            if len(records) >= self.batch:
+                self.spill(records)
+        elif self.added % self.check_every == 0 and self.over_cap():
+            self.spill(records)
+
+    def spill(self, records):
+        """Append records to the spool file and empty the list"""
+        if not records:
+            return
+        if self.path is None:
+            fd, self.path = tempfile.mkstemp(
+                prefix="jobstreet_spool_", suffix=".jsonl", dir=self.directory
+            )
+            os.close(fd)
+            logger.warning(
+                "Memory near the %s MB cap, spooling records to %s",
+                self.cap // MB,
+                self.path,
+            )
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+        self.spilled += len(records)
+        records.clear()
+
+    def ordered(self, records, descending=False):
+        """All records in output order, streamed from disk when any were spilled"""
+        if self.path is None:
+            return order_jobs(records, descending=descending)
+        self.spill(records)
+        return SpooledJobs(self.path, self.spilled, descending)
+
+    def cleanup(self):
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
@@ -0,0 +1,273 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from fields import TYPED_FIELDS
+from enum import StrEnum
+import re
+
+# English and Indonesian month abbreviations used in status dates
+MONTHS = {
+    "jan": 1, "feb": 2, "peb": 2, "mar": 3, "apr": 4, "may": 5, "mei": 5,
+    "jun": 6, "jul": 7, "aug": 8, "agu": 8, "agt": 8, "sep": 9, "oct": 10,
+    "okt": 10, "nov": 11, "dec": 12, "des": 12,
+}  # fmt: skip
+STATUS_DATE_PATTERN = re.compile(r"(\d{1,2})\s+([A-Za-z]+)\.?\s+(\d{4})")
+# salary prefixes and suffixes, "$" alone is resolved from the job url's site
+CURRENCIES = (
+    ("IDR", ("rp", "idr")),
+    ("MYR", ("rm", "myr")),
+    ("SGD", ("s$", "sgd")),
+)
+SITE_CURRENCIES = {"id": "IDR", "my": "MYR", "sg": "SGD"}
+MULTIPLIERS = {
+    "k": 1_000,
+    "rb": 1_000,
+    "ribu": 1_000,
+    "jt": 1_000_000,
+    "juta": 1_000_000,
+    "m": 1_000_000,
+}
+AMOUNT_PATTERN = re.compile(r"(\d[\d.,]*)\s*(ribu|rb|juta|jt|k|m)?\b", re.IGNORECASE)
+SEPARATOR_PATTERN = re.compile(r"[.,]")
+UP_TO_PATTERN = re.compile(r"\b(up to|hingga|sampai|max)\b", re.IGNORECASE)
+SITE_PATTERN = re.compile(r"https?://(\w+)\.jobstreet\.com")
+RELATIVE_PATTERN = re.compile(
+    r"(\d+)\s*(minute|menit|hour|jam|day|hari|week|minggu|month|bulan|(?:h|d|w)\b)",
+    re.IGNORECASE,
+)
+RELATIVE_DAYS = {
+    "h": 0,
+    "d": 1,
+    "w": 7,
+    "minute": 0,
+    "menit": 0,
+    "hour": 0,
+    "jam": 0,
+    "day": 1,
+    "hari": 1,
+    "week": 7,
+    "minggu": 7,
+    "month": 30,
+    "bulan": 30,
+}
+TODAY_WORDS = ("today", "hari ini", "just now", "baru saja")
+YESTERDAY_WORDS = ("yesterday", "kemarin")
+POSTED_FORMAT = "%d-%m-%Y"
+RETRIEVED_FORMAT = "%d-%m-%Y %H:%M:%S"
+
+
+class Status(StrEnum):
+    """Application status steps, written to json and csv as their value"""
+
+    APPLIED = "applied"
+    VIEWED = "viewed"
+    IN_PROGRESS = "in_progress"
+    NOT_PROGRESSING = "not_progressing"
+    WITHDRAWN = "withdrawn"
+    UNKNOWN = "unknown"
+
+
+# first match wins, "tidak dilanjutkan" must be checked before "dilanjutkan"
+STATUS_KEYWORDS = (
+    (Status.NOT_PROGRESSING, ("tidak dilanjutkan", "not progress", "unlikely")),
+    (Status.WITHDRAWN, ("ditarik", "withdrawn", "dibatalkan")),
+    (Status.IN_PROGRESS, ("dilanjutkan", "shortlist", "interview", "wawancara")),
+    (Status.VIEWED, ("dilihat", "viewed")),
+    (Status.APPLIED, ("dilamar", "applied", "lamaran terkirim")),
+)
+
+
+def _amount(number, suffix):
+    """Turn "8.000.000", "5,500" or "8,5 jt" into an int"""
+    separators = [c for c in number if c in ".,"]
+    if separators:
+        last = number.rfind(separators[-1])
+        decimals = len(number) - last - 1
+        # a separator followed by three digits groups thousands, unless the
+        # other separator comes after it ("1.234,5")
+        if len(set(separators)) > 1 or decimals != 3 or suffix:
+            whole = SEPARATOR_PATTERN.sub("", number[:last])
+            number = f"{whole}.{number[last + 1:]}"
+        else:
+            number = SEPARATOR_PATTERN.sub("", number)
+    value = float(number) * MULTIPLIERS.get((suffix or "").lower(), 1)
+    return round(value)
+
+
+@lru_cache(maxsize=4096)
+def parse_salary(text, site=None):
+    """(salary_min, salary_max, currency) of a salary range, Nones if unknown"""
+    if not text or text == "N/A":
+        return None, None, None
+    lowered = text.lower()
+    currency = next(
+        (
+            code
+            for code, markers in CURRENCIES
+            if any(marker in lowered for marker in markers)
+        ),
+        None,
+    )
+    if currency is None and "$" in text:
+        currency = SITE_CURRENCIES.get(site)
+
+    amounts = [_amount(*match) for match in AMOUNT_PATTERN.findall(text)]
+    if not amounts:
+        return None, None, currency
+    if len(amounts) == 1 and UP_TO_PATTERN.search(text):
+        return None, amounts[0], currency
+    return min(amounts), max(amounts), currency
+
+
+def parse_status_date(date_text):
+    """Parse a status date like "5 Mar 2025" or "5 Mei 2025", None otherwise"""
+    match = STATUS_DATE_PATTERN.search(date_text or "")
+    if not match:
+        return None
+    month = MONTHS.get(match.group(2)[:3].lower())
+    if not month:
+        return None
+    try:
+        return date(int(match.group(3)), month, int(match.group(1)))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text, reference=None):
+    """ISO date of an absolute ("5 Mei 2025") or relative date text"""
+    if not text or text == "N/A":
+        return None
+    parsed = parse_status_date(text)
+    if parsed:
+        return parsed.isoformat()
+    try:
+        return datetime.strptime(text, POSTED_FORMAT).date().isoformat()
+    except ValueError:
+        pass
+
+    reference = reference or date.today()
+    lowered = text.lower()
+    if any(word in lowered for word in TODAY_WORDS):
+        return reference.isoformat()
+    if any(word in lowered for word in YESTERDAY_WORDS):
+        return (reference - timedelta(days=1)).isoformat()
+    match = RELATIVE_PATTERN.search(lowered)
+    if match and "+" not in lowered:
+        days = int(match.group(1)) * RELATIVE_DAYS[match.group(2)]
+        return (reference - timedelta(days=days)).isoformat()
+    return None
+
+
+@lru_cache(maxsize=256)
+def parse_status(text):
+    lowered = (text or "").lower()
+    for status, keywords in STATUS_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return status
+    return Status.UNKNOWN
+
+
+def _retrieved_at(text):
+    """Parse "dd-mm-YYYY HH:MM:SS", by slicing since strptime dominates a batch"""
+    try:
+        return datetime(
+            int(text[6:10]),
+            int(text[3:5]),
+            int(text[0:2]),
+            int(text[11:13]),
+            int(text[14:16]),
+            int(text[17:19]),
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def reference_day(job):
+    """Day relative dates of a record count from, the day it was scraped"""
+    retrieved_at = _retrieved_at(job.get("data_retrieved_at"))
+    return retrieved_at.date() if retrieved_at else date.today()
+
+
+def _listed_on(text):
+    """Day of an ISO listing timestamp, in UTC like job_posted_date"""
+    try:
+        return datetime.fromisoformat(text).date().isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_job(job):
+    """Copy of a scraped record with typed salary, date and status fields
+
+    Display fields are kept as they are. Relative dates are counted from
+    the record's data_retrieved_at.
+    """
+    retrieved_at = _retrieved_at(job.get("data_retrieved_at"))
+    reference = retrieved_at.date() if retrieved_at else date.today()
+    site = SITE_PATTERN.match(job.get("job_url") or "")
+
+    salary_min, salary_max, currency = parse_salary(
+        job.get("salary_range"), site.group(1) if site else None
+    )
+    steps = [
+        {
+            **step,
+            "status_code": parse_status(step.get("status")),
+            "updated_on": parse_date(step.get("updated_at"), reference),
+        }
+        for step in job.get("application_status") or []
+        if isinstance(step, dict)
+    ]
+    applicants = job.get("total_applicants")
+
+    normalized = {
+        **job,
+        "data_retrieved_at": (
+            retrieved_at.isoformat() if retrieved_at else job.get("data_retrieved_at")
+        ),
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "currency": currency,
+        "total_applicants": applicants if isinstance(applicants, int) else None,
+        "posted_on": _listed_on(job.get("job_listed_at"))
+        or parse_date(job.get("job_posted_date"), reference),
+        "status_code": steps[-1]["status_code"] if steps else Status.UNKNOWN,
+        "applied_on": steps[0]["updated_on"] if steps else None,
+        "updated_on": steps[-1]["updated_on"] if steps else None,
+    }
+    if "application_status" in job:
+        normalized["application_status"] = steps
+    return normalized
+
+
+def denormalize_job(job):
+    """Record as the scraper wrote it, undoing normalize_job
+
+    Records without typed fields are returned unchanged.
+    """
+    if not TYPED_FIELDS & job.keys():
+        return job
+    record = {key: value for key, value in job.items() if key not in TYPED_FIELDS}
+    try:
+        retrieved_at = datetime.fromisoformat(record.get("data_retrieved_at"))
+        record["data_retrieved_at"] = retrieved_at.strftime(RETRIEVED_FORMAT)
+    except (TypeError, ValueError):
+        pass
+    if "total_applicants" in record and record["total_applicants"] is None:
+        record["total_applicants"] = "N/A"
+    if isinstance(record.get("application_status"), list):
+        record["application_status"] = [
+            {k: v for k, v in step.items() if k not in TYPED_FIELDS}
+            for step in record["application_status"]
+            if isinstance(step, dict)
+        ]
+    return record
+
+
+def normalize_jobs(jobs):
+    """Normalize a batch of records in one pass
+
+    Salary, date and status texts repeat across a history, each distinct
+    text is parsed once and served from the parser caches afterwards.
+    """
+    return [normalize_job(job) for job in jobs]
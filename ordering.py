@@ -0,0 +1,91 @@
+from typing import Dict, Iterable, Iterator, List
+import json
+import os
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def _with_id(job: Dict, job_id: int) -> Dict:
+    # keep "id" as the first key, like the scraper builds it
+    return {"id": job_id, **{k: v for k, v in job.items() if k != "id"}}
+
+
+def assign_ids(jobs: Iterable[Dict]) -> Iterator[Dict]:
+    """Number records 1..n in the order they are given"""
+    for job_id, job in enumerate(jobs, 1):
+        yield _with_id(job, job_id)
+
+
+def order_jobs(jobs_data: List[Dict], descending: bool = False) -> List[Dict]:
+    """Order scraped records for output and assign their ids
+
+    The scraper always walks the pages forward, newest application first.
+    Descending output (oldest first) is the same records reversed, so it is
+    produced here instead of by navigating the pages backwards.
+    """
+    records = reversed(jobs_data) if descending else jobs_data
+    return list(assign_ids(records))
+
+
+def iter_lines(path: str) -> Iterator[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def iter_lines_reversed(path: str) -> Iterator[str]:
+    """Yield the lines of a text file from last to first, in fixed memory"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            read_size = min(READ_BLOCK_SIZE, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # the first piece may be a partial line, finish it on the next read
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line.decode("utf-8")
+        if remainder.strip():
+            yield remainder.decode("utf-8")
+
+
+def iter_ordered_jsonl(path: str, descending: bool = False) -> Iterator[Dict]:
+    """Streamed counterpart of order_jobs for records spooled to a JSONL file"""
+    lines = iter_lines_reversed(path) if descending else iter_lines(path)
+    return assign_ids(json.loads(line) for line in lines)
+
+
+class SpooledJobs:
+    """Records spooled to a JSONL file, read back in output order on each pass
+
+    Stands in for the list returned by order_jobs once records were moved
+    out of memory, exporters iterate it like a list without loading it.
+    """
+
+    def __init__(self, path: str, count: int, descending: bool = False, transform=None):
+        self.path = path
+        self.count = count
+        self.descending = descending
+        self.transform = transform
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Dict]:
+        records = iter_ordered_jsonl(self.path, self.descending)
+        return map(self.transform, records) if self.transform else records
+
+    def map(self, transform) -> "SpooledJobs":
+        """Same records with transform applied to each one as it is read"""
+        if self.transform:
+            first, then = self.transform, transform
+
+            def transform(job):
+                return then(first(job))
+
+        return SpooledJobs(self.path, self.count, self.descending, transform)
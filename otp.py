@@ -0,0 +1,258 @@
+from email.utils import parsedate_to_datetime
+from email import message_from_bytes, policy
+from datetime import datetime, timedelta, timezone
+from abc import ABC, abstractmethod
+import mailbox
+import logging
+import imaplib
+import time
+import html
+import re
+import os
+
+logger = logging.getLogger(__name__)
+
+OTP_TIMEOUT = 180  # seconds to wait for the verification email
+POLL_INTERVAL = 3.0
+# the mail server clock and ours may disagree a little
+CLOCK_SKEW = 120
+PASSWORD_ENV = "JOBSTREET_OTP_PASSWORD"
+SENDER_MARKERS = ("jobstreet", "seek")
+# six digits that are not part of a longer number or a #rrggbb colour
+CODE_PATTERN = re.compile(r"(?<![\d#])(\d{6})(?!\d)")
+TAG_PATTERN = re.compile(r"<(style|script)\b.*?</\1>|<[^>]+>", re.S | re.I)
+
+
+def _message_text(message):
+    """Plain text of an email, html parts with the tags stripped"""
+    texts = []
+    for part in message.walk():
+        content_type = part.get_content_type()
+        if content_type not in ("text/plain", "text/html"):
+            continue
+        try:
+            text = part.get_content()
+        except (LookupError, UnicodeDecodeError):
+            payload = part.get_payload(decode=True) or b""
+            text = payload.decode("utf-8", errors="replace")
+        if content_type == "text/html":
+            text = html.unescape(TAG_PATTERN.sub(" ", text))
+        texts.append(text)
+    return "\n".join(texts)
+
+
+def _message_time(message):
+    try:
+        sent_at = parsedate_to_datetime(message["Date"])
+    except (TypeError, ValueError):
+        return None
+    if sent_at.tzinfo is None:
+        # a -0000 offset means UTC with the sender's zone unknown
+        sent_at = sent_at.replace(tzinfo=timezone.utc)
+    return sent_at.timestamp()
+
+
+def code_from_message(message, since=None):
+    """The verification code of a JobStreet email, None for other mail"""
+    sender = str(message.get("From", "")).lower()
+    if not any(marker in sender for marker in SENDER_MARKERS):
+        return None
+    sent_at = _message_time(message)
+    if since and sent_at and sent_at < since - CLOCK_SKEW:
+        return None
+    match = CODE_PATTERN.search(
+        f"{message.get('Subject', '')}\n{_message_text(message)}"
+    )
+    return match.group(1) if match else None
+
+
+def _sender_criteria(markers=SENDER_MARKERS):
+    """IMAP search keys for a From header containing any of the markers"""
+    criteria = ["FROM", markers[-1]]
+    for marker in reversed(markers[:-1]):
+        criteria = ["OR", "FROM", marker, *criteria]
+    return criteria
+
+
+class OtpProvider(ABC):
+    """Source of the login verification code
+
+    Mail providers poll until a JobStreet email newer than the login
+    request arrives and never return a code twice, so a rejected code is
+    skipped on the next attempt.
+    """
+
+    interactive = False
+
+    def __init__(self, timeout=OTP_TIMEOUT, interval=POLL_INTERVAL):
+        self.timeout = timeout
+        self.interval = interval
+        self.used = set()
+
+    def get_code(self, since=None):
+        """Wait for a new verification code, None after the timeout"""
+        deadline = time.monotonic() + self.timeout
+        failures = 0
+        while True:
+            try:
+                codes = [code for code in self._codes(since) if code not in self.used]
+            except (OSError, imaplib.IMAP4.error, mailbox.Error) as e:
+                # the mailbox may only appear with the first delivery
+                log = logger.debug if failures else logger.warning
+                log("Failed to read verification emails: %s", e)
+                failures += 1
+                codes = []
+            if codes:
+                # the newest email wins when a code was sent more than once
+                self.used.add(codes[-1])
+                logger.info("Verification code found by %s", type(self).__name__)
+                return codes[-1]
+            if time.monotonic() + self.interval > deadline:
+                logger.warning("No verification email after %ss", self.timeout)
+                return None
+            time.sleep(self.interval)
+
+    @abstractmethod
+    def _codes(self, since):
+        """Codes of matching emails, oldest first"""
+
+    def close(self):
+        pass
+
+
+class ConsoleProvider(OtpProvider):
+    """Ask for the code in the terminal"""
+
+    interactive = True
+
+    def __init__(self, console):
+        super().__init__()
+        self.console = console
+
+    def get_code(self, since=None):
+        # a typed code is passed on even when it was used before
+        return self._codes(since)[0]
+
+    def _codes(self, since):
+        return [
+            self.console.input(
+                "[bold yellow]Enter the OTP sent to your email: [/]"
+            ).strip()
+        ]
+
+
+class ImapProvider(OtpProvider):
+    """Read the code from an IMAP mailbox
+
+    Only JobStreet messages from around the login day are searched, and
+    each one is fetched once, later polls only fetch new UIDs. Without ssl
+    the connection is plain, meant for a local server or bridge.
+    """
+
+    def __init__(
+        self,
+        host,
+        user,
+        password,
+        port=None,
+        ssl=True,
+        folder="INBOX",
+        timeout=OTP_TIMEOUT,
+        interval=POLL_INTERVAL,
+    ):
+        super().__init__(timeout, interval)
+        self.host = host
+        self.port = port or (imaplib.IMAP4_SSL_PORT if ssl else imaplib.IMAP4_PORT)
+        self.ssl = ssl
+        self.user = user
+        self.password = password
+        self.folder = folder
+        self.connection = None
+        # uid -> parsed message, each one fetched once per connection
+        self.messages = {}
+
+    def _connect(self):
+        if self.connection is None:
+            imap_class = imaplib.IMAP4_SSL if self.ssl else imaplib.IMAP4
+            connection = imap_class(self.host, self.port, timeout=30)
+            connection.login(self.user, self.password)
+            self.connection = connection
+        # select again on every poll so new messages become visible
+        self.connection.select(self.folder, readonly=True)
+        return self.connection
+
+    def _codes(self, since):
+        try:
+            connection = self._connect()
+        except (OSError, imaplib.IMAP4.error):
+            self.close()
+            raise
+        # SINCE is a date in the server's time zone, start a day early
+        day = datetime.fromtimestamp(since or time.time()) - timedelta(days=1)
+        status, data = connection.uid(
+            "SEARCH", "SINCE", day.strftime("%d-%b-%Y"), *_sender_criteria()
+        )
+        if status != "OK":
+            return []
+
+        codes = []
+        for uid in data[0].split():
+            if uid not in self.messages:
+                message = self._fetch(connection, uid)
+                if message is None:
+                    continue
+                self.messages[uid] = message
+            code = code_from_message(self.messages[uid], since)
+            if code:
+                codes.append(code)
+        return codes
+
+    @staticmethod
+    def _fetch(connection, uid):
+        status, parts = connection.uid("FETCH", uid, "(BODY.PEEK[])")
+        if status != "OK":
+            return None
+        for part in parts:
+            if isinstance(part, tuple):
+                return message_from_bytes(part[1], policy=policy.default)
+        return None
+
+    def close(self):
+        if self.connection is None:
+            return
+        try:
+            self.connection.logout()
+        except (OSError, imaplib.IMAP4.error):
+            pass
+        self.connection = None
+        self.messages = {}
+
+
+class MailboxProvider(OtpProvider):
+    """Read the code from a local Maildir directory or mbox file"""
+
+    def __init__(self, path, timeout=OTP_TIMEOUT, interval=POLL_INTERVAL):
+        super().__init__(timeout, interval)
+        self.path = os.path.expanduser(path)
+
+    @staticmethod
+    def _read_message(f):
+        return message_from_bytes(f.read(), policy=policy.default)
+
+    def _open(self):
+        factory = self._read_message
+        if os.path.isdir(self.path):
+            return mailbox.Maildir(self.path, factory=factory, create=False)
+        return mailbox.mbox(self.path, factory=factory, create=False)
+
+    def _codes(self, since):
+        found = []
+        box = self._open()
+        try:
+            for message in box:
+                code = code_from_message(message, since)
+                if code:
+                    found.append((_message_time(message) or 0, code))
+        finally:
+            box.close()
+        return [code for _, code in sorted(found, key=lambda item: item[0])]
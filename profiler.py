@@ -0,0 +1,175 @@
+from collections import defaultdict
+from datetime import datetime
+from rich.table import Table
+import cProfile
+import logging
+import json
+import time
+import sys
+import os
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = "profiles"
+# generic wrappers, round trips are attributed to the method that called them
+HELPER_METHODS = {
+    "_find_element",
+    "_click_element",
+    "_locate",
+    "_wait_loaded",
+    "_open_tab",
+    "_phase",
+    "__enter__",
+    "__exit__",
+}
+# code objects without a method name of their own, e.g. a wait condition
+ANONYMOUS_FRAMES = {"<lambda>", "<listcomp>", "<genexpr>", "<dictcomp>", "<setcomp>"}
+
+
+class CommandProfiler:
+    """Count and time every WebDriver command by type and calling method
+
+    Wraps the driver's command executor, so each HTTP round trip to the
+    driver is recorded with its latency and attributed to the innermost
+    JobStreetScraper method on the stack. With `python=True` a cProfile of
+    the Python side is captured as well.
+    """
+
+    def __init__(self, context=None, python=False, source_module="scraper"):
+        self.context = context if context is not None else {}
+        self.source_module = source_module
+        self.calls = defaultdict(lambda: {"count": 0, "total": 0.0, "max": 0.0})
+        self.per_job = defaultdict(int)
+        self.python_profile = cProfile.Profile() if python else None
+
+    def install(self, driver):
+        """Start recording the commands sent by this driver"""
+        executor = driver.command_executor
+        original_execute = executor.execute
+
+        def execute(command, params):
+            start = time.perf_counter()
+            try:
+                return original_execute(command, params)
+            finally:
+                self._record(command, time.perf_counter() - start)
+
+        executor.execute = execute
+        return driver
+
+    def _caller(self):
+        frame = sys._getframe(2)
+        while frame is not None:
+            code = frame.f_code
+            if (
+                frame.f_globals.get("__name__") == self.source_module
+                and code.co_name not in HELPER_METHODS
+                and code.co_name not in ANONYMOUS_FRAMES
+                # a function nested in a method (a sort key) counts as the method
+                and "<locals>" not in code.co_qualname
+            ):
+                return code.co_name
+            frame = frame.f_back
+        return "<other>"
+
+    def _record(self, command, elapsed):
+        stats = self.calls[(self._caller(), command)]
+        stats["count"] += 1
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+        job_id = self.context.get("job_id")
+        if job_id is not None:
+            self.per_job[job_id] += 1
+
+    def start(self):
+        if self.python_profile:
+            self.python_profile.enable()
+
+    def stop(self):
+        if self.python_profile:
+            self.python_profile.disable()
+
+    def ranked(self):
+        """Per caller and command stats, slowest total first"""
+        rows = [
+            {
+                "caller": caller,
+                "command": command,
+                "count": stats["count"],
+                "total_s": round(stats["total"], 4),
+                "avg_ms": round(stats["total"] / stats["count"] * 1000, 2),
+                "max_ms": round(stats["max"] * 1000, 2),
+            }
+            for (caller, command), stats in self.calls.items()
+        ]
+        return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+    def summary(self):
+        by_caller = defaultdict(lambda: {"count": 0, "total_s": 0.0})
+        for row in self.ranked():
+            by_caller[row["caller"]]["count"] += row["count"]
+            by_caller[row["caller"]]["total_s"] += row["total_s"]
+
+        job_counts = list(self.per_job.values())
+        return {
+            "total_commands": sum(row["count"] for row in self.ranked()),
+            "jobs": len(job_counts),
+            "avg_commands_per_job": (
+                round(sum(job_counts) / len(job_counts), 1) if job_counts else 0
+            ),
+            "max_commands_per_job": max(job_counts, default=0),
+            "by_caller": dict(
+                sorted(
+                    by_caller.items(), key=lambda item: item[1]["count"], reverse=True
+                )
+            ),
+        }
+
+    def render(self, limit=25):
+        """Rich table of the most expensive caller/command pairs"""
+        summary = self.summary()
+        table = Table(
+            title="WebDriver round trips",
+            caption=(
+                f"{summary['total_commands']} commands, "
+                f"{summary['avg_commands_per_job']} per job on average, "
+                f"max {summary['max_commands_per_job']}"
+            ),
+        )
+        table.add_column("Caller", style="cyan", no_wrap=True)
+        table.add_column("Command", style="magenta")
+        table.add_column("Calls", justify="right")
+        table.add_column("Total (s)", justify="right")
+        table.add_column("Avg (ms)", justify="right")
+        table.add_column("Max (ms)", justify="right")
+        for row in self.ranked()[:limit]:
+            table.add_row(
+                row["caller"],
+                row["command"],
+                str(row["count"]),
+                f"{row['total_s']:.2f}",
+                f"{row['avg_ms']:.1f}",
+                f"{row['max_ms']:.1f}",
+            )
+        return table
+
+    def save(self, output_dir=PROFILE_DIR):
+        """Write the JSON report, and the cProfile stats when captured"""
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = os.path.join(output_dir, f"webdriver_profile_{timestamp}.json")
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"summary": self.summary(), "commands": self.ranked()},
+                f,
+                indent=2,
+            )
+        paths = [report_path]
+
+        if self.python_profile:
+            prof_path = os.path.join(output_dir, f"python_profile_{timestamp}.prof")
+            self.python_profile.dump_stats(prof_path)
+            paths.append(prof_path)
+
+        logger.info("Saved profile to %s", ", ".join(paths))
+        return paths
@@ -0,0 +1,157 @@
+from pathlib import Path
+import tempfile
+import logging
+import atexit
+import shutil
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PREFIX = "jobstreet_profile_"
+OWNER_FILE = ".owner"
+RAM_DIRS = ("/dev/shm",)
+TEMPLATE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "jobstreet_scraper", "profile_templates"
+)
+# profile entries never copied into a template: login state, caches and locks
+TEMPLATE_EXCLUDES = {
+    "firefox": (
+        "cookies.sqlite*",
+        "sessionstore*",
+        "storage",
+        "cache2",
+        "startupCache",
+        "lock",
+        ".parentlock",
+        "parent.lock",
+    ),
+    "chrome": (
+        "Cookies*",
+        "Local Storage",
+        "Session Storage",
+        "Sessions",
+        "Cache",
+        "Code Cache",
+        "GPUCache",
+        "Singleton*",
+        "lockfile",
+    ),
+}
+# leftovers without a live owner are removed after this many seconds on
+# platforms where the owner pid cannot be checked
+STALE_AFTER = 24 * 60 * 60
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        # os.kill(pid, 0) would terminate the process on Windows
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ProfileManager:
+    """Create, seed and clean up browser profile directories
+
+    Profiles live on a RAM backed directory (/dev/shm) when available, so
+    cache and profile writes never touch the disk. Each profile is tracked
+    per instance and tagged with the owning pid: profiles are removed on
+    release, at exit, and, when a previous run crashed, by the next run.
+    """
+
+    def __init__(self, base_dir=None, template_dir=TEMPLATE_DIR):
+        self.base_dir = Path(base_dir or self._default_base_dir())
+        self.template_dir = Path(template_dir) if template_dir else None
+        self.profiles = {}
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.sweep_stale()
+        atexit.register(self.cleanup)
+
+    @staticmethod
+    def _default_base_dir():
+        for ram_dir in RAM_DIRS:
+            if os.path.isdir(ram_dir) and os.access(ram_dir, os.W_OK):
+                return os.path.join(ram_dir, "jobstreet_scraper")
+        return os.path.join(tempfile.gettempdir(), "jobstreet_scraper")
+
+    def _template_path(self, browser):
+        return self.template_dir / browser if self.template_dir else None
+
+    def create(self, browser):
+        """Create a fresh profile directory, seeded from the template if any"""
+        path = Path(
+            tempfile.mkdtemp(prefix=f"{PROFILE_PREFIX}{browser}_", dir=self.base_dir)
+        )
+        template = self._template_path(browser)
+        if template and template.is_dir():
+            shutil.copytree(template, path, dirs_exist_ok=True)
+            logger.info("Seeded %s profile from template %s", browser, template)
+        (path / OWNER_FILE).write_text(str(os.getpid()))
+
+        self.profiles[str(path)] = browser
+        logger.info("Using %s profile dir: %s", browser, path)
+        return str(path)
+
+    def save_template(self, profile_path, overwrite=False):
+        """Keep a copy of a used profile, without login state, for next runs"""
+        browser = self.profiles.get(profile_path)
+        template = self._template_path(browser) if browser else None
+        if not template or (template.exists() and not overwrite):
+            return None
+        try:
+            tmp_template = template.with_name(f"{template.name}.tmp")
+            shutil.rmtree(tmp_template, ignore_errors=True)
+            shutil.copytree(
+                profile_path,
+                tmp_template,
+                ignore=shutil.ignore_patterns(OWNER_FILE, *TEMPLATE_EXCLUDES[browser]),
+            )
+            shutil.rmtree(template, ignore_errors=True)
+            tmp_template.rename(template)
+            logger.info("Saved %s profile template to %s", browser, template)
+            return str(template)
+        except OSError as e:
+            logger.warning("Failed to save %s profile template: %s", browser, e)
+            return None
+
+    def release(self, profile_path):
+        """Delete a profile created by this manager"""
+        if not profile_path:
+            return
+        self.profiles.pop(profile_path, None)
+        try:
+            shutil.rmtree(profile_path)
+            logger.info("Cleaned up profile directory: %s", profile_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Failed to clean profile directory %s: %s", profile_path, e)
+
+    def cleanup(self):
+        for profile_path in list(self.profiles):
+            self.release(profile_path)
+
+    def sweep_stale(self):
+        """Remove profiles left behind by runs that did not clean up"""
+        for path in self.base_dir.glob(f"{PROFILE_PREFIX}*"):
+            owner_file = path / OWNER_FILE
+            try:
+                owner = int(owner_file.read_text())
+                alive = _pid_alive(owner) if owner != os.getpid() else True
+            except (OSError, ValueError):
+                owner, alive = None, None
+
+            if alive is None:
+                stale = time.time() - path.stat().st_mtime > STALE_AFTER
+            else:
+                stale = not alive
+
+            if stale:
+                shutil.rmtree(path, ignore_errors=True)
+                logger.info("Removed stale profile directory: %s", path)
@@ -0,0 +1,216 @@
+from rich.progress import (
+    Progress,
+    SpinnerColumn,
+    BarColumn,
+    MofNCompleteColumn,
+    TextColumn,
+    TimeElapsedColumn,
+    TimeRemainingColumn,
+)
+from contextlib import contextmanager
+from collections import defaultdict
+from rich.console import Console, Group
+from rich.table import Table
+from rich.text import Text
+from rich.live import Live
+import threading
+import time
+
+
+class PhaseStats:
+    """Running latency and error counters for each scraping phase
+
+    The scraping thread writes them while the Live thread renders them,
+    new phases add dict keys, so both sides hold the lock.
+    """
+
+    def __init__(self):
+        self.count = defaultdict(int)
+        self.total = defaultdict(float)
+        self.slowest = defaultdict(float)
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def record(self, phase, elapsed):
+        with self.lock:
+            self.count[phase] += 1
+            self.total[phase] += elapsed
+            self.slowest[phase] = max(self.slowest[phase], elapsed)
+
+    def error(self, phase):
+        with self.lock:
+            self.errors[phase] += 1
+
+    def total_errors(self):
+        with self.lock:
+            return sum(self.errors.values())
+
+    def average(self, phase):
+        count = self.count.get(phase, 0)
+        return self.total.get(phase, 0.0) / count if count else 0.0
+
+    def phases(self):
+        return list(dict.fromkeys([*self.count, *self.errors]))
+
+    def snapshot(self):
+        """(phase, calls, average, slowest, errors) rows, copied under the lock"""
+        with self.lock:
+            return [
+                (
+                    phase,
+                    self.count.get(phase, 0),
+                    self.average(phase),
+                    self.slowest.get(phase, 0.0),
+                    self.errors.get(phase, 0),
+                )
+                for phase in self.phases()
+            ]
+
+
+class ScrapeProgress:
+    """Single live dashboard for a scraping run
+
+    One console and one rich Live display are shared by the whole run. The
+    hot loop only bumps counters, the display is redrawn at most
+    `refresh_per_second` times. When stdout is not a terminal the live view
+    is replaced by a compact log line every `compact_every` jobs.
+    """
+
+    def __init__(self, console=None, refresh_per_second=4, compact_every=10):
+        self.console = console or Console()
+        self.refresh_per_second = refresh_per_second
+        self.compact_every = compact_every
+        self.interactive = self.console.is_terminal
+        self.stats = PhaseStats()
+        self.pages_done = 0
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.recoveries = 0
+        self.started_at = None
+        self._live = None
+        self._progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[bold cyan]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TextColumn("[magenta]{task.fields[rate]}"),
+            TimeElapsedColumn(),
+            TimeRemainingColumn(),
+            console=self.console,
+        )
+        self._page_task = self._progress.add_task(
+            "Waiting for login", total=None, rate=""
+        )
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self.started_at = time.time()
+        if self.interactive and self._live is None:
+            self._live = Live(
+                Group(self._progress, self),
+                console=self.console,
+                refresh_per_second=self.refresh_per_second,
+                transient=False,
+            )
+            self._live.start()
+
+    def stop(self):
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+        elif self.started_at is not None:
+            self._compact_line()
+
+    @property
+    def jobs_per_second(self):
+        elapsed = time.time() - self.started_at if self.started_at else 0
+        return self.jobs_done / elapsed if elapsed > 0 else 0.0
+
+    def log(self, message):
+        """Print a message above the live view, or as a plain line"""
+        self.console.print(message)
+
+    def start_page(self, page_num, total_cards):
+        self._progress.reset(
+            self._page_task,
+            description=f"Page {page_num}",
+            total=total_cards,
+            rate=self._rate_text(),
+        )
+        if not self.interactive:
+            self.console.print(f"Page {page_num}: {total_cards} job cards")
+
+    def end_page(self, page_num):
+        self.pages_done += 1
+        if not self.interactive:
+            self._compact_line(f"Completed page {page_num}")
+
+    def job_done(self):
+        self.jobs_done += 1
+        self._progress.update(self._page_task, advance=1, rate=self._rate_text())
+        if not self.interactive and self.jobs_done % self.compact_every == 0:
+            self._compact_line()
+
+    def job_failed(self, phase):
+        self.jobs_failed += 1
+        self.error(phase)
+        self._progress.update(self._page_task, advance=1)
+
+    def error(self, phase):
+        self.stats.error(phase)
+
+    def recovered(self):
+        """Count a page state that had to be repaired after a job"""
+        self.recoveries += 1
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block and record it under the phase name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stats.record(name, time.perf_counter() - start)
+
+    def _rate_text(self):
+        return f"{self.jobs_per_second:.2f} jobs/s"
+
+    def _compact_line(self, prefix="Progress"):
+        errors = self.stats.total_errors()
+        self.console.print(
+            f"{prefix}: pages {self.pages_done}, jobs {self.jobs_done}, "
+            f"failed {self.jobs_failed}, errors {errors}, "
+            f"recoveries {self.recoveries}, {self._rate_text()}",
+            highlight=False,
+        )
+
+    def __rich__(self):
+        # rendered by Live on each refresh from its own thread, so the
+        # counters are read from a snapshot
+        table = Table(box=None, pad_edge=False, header_style="bold")
+        table.add_column("Phase")
+        table.add_column("Calls", justify="right")
+        table.add_column("Avg (s)", justify="right")
+        table.add_column("Max (s)", justify="right")
+        table.add_column("Errors", justify="right")
+        for phase, count, average, slowest, errors in self.stats.snapshot():
+            table.add_row(
+                phase,
+                str(count),
+                f"{average:.2f}",
+                f"{slowest:.2f}",
+                str(errors or ""),
+            )
+        summary = Text(
+            f"pages {self.pages_done} | jobs {self.jobs_done} | "
+            f"failed {self.jobs_failed} | recoveries {self.recoveries} | "
+            f"{self._rate_text()}",
+            style="dim",
+        )
+        return Group(table, summary)
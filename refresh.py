@@ -0,0 +1,204 @@
+from normalizer import denormalize_job, parse_date, reference_day
+from fields import FIELD_PHASES, TYPED_FIELDS, record_keys
+from collections import Counter, defaultdict
+from exporter import EXPORT_DIR, load_jobs
+from helpers import latest_update
+from datetime import date
+import logging
+import zlib
+import json
+import os
+
+logger = logging.getLogger(__name__)
+
+STATE_PATH = os.path.join(EXPORT_DIR, "refresh_state.json")
+COLD_EVERY = 10
+# tier -> (most days since the last status change, scraped every N runs)
+TIERS = {
+    "hot": (14, 1),
+    "warm": (60, 3),
+    "cold": (None, COLD_EVERY),
+}
+# an application this young stays hot, employers look at new ones first
+HOT_APPLIED_DAYS = 30
+# columns a full scrape writes, typed and flattened ones are derived later
+SCRAPED_FIELDS = record_keys(
+    [field for field in FIELD_PHASES if field not in TYPED_FIELDS]
+)
+
+
+def latest_export(directory=EXPORT_DIR):
+    """Newest json or jsonl scrape export, None when there is none"""
+    try:
+        names = [
+            name
+            for name in os.listdir(directory)
+            if name.startswith("jobstreet_jobs_") and name.endswith((".json", ".jsonl"))
+        ]
+    except FileNotFoundError:
+        return None
+    paths = [os.path.join(directory, name) for name in names]
+    return max(paths, key=os.path.getmtime, default=None)
+
+
+def tier_of(record, today=None):
+    """Refresh tier of a previous record by expiry, age and last status change"""
+    if record.get("is_expired") is True:
+        return "cold"
+    steps = [step for step in record.get("application_status") or [] if step]
+    updated = latest_update(record)
+    if not steps or updated is None:
+        # nothing to judge by, scrape it
+        return "hot"
+
+    today = today or date.today()
+    # relative texts ("Kemarin") count from the day the record was scraped
+    applied = parse_date(steps[0].get("updated_at"), reference_day(record))
+    if applied and (today - date.fromisoformat(applied)).days <= HOT_APPLIED_DAYS:
+        return "hot"
+    idle = (today - updated).days
+    for tier, (max_days, _) in TIERS.items():
+        if max_days is None or idle <= max_days:
+            return tier
+    return "cold"
+
+
+def _fingerprint(text):
+    return zlib.crc32(" ".join(text.split()).lower().encode("utf-8"))
+
+
+def _scraped_record(record):
+    """A previous record as the scraper builds it, without id and --typed columns"""
+    record = {
+        key: value
+        for key, value in record.items()
+        if key != "id" and key not in TYPED_FIELDS
+    }
+    if isinstance(record.get("application_status"), list):
+        record["application_status"] = [
+            {"status": step.get("status"), "updated_at": step.get("updated_at")}
+            for step in record["application_status"]
+            if isinstance(step, dict)
+        ]
+    return record
+
+
+class RefreshPolicy:
+    """Decide per job card whether to scrape it or reuse the previous record
+
+    Previous records are matched to cards by job title and company. A card
+    whose text changed since the last run, an unknown card, or one whose
+    tier is due this run is scraped. Everything else is served from the
+    previous output, so a run costs what the account's recent activity
+    costs. Hot records are due every run, warm and cold ones every few runs
+    at staggered offsets, so the cold work is spread over the runs.
+    """
+
+    def __init__(
+        self,
+        previous,
+        state_path=STATE_PATH,
+        cold_every=COLD_EVERY,
+        full=False,
+        fields=None,
+        today=None,
+    ):
+        self.state_path = state_path
+        self.full = full
+        self.today = today or date.today()
+        self.every = {tier: every for tier, (_, every) in TIERS.items()}
+        self.every["cold"] = cold_every
+        # a reused record must have every column this run asks for
+        self.required = record_keys(fields) if fields else SCRAPED_FIELDS
+
+        state = self._load_state()
+        self.run = state.get("run", 0) + 1
+        self.previous_cards = set(state.get("cards", []))
+        self.seen_cards = set()
+        self.index = defaultdict(list)
+        # a --typed export is turned back into what the scraper wrote, its
+        # ISO data_retrieved_at would date relative statuses from today
+        for record in map(denormalize_job, previous):
+            title = str(record.get("job_title", "N/A")).strip().lower()
+            self.index[title].append(record)
+        self.counts = Counter()
+
+    @classmethod
+    def from_export(cls, path, **kwargs):
+        """Policy over a previous export, "latest" picks the newest in exports/"""
+        if path == "latest":
+            path = latest_export()
+            if path is None:
+                logger.warning("No previous export found, scraping every card")
+                return cls([], **kwargs)
+        previous = load_jobs(path)
+        logger.info("Loaded %s previous records from %s", len(previous), path)
+        return cls(previous, **kwargs)
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring refresh state %s: %s", self.state_path, e)
+            return {}
+
+    def _match(self, title, card_text):
+        candidates = self.index.get(title.strip().lower())
+        if not candidates:
+            return None
+        text = card_text.lower()
+        for i, record in enumerate(candidates):
+            company = str(record.get("company_name", "")).strip().lower()
+            if company and company in text:
+                # the same job applied to twice matches its records in order
+                return candidates.pop(i)
+        return None
+
+    def lookup(self, title, card_text):
+        """The previous record to reuse for a card, None when it must be scraped"""
+        fingerprint = _fingerprint(card_text)
+        self.seen_cards.add(fingerprint)
+        record = self._match(title, card_text)
+        if record is None:
+            self.counts["new"] += 1
+            return None
+        if self.full:
+            self.counts["forced"] += 1
+            return None
+        # without a state the previous output is trusted as it is
+        if self.previous_cards and fingerprint not in self.previous_cards:
+            self.counts["changed"] += 1
+            return None
+        if any(key not in record for key in self.required):
+            self.counts["incomplete"] += 1
+            return None
+
+        tier = tier_of(record, self.today)
+        if (self.run + fingerprint) % self.every[tier] == 0:
+            self.counts[f"{tier} due"] += 1
+            return None
+        self.counts[f"{tier} reused"] += 1
+        return _scraped_record(record)
+
+    def summary(self):
+        reused = sum(n for key, n in self.counts.items() if key.endswith("reused"))
+        return {
+            "run": self.run,
+            "reused": reused,
+            "scraped": sum(self.counts.values()) - reused,
+            **dict(self.counts),
+        }
+
+    def save(self, complete=True):
+        """Store the run number and the cards seen, for the next run
+
+        A run cut short (--limit, --since, an error) keeps the cards of the
+        previous run it did not get to.
+        """
+        cards = self.seen_cards if complete else self.seen_cards | self.previous_cards
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump({"run": self.run, "cards": sorted(cards)}, f)
@@ -11,39 +11,116 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.keys import Keys
 from configs import init_driver, configurations
 from selenium.webdriver.common.by import By
-from datetime import datetime, timedelta
-from rich.console import Console
-from rich.status import Status
+from helpers import clean_text, parse_posted_date, take_recent
+from locators import count_mismatch, get_labels, get_locators
+from progress import ScrapeProgress
+from fields import PHASE_DEFAULTS, required_phases
+from driver_watchdog import DriverWedged, Watchdog, kill_driver
+from throttle import AdaptiveThrottle, is_challenge_page
+from profiles import ProfileManager
+from ordering import order_jobs
+from otp import ConsoleProvider
+from contextlib import contextmanager
+from collections import Counter
+import jobstate
 import logging
 import time
 import re
 
+# cards per results page, a full page without recent updates ends --since
+PAGE_SIZE = 20
+# codes tried from a mailbox before giving up, the console asks forever
+MAX_OTP_ATTEMPTS = 3
+JOB_CARDS_PRESENT = EC.presence_of_element_located(
+    (By.CSS_SELECTOR, "[data-automation^='job-item-1']")
+)
+
 
 class JobStreetScraper:
-    def __init__(self, email, browser="chrome", headless=False):
+    def __init__(
+        self,
+        email,
+        browser="chrome",
+        headless=False,
+        archive=None,
+        profiler=None,
+        fields=None,
+        profiles=None,
+        throttle=None,
+        otp=None,
+        memprofiler=None,
+        spool=None,
+        refresh=None,
+    ):
         self.email = email
         self.driver = None
         self.browser = browser
+        self.archive = archive
+        self.profiler = profiler
+        # extraction phases to run, unrequested fields are never scraped
+        self.phases = required_phases(fields)
+        self.profiles = profiles or ProfileManager()
+        # every page navigation and detail fetch waits for a token here
+        self.throttle = throttle or AdaptiveThrottle()
+        # kills a hung browser, throttle waits do not count as hanging
+        self.watchdog = Watchdog(
+            kill=lambda: kill_driver(self.driver),
+            excused=lambda: self.throttle.waited,
+        )
+        self.restarts = 0
+        # what a job left open on the results page: idle, drawer or detail
+        self.job_state = "idle"
+        self.recoveries = Counter()
+        # page boundary memory snapshots and the cap that moves records to disk
+        self.memprofiler = memprofiler
+        self.spool = spool
+        self.collected = 0
+        # serves unchanged cold records from the previous output
+        self.refresh = refresh
+        # where to resume after a restart, refreshed on every page
+        self.page_url = None
+        self.session_cookies = []
         self.profile_path = None
+        # the profile template is only seeded by a run that finished
+        self.succeeded = False
         self.headless = headless
+        self.progress = ScrapeProgress()
+        self.console = self.progress.console
+        # where the login verification code comes from, the terminal by default
+        self.otp = otp or ConsoleProvider(self.console)
+        self.otp_requested_at = None
+        # job_id, page and phase are attached to every record this logger emits
+        self.log_context = {"job_id": None, "page": None, "phase": None}
+        self.logger = logging.LoggerAdapter(
+            logging.getLogger(self.__class__.__name__), self.log_context
+        )
         self._initialize_driver()
         self.base_url = configurations["base_url"]
+        # selectors and drawer labels of the configured SEEK site
+        self.locators = get_locators(configurations["site"])
+        self.labels = get_labels(configurations["site"])
+        self.locator_mismatches = Counter()
+        # detail pages read from the elements because the page state was missing
+        self.state_misses = 0
         self.LONG_WAIT = configurations["default_wait"]
         self.SHORT_WAIT = configurations["short_wait"]
-        self.logger = logging.getLogger(self.__class__.__name__)
         self.jobs_data = []
 
     def _initialize_driver(self):
-        console = Console()
         try:
-            self.driver = init_driver(self.browser, headless=self.headless)
-            console.print(
+            self.profile_path = self.profiles.create(self.browser)
+            self.driver = init_driver(
+                self.browser, headless=self.headless, profile_dir=self.profile_path
+            )
+            if self.profiler:
+                self.profiler.install(self.driver)
+            self.console.print(
                 f"[bold green]WebDriver {self.driver.name} initialized successfully![/]"
             )
-            if self.browser == "firefox" and hasattr(self.driver, "firefox_profile"):
-                self.profile_path = getattr(self.driver.firefox_profile, "path", None)
         except (Exception, WebDriverException) as e:
-            self.logger.error(f"Failed to initialize WebDriver: {e}")
+            self.logger.error("Failed to initialize WebDriver: %s", e)
+            self.profiles.release(self.profile_path)
+            self.profile_path = None
             raise
 
     def _click_element(self, element):
@@ -66,10 +143,10 @@ class JobStreetScraper:
                 # time.sleep(0.5)  # wait for any potential animations
                 return True
             except Exception as e:
-                self.logger.error(f"Oh no JavaScript click also failed: {e}")
+                self.logger.error("Oh no JavaScript click also failed: %s", e)
                 return False
         except (StaleElementReferenceException, WebDriverException) as e:
-            self.logger.error(f"Error clicking element: {e}")
+            self.logger.error("Error clicking element: %s", e)
             return False
 
     def _find_element(self, by, value, timeout=None):
@@ -80,38 +157,39 @@ class JobStreetScraper:
                 EC.presence_of_element_located((by, value))
             )
         except TimeoutException:
-            self.logger.warning(f"Element not found: {value}")
+            self.logger.warning("Element not found: %s", value)
             return None
 
-    def _clean_text(self, text):
-        if not text or text == "N/A":
-            return text
+    def _locate(self, name, scope=None, timeout=None):
+        """Elements matched by a registry locator, waiting for the first one"""
+        locator = self.locators[name]
+        scope = scope if scope is not None else self.driver
+        timeout = self.SHORT_WAIT if timeout is None else timeout
+        try:
+            elements = WebDriverWait(scope, timeout).until(
+                lambda s: s.find_elements(locator.by, locator.value)
+            )
+        except TimeoutException:
+            elements = []
+
+        mismatch = count_mismatch(locator, len(elements))
+        if mismatch:
+            self.locator_mismatches[name] += 1
+            # a changed page layout shows up once per selector, not per card
+            log = self.logger.warning
+            if self.locator_mismatches[name] > 1:
+                log = self.logger.debug
+            log("Selector %s (%s): %s", name, locator.value, mismatch)
+        return elements
 
-        # remove invisible characters (zero-width space, word joiner, etc.)
-        cleaned = re.sub(r"[\u2060\u200B-\u200F\uFEFF]", "", text)
-        # Replace em dash and en dash with regular hyphen
-        cleaned = cleaned.replace("–", "-").replace("—", "-")
-        return cleaned
+    def _clean_text(self, text):
+        return clean_text(text)
 
     def _parse_posted_date(self, date_text: str):
-        if not date_text or date_text == "N/A" or "Posted" not in date_text:
-            return "N/A"
         try:
-            rm_posted = date_text.replace("Posted", "").strip()
-
-            if "30+" in rm_posted:
-                return "30+ days ago"
-
-            get_num = re.search(r"\d+", rm_posted)
-            if not get_num:
-                return "N/A"
-
-            days_ago = int(get_num[0])
-            posted_date = datetime.now() - timedelta(days=days_ago)
-            return posted_date.strftime("%d-%m-%Y")
-
+            return parse_posted_date(date_text)
         except ValueError:
-            self.logger.error(f"Error parsing date text: {date_text}")
+            self.logger.error("Error parsing date text: %s", date_text)
             return "N/A"
 
     def _login_and_navigate(self):
@@ -119,7 +197,7 @@ class JobStreetScraper:
         try:
             self.driver.get(self.base_url)
         except WebDriverException as e:
-            self.logger.error(f"Error navigating to {self.base_url}: {e}")
+            self.logger.error("Error navigating to %s: %s", self.base_url, e)
             return False
 
         try:
@@ -129,10 +207,12 @@ class JobStreetScraper:
             email_input.clear()
             email_input.send_keys(self.email)
             time.sleep(0.3)
+            # verification emails sent before this are from older logins
+            self.otp_requested_at = time.time()
             email_input.send_keys(Keys.ENTER)
 
         except (TimeoutException, WebDriverException) as e:
-            self.logger.error(f"Error during email input : {e}")
+            self.logger.error("Error during email input : %s", e)
 
             if "applied-jobs" in self.driver.current_url.lower():
                 self.logger.info("Already logged in, skipping OTP")
@@ -141,10 +221,15 @@ class JobStreetScraper:
 
         return self._handle_otp()
 
+    def login(self):
+        """Log in and land on the applied jobs page"""
+        return self._login_and_navigate()
+
     def _handle_otp(self):
         """Handle OTP input if required"""
         wait = WebDriverWait(self.driver, self.LONG_WAIT)
-        console = Console()
+        console = self.console
+        attempts = 0
 
         while True:
             if "applied-jobs" in self.driver.current_url.lower():
@@ -160,11 +245,19 @@ class JobStreetScraper:
                     self.logger.warning("Timeout while waiting for job cards to load")
                     return False
 
+            if not self.otp.interactive and attempts >= MAX_OTP_ATTEMPTS:
+                self.logger.error("Giving up after %s rejected OTP codes", attempts)
+                return False
+            attempts += 1
+
             try:
                 self.logger.info("Please enter the OTP sent to your email")
-                otp = console.input(
-                    "[bold yellow]Enter the OTP sent to your email: [/]"
-                ).strip()
+                if not self.otp.interactive:
+                    console.print("[bold yellow]Waiting for the OTP email...[/]")
+                otp = self.otp.get_code(since=self.otp_requested_at)
+                if otp is None:
+                    self.logger.error("No OTP received, cannot log in")
+                    return False
 
                 if len(otp) != 6 or not otp.isdigit():
                     self.logger.warning(
@@ -183,64 +276,52 @@ class JobStreetScraper:
 
                 otp_field.click()
                 otp_field.clear()
+                # one command for the whole code, the field splits the digits
+                otp_field.send_keys(otp)
 
-                for digit in otp:
-                    otp_field.send_keys(digit)
-                    time.sleep(0.3)
-
-                time.sleep(2)
-
-                # check otp error message
-                try:
-                    error_alert = self.driver.find_element(
-                        By.CSS_SELECTOR, "[aria-live='polite']"
-                    )
-                    if "invalid code" in error_alert.text.strip().lower():
-                        self.logger.warning("Invalid OTP, try again...")
-                        console.print("[bold red]Invalid OTP, please try again.[/]")
-                        continue  # retry otp
-                except NoSuchElementException:
-                    pass
-
-                # wait for the page to load after OTP
+                # wait for either the job cards or the otp error message
                 try:
                     wait.until(
                         lambda d: d.find_elements(
                             By.CSS_SELECTOR, "[data-automation^='job-item-']"
                         )
+                        or self._otp_rejected()
                     )
-
-                    self.logger.info("Successfully logged into applied jobs page")
-                    return True
-
                 except TimeoutException:
                     self.logger.warning(
                         "Timeout while waiting for job cards to load after OTP"
                     )
                     return False
 
+                if self._otp_rejected():
+                    self.logger.warning("Invalid OTP, try again...")
+                    console.print("[bold red]Invalid OTP, please try again.[/]")
+                    continue  # retry otp
+
+                self.logger.info("Successfully logged into applied jobs page")
+                return True
+
             except (TimeoutException, WebDriverException) as e:
-                self.logger.error(f"Exception during OTP input or field loading: {e}")
+                self.logger.error("Exception during OTP input or field loading: %s", e)
                 return False
 
-    def _find_job_cards(self):
-        """Find job cards on the current page"""
+    def _otp_rejected(self):
         try:
-            elements = WebDriverWait(self.driver, self.LONG_WAIT).until(
-                lambda d: (
-                    d.find_elements(By.CSS_SELECTOR, "[data-automation^='job-item-']")
-                )
+            error_alert = self.driver.find_element(
+                By.CSS_SELECTOR, "[aria-live='polite']"
             )
-            if elements:
-                self.logger.info(f"Found {len(elements)} job cards")
-                return self._sort_job_cards(elements)
-            else:
-                self.logger.warning("No job cards found on this page")
-                return []
+        except NoSuchElementException:
+            return False
+        return "invalid code" in error_alert.text.strip().lower()
 
-        except TimeoutException:
-            self.logger.warning("No job cards found on this page")
-            return []
+    def _find_job_cards(self):
+        """Find job cards on the current page"""
+        elements = self._locate("job_cards", timeout=self.LONG_WAIT)
+        if elements:
+            self.logger.info("Found %s job cards", len(elements))
+            return self._sort_job_cards(elements)
+        self.logger.warning("No job cards found on this page")
+        return []
 
     def _sort_job_cards(self, elements):
         """Sort job cards by their index number"""
@@ -250,7 +331,7 @@ class JobStreetScraper:
                 attr = element.get_attribute("data-automation")
                 return int(attr.split("-")[-1])
             except (ValueError, AttributeError, StaleElementReferenceException) as e:
-                self.logger.error(f"Error getting index from element: {e}")
+                self.logger.error("Error getting index from element: %s", e)
             return 0
 
         return sorted(elements, key=get_index)
@@ -258,24 +339,21 @@ class JobStreetScraper:
     def _open_drawer(self, job_card):
         """Open drawer for each job card by clicking the header"""
         try:
-            header_card = job_card.find_element(
-                By.CSS_SELECTOR, "h4 span[role='button']"
-            )
+            header = self.locators["card_header"]
+            header_card = job_card.find_element(header.by, header.value)
 
             if not self._click_element(header_card):
                 self.logger.error("Failed to click job card header")
                 return False
 
-            drawer = WebDriverWait(self.driver, self.SHORT_WAIT).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[role='dialog']"))
-            )
-            if drawer:
-                return drawer
+            drawers = self._locate("drawer")
+            if drawers:
+                return drawers[0]
             else:
                 self.logger.warning("Job card drawer not found after clicking header")
                 return None
 
-        except TimeoutException:
+        except (NoSuchElementException, TimeoutException):
             self.logger.error("Timeout while waiting for job card header or drawer")
             return None
 
@@ -290,12 +368,10 @@ class JobStreetScraper:
         }
 
         try:
-            info_holder = WebDriverWait(drawer, self.LONG_WAIT).until(
-                EC.presence_of_element_located(
-                    (By.XPATH, ".//span[contains(text(), 'Lamaran untuk')]")
-                )
-            )
-            siblings = info_holder.find_elements(By.XPATH, "./following-sibling::*")
+            info_holders = self._locate("applied_for", drawer, self.LONG_WAIT)
+            if not info_holders:
+                raise NoSuchElementException("applied for label not found")
+            siblings = info_holders[0].find_elements(By.XPATH, "./following-sibling::*")
 
             if len(siblings) >= 3:
                 info_title = siblings[0]  # h3
@@ -323,8 +399,9 @@ class JobStreetScraper:
                 else:
                     # Has salary text
                     salary_text = fourth_element.text.strip()
-                    if "per month" in salary_text.lower():
-                        salary_raw = salary_text.split("per month")[0].strip()
+                    per_month = self.labels["per_month"]
+                    if per_month in salary_text.lower():
+                        salary_raw = salary_text.split(per_month)[0].strip()
                         cleaned_salary = self._clean_text(salary_raw)
                         results["job_salary"] = cleaned_salary
 
@@ -336,7 +413,7 @@ class JobStreetScraper:
                         )
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.logger.error(f"Error extracting job info from drawer: {e}")
+            self.logger.error("Error extracting job info from drawer: %s", e)
         return results
 
     def _extract_status_from_drawer(self, drawer):
@@ -345,12 +422,10 @@ class JobStreetScraper:
         is_expired = False
 
         try:
-            status_holder = WebDriverWait(drawer, self.LONG_WAIT).until(
-                EC.presence_of_element_located(
-                    (By.XPATH, ".//span[contains(text(), 'Status lamaran')]")
-                )
-            )
-            wrapper = status_holder.find_element(
+            status_holders = self._locate("application_status", drawer, self.LONG_WAIT)
+            if not status_holders:
+                raise NoSuchElementException("application status label not found")
+            wrapper = status_holders[0].find_element(
                 By.XPATH, "./following-sibling::div[1]"
             )
             status_blocks = wrapper.find_elements(By.XPATH, "./div/div")
@@ -376,18 +451,11 @@ class JobStreetScraper:
                     pass
             if not application_status:
                 self.logger.warning("No valid status data found in any blocks")
-            try:
-                wrapper.find_element(
-                    By.XPATH,
-                    ".//following-sibling::div//span[contains(text(), 'Lowongan kerja ini telah kedaluwarsa')]",
-                )
-                is_expired = True
-
-            except NoSuchElementException:
-                is_expired = False
+            # the notice is rendered with the drawer, no need to wait for it
+            is_expired = bool(self._locate("expired_notice", drawer, timeout=0))
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.logger.error(f"Error extracting application status from drawer: {e}")
+            self.logger.error("Error extracting application status from drawer: %s", e)
 
         return {
             "application_status": application_status,
@@ -401,45 +469,27 @@ class JobStreetScraper:
             "cover_letter": "N/A",
         }
 
-        try:
-            cv_element = WebDriverWait(drawer, self.SHORT_WAIT).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "span[data-automation='job-item-resume']")
-                )
-            )
-            cv_text = self._clean_text(cv_element.text.strip())
-        except (TimeoutException, WebDriverException):
-            self.logger.error("Resume element not found or timed out")
-            cv_text = "N/A"
-        try:
-            cl_element = WebDriverWait(drawer, self.SHORT_WAIT).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "span[data-automation='job-item-cover-letter']")
-                )
-            )
-            cl_text = self._clean_text(cl_element.text.strip())
-        except (TimeoutException, WebDriverException):
-            self.logger.error("Cover letter element not found or timed out")
-            cl_text = "N/A"
+        for field, label in (("resume", "Resume"), ("cover_letter", "Cover letter")):
+            try:
+                elements = self._locate(field, drawer)
+                if elements:
+                    results[field] = self._clean_text(elements[0].text.strip())
+                else:
+                    self.logger.error("%s element not found or timed out", label)
+            except WebDriverException:
+                self.logger.error("%s element not found or timed out", label)
 
-        results.update({"resume": cv_text, "cover_letter": cl_text})
         return results
 
     def _extract_stats_from_drawer(self, drawer):
         """Extract total applicants from the opened drawer"""
         try:
-            applicants_raw = (
-                WebDriverWait(drawer, self.SHORT_WAIT)
-                .until(
-                    EC.presence_of_element_located(
-                        (
-                            By.XPATH,
-                            "//span[contains(text(), 'kandidat melamar untuk posisi ini')]",
-                        )
-                    )
-                )
-                .text
-            )
+            # scoped to the drawer, not the whole results page
+            elements = self._locate("applicants", drawer)
+            if not elements:
+                self.logger.error("Applicants element not found or timed out")
+                return None
+            applicants_raw = elements[0].text
             # regex to extract the number of applicants
             # it will match the first number in the string
             match = re.search(r"^(\d+)", applicants_raw)
@@ -449,70 +499,91 @@ class JobStreetScraper:
             self.logger.error("Applicants element not found or timed out")
             return None
 
+    def _open_tab(self, url):
+        """Open url in a new tab without leaving the current one"""
+        existing = set(self.driver.window_handles)
+        self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+        WebDriverWait(self.driver, self.LONG_WAIT).until(
+            lambda d: len(d.window_handles) > len(existing)
+        )
+        new_windows = [w for w in self.driver.window_handles if w not in existing]
+        return new_windows[0] if new_windows else None
+
+    def _wait_loaded(self, request, condition, check_challenge=False):
+        """Wait for a throttled page load, marking timeouts and bot challenges"""
+        try:
+            WebDriverWait(self.driver, self.LONG_WAIT).until(condition)
+        except TimeoutException:
+            request.fail("timeout")
+        if (request.reason or check_challenge) and is_challenge_page(self.driver):
+            request.fail("challenge")
+            self.progress.log("[bold yellow]Bot challenge detected, backing off[/]")
+        return request.reason is None
+
+    def _reload_after_challenge(self, kind, condition):
+        """Reload the current tab once the challenge cooldown is over"""
+        with self.throttle.request(kind) as request:
+            self.driver.refresh()
+            return self._wait_loaded(request, condition, check_challenge=True)
+
     def _open_info_url_in_new_tab(self, info_url):
         original_window = self.driver.current_window_handle
+        body_present = EC.presence_of_element_located((By.TAG_NAME, "body"))
         try:
-            self.driver.execute_script(f"window.open('{info_url}', '_blank');")
-            WebDriverWait(self.driver, self.LONG_WAIT).until(
-                lambda d: len(d.window_handles) > 1
-            )
-
-            new_windows = [
-                w for w in self.driver.window_handles if w != original_window
-            ]
-
-            if not new_windows:
-                self.logger.error("No new window opened after clicking job URL")
-                return None
-
-            self.driver.switch_to.window(new_windows[0])
-
-            WebDriverWait(self.driver, self.LONG_WAIT).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            with self.throttle.request("detail") as request:
+                new_window = self._open_tab(info_url)
+                if not new_window:
+                    request.fail("error")
+                    self.logger.error("No new window opened after clicking job URL")
+                    return None
+
+                self.driver.switch_to.window(new_window)
+                self._wait_loaded(request, body_present, check_challenge=True)
+
+            if request.reason == "challenge":
+                self._reload_after_challenge("detail", body_present)
             return original_window
 
         except TimeoutException:
             self.logger.error("New window did not open in time")
             return None
         except Exception as e:
-            self.logger.error(f"Error opening job URL in new tab: {e}")
+            self.logger.error("Error opening job URL in new tab: %s", e)
             return None
 
+    def _read_page_state(self):
+        """Detail fields from the page's embedded state, None if it has none"""
+        try:
+            job = jobstate.job_from_script(
+                self.driver.execute_script(jobstate.STATE_SCRIPT)
+            )
+        except WebDriverException as e:
+            self.logger.debug("Could not read the page state: %s", e)
+            return None
+        return jobstate.extra_info_from_job(job) if job else None
+
     def _extract_extra_info_from_new_tab(self):
-        results = {
-            "job_classification": "N/A",
-            "job_type": "N/A",
-            "job_posted_date": "N/A",
-        }
+        # one script call for exact values, the selectors are the fallback
+        results = self._read_page_state()
+        if results:
+            return results
+
+        self.state_misses += 1
+        log = self.logger.warning if self.state_misses == 1 else self.logger.debug
+        log("No embedded job state on the detail page, reading the page elements")
+        results = dict(PHASE_DEFAULTS["detail"])
 
         extractions = [
-            (
-                "job_classification",
-                "span[data-automation='job-detail-classifications']",
-                "a",
-            ),
-            ("job_type", "span[data-automation='job-detail-work-type']", "a"),
-            ("job_posted_date", "//span[contains(text(), 'Posted')]", None),
+            ("job_classification", "job_classification"),
+            ("job_type", "job_type"),
+            ("job_posted_date", "posted_date"),
         ]
 
-        for field, selector, child_tag in extractions:
+        for field, locator in extractions:
             try:
-                if selector.startswith("//"):
-                    element = self._find_element(
-                        By.XPATH, selector, timeout=self.SHORT_WAIT
-                    )
-                else:
-                    element = self._find_element(
-                        By.CSS_SELECTOR, selector, timeout=self.SHORT_WAIT
-                    )
-                if element:
-                    if child_tag:
-                        text_element = element.find_element(By.TAG_NAME, child_tag)
-                        raw_text = text_element.text.strip()
-                    else:
-                        raw_text = element.text.strip()
-
+                elements = self._locate(locator)
+                if elements:
+                    raw_text = elements[0].text.strip()
                     cleaned_text = self._clean_text(raw_text)
 
                     if field == "job_posted_date":
@@ -521,15 +592,17 @@ class JobStreetScraper:
                         results[field] = cleaned_text
 
             except (TimeoutException, WebDriverException):
-                self.logger.error(f"{field} element not found or timed out")
+                self.logger.error("%s element not found or timed out", field)
             except Exception as e:
-                self.logger.error(f"Unexpected error extracting {field}: {e}")
+                self.logger.error("Unexpected error extracting %s: %s", field, e)
 
         return results
 
     def _close_info_tab(self, original_window):
+        """Close the detail tab, True when back on the results page"""
         try:
-            if len(self.driver.window_handles) > 1:
+            # other tabs (e.g. a prefetched page) may be open, close only this one
+            if self.driver.current_window_handle != original_window:
                 self.driver.close()
             if original_window and original_window in self.driver.window_handles:
                 self.driver.switch_to.window(original_window)
@@ -537,179 +610,489 @@ class JobStreetScraper:
                 if self.driver.window_handles:
                     self.driver.switch_to.window(self.driver.window_handles[0])
                     self.logger.warning("Switched to fallback window")
+                return False
+            return True
 
         except WebDriverException as e:
-            self.logger.error(f"Error closing info tab or switching back: {e}")
+            self.logger.error("Error closing info tab or switching back: %s", e)
+            return False
 
     def _close_drawer(self):
         """Close the job details drawer"""
-        close_btn = self._find_element(
-            By.CSS_SELECTOR, "[aria-label='Close']", timeout=self.SHORT_WAIT
-        )
-        if close_btn and self._click_element(close_btn):
+        close_btns = self._locate("drawer_close")
+        if close_btns and self._click_element(close_btns[0]):
             time.sleep(0.3)  # wait for drawer to close, do not remove this
             return True
         self.logger.warning("Failed to close job drawer")
         return False
 
-    def _scrape_page(self, page_num, total_jobs_so_far, reverse_cards=False):
-        console = Console()
-        jobs_processed = 0
-
-        console.print(f"[bold cyan]Processing page {page_num}...[/]")
-        self.logger.info(f"Processing page {page_num}")
-
-        job_cards = self._find_job_cards()
+    def _cards_stale(self, job_cards):
         if not job_cards:
-            self.logger.warning("No job cards found on this page")
-            console.print("[bold red]No job cards found on this page[/]")
-            return jobs_processed
-
-        console.print(
-            f"[bold yellow]Found {len(job_cards)} job cards on page {page_num}[/]"
-        )
-        if reverse_cards:
-            job_cards = list(reversed(job_cards))
-
-        for i, card in enumerate(job_cards, 1):
-            job_start = time.time()
+            return False
+        try:
+            job_cards[0].is_enabled()
+        except StaleElementReferenceException:
+            return True
+        return False
 
-            with Status(
-                f"[yellow]Processing job {i}/{len(job_cards)} [/]",
-                console=console,
-                spinner="dots",
-            ):
-                self.logger.info(f"Processing job {i}/{len(job_cards)}")
+    def _restore_page_state(self, page_window, page_windows, job_cards):
+        """Put the results page back in a known state after a job
 
-                job_info = {
-                    "id": total_jobs_so_far + jobs_processed + 1,
-                    "job_platform": "JobStreet",
-                }
+        Stray tabs are closed, the drawer is closed (with Escape when its
+        button does not work) and the cards are located again if the page
+        re-rendered them. Returns the cards and whether they were stale.
+        """
+        repaired = []
+        stale = False
+        try:
+            with self._phase("recover"):
+                job_cards, stale = self._repair_page(
+                    page_window, page_windows, job_cards, repaired
+                )
+        except WebDriverException as e:
+            # the next card gets a chance anyway, a hung browser is the watchdog's
+            self.logger.error("Could not restore the results page: %s", e)
+            self.progress.error("recover")
+        self.job_state = "idle"
+
+        if repaired:
+            self.recoveries.update(repaired)
+            self.progress.recovered()
+            self.logger.warning("Restored the results page: %s", ", ".join(repaired))
+        return job_cards, stale
+
+    def _repair_page(self, page_window, page_windows, job_cards, repaired):
+        """Close stray tabs and the drawer, locate the cards again if stale"""
+        if self.job_state == "detail":
+            # page_windows holds the results tab and a prefetched page
+            stray = [h for h in self.driver.window_handles if h not in page_windows]
+            for handle in stray:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(page_window)
+            if stray:
+                repaired.append("tab")
+
+        drawer = self.locators["drawer"]
+        if self.driver.find_elements(drawer.by, drawer.value):
+            if not self._close_drawer():
+                self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+            repaired.append("drawer")
+
+        stale = self._cards_stale(job_cards)
+        if stale:
+            job_cards = self._find_job_cards()
+            repaired.append("cards")
+        return job_cards, stale
+
+    @contextmanager
+    def _phase(self, name):
+        """Tag logs with the phase and time it on the progress dashboard"""
+        self.log_context["phase"] = name
+        with self.progress.phase(name):
+            yield
+
+    def _scrape_card(self, i, card, job_info):
+        """Open one card's drawer and build its record, None when it failed
+
+        `job_state` follows what is open on the page, so whatever a failure
+        leaves behind is cleaned up by _restore_page_state.
+        """
+        try:
+            detail_html = None
+            self.job_state = "drawer"
+            with self._phase("drawer"):
+                drawer = self._open_drawer(card)
+            if not drawer:
+                self.logger.warning("Failed to open job drawer, skipping...")
+                self.progress.job_failed("drawer")
+                return None
 
-                try:
-                    drawer = self._open_drawer(card)
-                    if not drawer:
-                        self.logger.warning("Failed to open job drawer, skipping...")
-                        continue
+            info = dict(PHASE_DEFAULTS["job_info"])
+            extra_info = dict(PHASE_DEFAULTS["detail"])
+            status = dict(PHASE_DEFAULTS["status"])
+            docs = dict(PHASE_DEFAULTS["docs"])
+            applicants = None
 
+            if "job_info" in self.phases:
+                with self._phase("job_info"):
                     info = self._extract_job_info_from_drawer(drawer)
 
-                    if info.get("job_url") != "N/A":
-                        original_window = self._open_info_url_in_new_tab(
-                            info["job_url"]
+            if "detail" in self.phases and info.get("job_url") != "N/A":
+                with self._phase("detail"):
+                    # the tab may open even when loading it fails
+                    self.job_state = "detail"
+                    original_window = self._open_info_url_in_new_tab(info["job_url"])
+                    if original_window is None:
+                        self.logger.error(
+                            "Failed to open job URL in new tab, skipping..."
                         )
-                        if original_window is None:
-                            self.logger.error(
-                                "Failed to open job URL in new tab, skipping..."
-                            )
-                            continue
-                        try:
-                            extra_info = self._extract_extra_info_from_new_tab()
-                        finally:
-                            self._close_info_tab(original_window)
-
+                        self.progress.job_failed("detail")
+                        return None
+                    try:
+                        extra_info = self._extract_extra_info_from_new_tab()
+                        if self.archive:
+                            detail_html = self.driver.page_source
+                    finally:
+                        if self._close_info_tab(original_window):
+                            self.job_state = "drawer"
+
+            if "status" in self.phases:
+                with self._phase("status"):
                     status = self._extract_status_from_drawer(drawer)
+            if "docs" in self.phases:
+                with self._phase("docs"):
                     docs = self._extract_docs_name_from_drawer(drawer)
+            if "stats" in self.phases:
+                with self._phase("stats"):
                     applicants = self._extract_stats_from_drawer(drawer)
+            if self.archive:
+                drawer_html = drawer.get_attribute("outerHTML")
+
+            job_info.update(
+                {
+                    "data_retrieved_at": time.strftime(
+                        "%d-%m-%Y %H:%M:%S", time.localtime()
+                    ),
+                    "job_title": info["job_title"],
+                    "company_name": info["company_name"],
+                    "job_location": info["job_location"],
+                    "job_classification": extra_info["job_classification"],
+                    "job_type": extra_info["job_type"],
+                    "job_posted_date": extra_info["job_posted_date"],
+                    "job_listed_at": extra_info["job_listed_at"],
+                    "salary_range": info["job_salary"],
+                    "job_url": info["job_url"],
+                    "resume": docs["resume"],
+                    "cover_letter": docs["cover_letter"],
+                    "total_applicants": (
+                        applicants if applicants is not None else "N/A"
+                    ),
+                    "is_expired": status["is_expired"],
+                    "application_status": status["application_status"],
+                }
+            )
 
-                    job_info.update(
-                        {
-                            "data_retrieved_at": time.strftime(
-                                "%d-%m-%Y %H:%M:%S", time.localtime()
-                            ),
-                            "job_title": info["job_title"],
-                            "company_name": info["company_name"],
-                            "job_location": info["job_location"],
-                            "job_classification": extra_info["job_classification"],
-                            "job_type": extra_info["job_type"],
-                            "job_posted_date": extra_info["job_posted_date"],
-                            "salary_range": info["job_salary"],
-                            "job_url": info["job_url"],
-                            "resume": docs["resume"],
-                            "cover_letter": docs["cover_letter"],
-                            "total_applicants": (
-                                applicants if applicants is not None else "N/A"
-                            ),
-                            "is_expired": status["is_expired"],
-                            "application_status": status["application_status"],
-                        }
-                    )
+            with self._phase("close"):
+                if self._close_drawer():
+                    self.job_state = "idle"
 
-                    self._close_drawer()
+        except Exception as e:
+            self.logger.error("Error processing job card %s: %s", i, e)
+            self.progress.job_failed(self.log_context["phase"])
+            return None
 
-                except Exception as e:
-                    self.logger.error(f"Error processing job card {i}: {e}")
-                    continue
+        if self.archive:
+            with self._phase("archive"):
+                self.archive.add(
+                    job_info, drawer_html, detail_html, site=configurations["site"]
+                )
 
-                self.jobs_data.append(job_info)
-                jobs_processed += 1
-                elapsed = time.time() - job_start
-                console.print(
-                    f"[green]✔ Finished job {i}/{len(job_cards)} in {elapsed:.2f}s[/]"
+        return job_info
+
+    def _reusable_record(self, card):
+        """Previous record of a card the refresh policy does not need scraped"""
+        header = self.locators["card_header"]
+        try:
+            with self._phase("refresh"):
+                title = card.find_element(header.by, header.value).text
+                return self.refresh.lookup(title, card.text)
+        except WebDriverException as e:
+            self.logger.debug("Could not read the card for the refresh policy: %s", e)
+            return None
+
+    def _iter_page(self, page_num, total_jobs_so_far):
+        """Scrape the cards of the current page, yielding each record"""
+        jobs_processed = 0
+
+        self.log_context.update(page=page_num, job_id=None, phase="cards")
+        self.logger.info("Processing page %s", page_num)
+        self.page_url = self.driver.current_url
+        self.session_cookies = self.driver.get_cookies()
+
+        # the results tab and a prefetched page are the only tabs kept open
+        page_window = self.driver.current_window_handle
+        page_windows = set(self.driver.window_handles)
+        with self._phase("cards"):
+            job_cards = self._find_job_cards()
+        if not job_cards:
+            self.logger.warning("No job cards found on this page")
+            self.progress.error("cards")
+            self.progress.log("[bold red]No job cards found on this page[/]")
+            return
+
+        self.progress.start_page(page_num, len(job_cards))
+
+        i = 0
+        retried = None
+        while i < len(job_cards):
+            card = job_cards[i]
+            i += 1
+            job_info = {
+                "id": total_jobs_so_far + jobs_processed + 1,
+                "job_platform": "JobStreet",
+            }
+            self.log_context.update(job_id=job_info["id"], phase="drawer")
+            self.logger.info("Processing job %s/%s", i, len(job_cards))
+
+            try:
+                with self.watchdog.watch(f"job {job_info['id']}"):
+                    reused = self.refresh and self._reusable_record(card)
+                    if reused:
+                        self.logger.debug("Reusing the previous record")
+                        job_info = {**job_info, **reused}
+                        if self.archive:
+                            # keeps the archive index complete for this run
+                            self.archive.reuse(job_info)
+                    else:
+                        job_info = self._scrape_card(i, card, job_info)
+                    if job_info is None or self.job_state != "idle":
+                        job_cards, stale = self._restore_page_state(
+                            page_window, page_windows, job_cards
+                        )
+                        # a click on a detached card fails, retry it once
+                        if job_info is None and stale and retried != i:
+                            retried = i
+                            i -= 1
+            except DriverWedged as e:
+                self._restart_driver(str(e))
+                page_window = self.driver.current_window_handle
+                page_windows = set(self.driver.window_handles)
+                job_cards = self._find_job_cards()
+                # retry the card the browser hung on once, then move past it
+                if retried != i:
+                    retried = i
+                    i -= 1
+                else:
+                    self.progress.job_failed(self.log_context["phase"])
+                continue
+            if job_info is None:
+                continue
+
+            jobs_processed += 1
+            self.progress.job_done()
+            yield job_info
+
+        self.log_context.update(job_id=None, phase=None)
+        self.logger.info(
+            "Completed page %s, jobs processed: %s", page_num, jobs_processed
+        )
+        self.progress.end_page(page_num)
+
+    def _restart_driver(self, reason):
+        """Replace a wedged browser and reopen the page being scraped"""
+        self.restarts += 1
+        self.logger.warning(
+            "Restarting the browser (%s), restart %s", reason, self.restarts
+        )
+        self.progress.log(
+            f"[bold yellow]Browser restarted ({reason}), "
+            f"resuming page {self.log_context['page']}[/]"
+        )
+        kill_driver(self.driver)
+        self.job_state = "idle"
+        self.profiles.release(self.profile_path)
+        self._initialize_driver()
+        self._restore_session()
+
+    def _restore_session(self):
+        """Reopen the current results page with the saved session cookies"""
+        # cookies can only be set on a page of their own domain
+        self.driver.get(self.base_url)
+        for cookie in self.session_cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except WebDriverException as e:
+                self.logger.debug(
+                    "Could not restore cookie %s: %s", cookie.get("name"), e
                 )
-        self.logger.info(f"Completed page {page_num}, jobs processed: {jobs_processed}")
-        console.print(f"[bold green]✔ Completed page {page_num}[/]")
-        return jobs_processed
 
-    def scrape_all_jobs(self, reverse=False):
-        """Main scraping method"""
-        console = Console()
-        start_time = time.time()
+        self.driver.get(self.page_url or self.base_url)
+        try:
+            WebDriverWait(self.driver, self.LONG_WAIT).until(JOB_CARDS_PRESENT)
+        except TimeoutException:
+            self.logger.warning("Session was not restored, logging in again")
+            if not self._login_and_navigate():
+                raise RuntimeError("Could not log in again after a browser restart")
+            if self.page_url:
+                self.driver.get(self.page_url)
+
+    def open_session(self, cookies, url=None):
+        """Continue a session logged in elsewhere, from its cookies"""
+        self.session_cookies = cookies
+        self.page_url = url
+        self._restore_session()
+
+    def discover_pages(self):
+        """Walk the result pages without opening a card, yielding (number, url)"""
+        page_num = 1
+        while True:
+            self.log_context.update(page=page_num, job_id=None, phase="navigate")
+            yield page_num, self.driver.current_url
+            with self.watchdog.watch(f"page {page_num} navigation"):
+                if not self._next_page(None):
+                    self.succeeded = True
+                    return
+            page_num += 1
+
+    def scrape_page(self, page_num, url, heartbeat=None):
+        """Scrape the records of one results page opened by url
+
+        Used by queue workers, `heartbeat` is called after every job so a
+        lease can be renewed while the page is scraped.
+        """
+        with self.throttle.request("page") as request:
+            self.driver.get(url)
+            self._wait_loaded(request, JOB_CARDS_PRESENT)
+        if request.reason == "challenge":
+            self._reload_after_challenge("page", JOB_CARDS_PRESENT)
+
+        records = []
+        # ids continue from the previous pages, collect renumbers them anyway
+        for record in self._iter_page(page_num, (page_num - 1) * PAGE_SIZE):
+            records.append(record)
+            if heartbeat:
+                heartbeat()
+        if records:
+            self.succeeded = True
+        return records
+
+    def _next_page(self, prefetched):
+        """Move on to the next page, True when there is one"""
+        if prefetched:
+            return self._switch_to_prefetched_page(prefetched)
+        if not self._go_to_next_page():
+            self.logger.warning("No more pages available")
+            return False
+        return True
+
+    def _iter_pages(self):
+        """Walk the result pages forward, yielding every scraped record"""
+        # always one forward pass, --desc order is applied by order_jobs
         total_jobs = 0
+        page_num = 0
+        while True:
+            page_num += 1
+            restarts = self.restarts
+            prefetched = self._prefetch_page("next")
+            for job_info in self._iter_page(page_num, total_jobs):
+                total_jobs += 1
+                yield job_info
+            if self.memprofiler:
+                self.memprofiler.page_done(page_num, total_jobs, self.driver)
+
+            if prefetched and self.restarts != restarts:
+                # the background tab went down with the old browser
+                self.throttle.release_background("restart")
+                prefetched = None
+            self.log_context.update(job_id=None, phase="navigate")
+            try:
+                with self.watchdog.watch(f"page {page_num} navigation"):
+                    has_next = self._next_page(prefetched)
+            except DriverWedged as e:
+                # back on the finished page, try the next one once more
+                self._restart_driver(str(e))
+                with self.watchdog.watch(f"page {page_num} navigation"):
+                    has_next = self._next_page(None)
+            if not has_next:
+                break
+
+    def iter_jobs(self, limit=None, since=None):
+        """Yield job records as soon as they are scraped, newest application first
 
-        self._login_and_navigate()
-        console.print("[bold cyan]Starting JobStreet scraping[/]")
+        Pagination stops once `limit` records were yielded, or, with a `since`
+        date, after a full page of records not updated on or after it. Closing
+        the generator early stops the scrape as well.
+        """
+        if since is not None:
+            # the cutoff is checked against the application status dates
+            self.phases.add("status")
+
+        if not self._login_and_navigate():
+            raise RuntimeError("Could not log in to JobStreet")
+        self.console.print("[bold cyan]Starting JobStreet scraping[/]")
         self.logger.info("Starting job scraping")
 
+        self.progress.start()
         try:
-            if reverse:
-                console.print("[bold yellow] Analyzing pages in descending order...[/]")
-                last_page_num = self._find_last_page()
-                console.print(f"[bold yellow]Last page found: {last_page_num}[/]")
-                self.logger.info(f"Last page found: {last_page_num}")
-
-                for page_num in range(last_page_num, 0, -1):
-                    total_jobs += self._scrape_page(
-                        page_num, total_jobs, reverse_cards=True
-                    )
+            for job_info in take_recent(
+                self._iter_pages(), limit=limit, since=since, window=PAGE_SIZE
+            ):
+                self.jobs_data.append(job_info)
+                self.collected += 1
+                if self.spool:
+                    self.spool.add(self.jobs_data)
+                yield job_info
+            self.succeeded = True
+        finally:
+            self.progress.stop()
+            self.logger.info(
+                "Scraping completed. Total jobs collected: %s, browser restarts: %s, "
+                "page recoveries: %s",
+                self.collected,
+                self.restarts,
+                dict(self.recoveries) or "none",
+            )
+            if self.refresh:
+                refresh = self.refresh.summary()
+                self.logger.info("Refresh run %s: %s", refresh["run"], refresh)
+                self.console.print(
+                    f"[dim]Refresh run {refresh['run']}: {refresh['scraped']} cards "
+                    f"scraped, {refresh['reused']} served from the previous output[/]"
+                )
+            throttle = self.throttle.summary()
+            self.logger.info(
+                "Request rate settled at %s req/s, concurrency %s "
+                "(achieved %s req/s over %s requests, %ss waiting, backoffs: %s)",
+                throttle["rate"],
+                throttle["concurrency"],
+                throttle["achieved_rate"],
+                throttle["requests"],
+                throttle["waited_s"],
+                throttle["backoffs"] or "none",
+            )
+            self.console.print(
+                f"[dim]Request rate settled at {throttle['rate']} req/s, "
+                f"concurrency {throttle['concurrency']}[/]"
+            )
 
-                    if page_num > 1:
-                        if not self._go_to_prev_page():
-                            self.logger.warning(
-                                "Failed to navigate to previous page..."
-                            )
-                            break
-            else:
-                page_num = 0
-                while True:
-                    page_num += 1
-                    total_jobs += self._scrape_page(
-                        page_num, total_jobs, reverse_cards=False
-                    )
+    def scrape_all_jobs(self, reverse=False, limit=None, since=None):
+        """Main scraping method
 
-                    if not self._go_to_next_page():
-                        self.logger.warning("No more pages available")
-                        break
-        finally:
-            total_elapsed = time.time() - start_time
-            self.logger.info(f"Scraping completed. Total jobs collected: {total_jobs}")
-            return {
-                "jobs_data": self.jobs_data,
-                "total_jobs": total_jobs,
-                "total_elapsed": total_elapsed,
-                "scraping_completed_at": time.strftime(
-                    "%d-%m-%Y %H:%M:%S", time.localtime()
-                ),
-            }
+        A run that fails part way still returns the records scraped so far,
+        with "completed" False and the reason in "error".
+        """
+        start_time = time.time()
+        error = None
+        try:
+            for _ in self.iter_jobs(limit=limit, since=since):
+                pass
+        except (Exception, KeyboardInterrupt) as e:
+            error = str(e) or type(e).__name__
+            self.logger.error("Scraping stopped early: %s", error)
+        total_elapsed = time.time() - start_time
+        if self.spool:
+            jobs_data = self.spool.ordered(self.jobs_data, descending=reverse)
+        else:
+            jobs_data = order_jobs(self.jobs_data, descending=reverse)
+        return {
+            "jobs_data": jobs_data,
+            "total_jobs": self.collected,
+            "total_elapsed": total_elapsed,
+            "scraping_completed_at": time.strftime(
+                "%d-%m-%Y %H:%M:%S", time.localtime()
+            ),
+            "completed": self.succeeded,
+            "error": error,
+        }
 
     def _navigate_page(self, direction="next"):
-        console = Console()
         direction_map = {
             "next": {"aria_label": "Next", "log": "next page"},
             "prev": {"aria_label": "Previous", "log": "previous page"},
         }
         if direction not in direction_map:
-            self.logger.error(f"Invalid navigation direction: {direction}")
+            self.logger.error("Invalid navigation direction: %s", direction)
             return False
 
         try:
@@ -720,64 +1103,137 @@ class JobStreetScraper:
             )
             if not btn:
                 self.logger.warning(
-                    f"{direction_map[direction]['log'].capitalize()} button not found"
+                    "%s button not found", direction_map[direction]["log"].capitalize()
                 )
                 return False
 
             current_url = self.driver.current_url
-            if not self._click_element(btn):
+            with self.throttle.request("page") as request:
+                if not self._click_element(btn):
+                    request.fail("error")
+                    self.logger.error(
+                        "Failed to click %s button", direction_map[direction]["log"]
+                    )
+                    return False
+
+                try:
+                    WebDriverWait(self.driver, self.SHORT_WAIT).until(
+                        lambda d: d.current_url != current_url
+                    )
+                except TimeoutException:
+                    request.fail("timeout")
+                    raise
+                self._wait_loaded(request, JOB_CARDS_PRESENT)
+
+            if request.reason == "challenge":
+                if not self._reload_after_challenge("page", JOB_CARDS_PRESENT):
+                    return False
+            elif request.reason:
                 self.logger.error(
-                    f"Failed to click {direction_map[direction]['log']} button"
+                    "Job cards did not load after navigating to %s",
+                    direction_map[direction]["log"],
                 )
                 return False
-
-            WebDriverWait(self.driver, self.SHORT_WAIT).until(
-                lambda d: d.current_url != current_url
-            )
-            WebDriverWait(self.driver, self.LONG_WAIT).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "[data-automation^='job-item-1']")
-                )
-            )
-            time.sleep(1)  # wait for the page to load
             self.logger.info(
-                f"Successfully navigated to {direction_map[direction]['log']}"
+                "Successfully navigated to %s", direction_map[direction]["log"]
             )
-            console.print(
+            self.progress.log(
                 f"[bold green]Navigated to {direction_map[direction]['log']}[/]"
             )
             return True
         except TimeoutException:
             self.logger.error(
-                f"Redirecting error: page URL did not change after clicking {direction_map[direction]['log']}"
+                "Redirecting error: page URL did not change after clicking %s",
+                direction_map[direction]["log"],
             )
             return False
         except Exception as e:
             self.logger.error(
-                f"Failed to navigate to {direction_map[direction]['log']}: {e}"
+                "Failed to navigate to %s: %s", direction_map[direction]["log"], e
             )
             return False
 
-    def _go_to_next_page(self):
-        return self._navigate_page(direction="next")
+    def _prefetch_page(self, direction="next"):
+        """Start loading the next or previous page in a background tab
 
-    def _go_to_prev_page(self):
-        return self._navigate_page(direction="prev")
+        The tab loads while the current page's cards are processed, so the
+        page transition is off the critical path. Returns the tab handle, or
+        None when there is no such page or it could not be opened.
+        """
+        aria_label = "Next" if direction == "next" else "Previous"
+        links = self.driver.find_elements(
+            By.CSS_SELECTOR, f"a[aria-label='{aria_label}']"
+        )
+        if not links or links[0].get_attribute("aria-disabled") == "true":
+            return None
 
-    def _find_last_page(self):
-        page_num = 1
-        while True:
-            # TODO: scroll to bottom maybe
-            if not self._go_to_next_page():
-                self.logger.info("No more pages available, stopping search")
-                break
-            page_num += 1
-        return page_num
+        href = links[0].get_attribute("href")
+        if not href or href == self.driver.current_url:
+            return None
+        if not self.throttle.try_background():
+            self.logger.info(
+                "Concurrency window full, not prefetching %s page", direction
+            )
+            return None
+
+        try:
+            handle = self._open_tab(href)
+            self.logger.info("Prefetching %s page in background tab", direction)
+            return handle
+        except (TimeoutException, WebDriverException) as e:
+            self.throttle.release_background("error")
+            self.logger.warning("Failed to prefetch %s page: %s", direction, e)
+            return None
+
+    def _switch_to_prefetched_page(self, handle):
+        """Close the finished page tab and continue on the prefetched one"""
+        reason = None
+        try:
+            self.driver.close()
+            self.driver.switch_to.window(handle)
+            WebDriverWait(self.driver, self.LONG_WAIT).until(JOB_CARDS_PRESENT)
+        except TimeoutException:
+            reason = "challenge" if is_challenge_page(self.driver) else "timeout"
+        except WebDriverException as e:
+            self.throttle.release_background("error")
+            self.logger.error("Failed to switch to prefetched page: %s", e)
+            return False
+        self.throttle.release_background(reason)
+
+        if reason == "timeout":
+            self.logger.warning("Prefetched page has no job cards, stopping")
+            return False
+        if reason == "challenge":
+            self.progress.log("[bold yellow]Bot challenge detected, backing off[/]")
+            try:
+                if not self._reload_after_challenge("page", JOB_CARDS_PRESENT):
+                    self.logger.warning("Prefetched page is still challenged, stopping")
+                    return False
+            except WebDriverException as e:
+                self.logger.error("Failed to reload prefetched page: %s", e)
+                return False
+        self.progress.log("[bold green]Switched to prefetched page[/]")
+        return True
+
+    def _go_to_next_page(self):
+        return self._navigate_page(direction="next")
 
     def close_browser(self):
-        """Close the browser"""
+        """Close the browser and remove its profile directory"""
+        if hasattr(self, "watchdog"):
+            self.watchdog.stop()
+        if hasattr(self, "otp"):
+            self.otp.close()
         if hasattr(self, "driver") and self.driver:
             try:
                 self.driver.quit()
             except WebDriverException as e:
-                self.logger.error(f"Error closing the browser: {e}")
+                self.logger.error("Error closing the browser: %s", e)
+            self.driver = None
+        if self.profile_path:
+            # the first clean run seeds the template used by later startups,
+            # a failed one may have left a half written or challenged profile
+            if getattr(self, "succeeded", False):
+                self.profiles.save_template(self.profile_path)
+            self.profiles.release(self.profile_path)
+            self.profile_path = None
@@ -0,0 +1,48 @@
+from exporter import _normalize_application_status
+from collections import Counter
+from typing import List, Dict
+
+
+def compute_stats(jobs_data: List[Dict], top: int = 5) -> Dict:
+    """Summarize stored jobs data by latest status, company and classification"""
+    normalized = _normalize_application_status(jobs_data)
+
+    applicants = [
+        job["total_applicants"]
+        for job in normalized
+        if isinstance(job.get("total_applicants"), int)
+    ]
+
+    return {
+        "total_jobs": len(normalized),
+        "expired_jobs": sum(1 for job in normalized if job.get("is_expired")),
+        "by_status": Counter(job.get("status", "N/A") for job in normalized),
+        "top_companies": Counter(
+            job.get("company_name", "N/A") for job in normalized
+        ).most_common(top),
+        "top_classifications": Counter(
+            job.get("job_classification", "N/A") for job in normalized
+        ).most_common(top),
+        "avg_applicants": (sum(applicants) / len(applicants)) if applicants else None,
+    }
+
+
+def format_stats(stats: Dict) -> str:
+    """Render stats as plain text lines"""
+    avg_applicants = stats["avg_applicants"]
+    lines = [
+        f"Jobs: {stats['total_jobs']}",
+        f"Expired: {stats['expired_jobs']}",
+        "Average applicants: "
+        + (f"{avg_applicants:.1f}" if avg_applicants is not None else "N/A"),
+        "",
+        "Latest status:",
+    ]
+    lines += [
+        f"  {count:>5}  {status}" for status, count in stats["by_status"].most_common()
+    ]
+    lines += ["", "Top companies:"]
+    lines += [f"  {count:>5}  {name}" for name, count in stats["top_companies"]]
+    lines += ["", "Top classifications:"]
+    lines += [f"  {count:>5}  {name}" for name, count in stats["top_classifications"]]
+    return "\n".join(lines)
@@ -0,0 +1,170 @@
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+from scraper import JobStreetScraper
+from contextlib import nullcontext
+import scraper as scraper_module
+import pytest
+
+RESULTS_URL = "https://id.jobstreet.com/id/my-activity/applied-jobs?page=2"
+
+
+class FakeElement(WebElement):
+    """A job card or page element, stale once the page re-renders"""
+
+    text = ""
+
+    def __init__(self, driver, index=0):
+        super().__init__(driver, f"{driver.render}-{index}")
+        self.driver = driver
+        self.index = index
+        self.render = driver.render
+        self.keys = []
+
+    def _check(self):
+        if self.render != self.driver.render:
+            raise StaleElementReferenceException("element is not attached")
+
+    def get_attribute(self, name):
+        self._check()
+        return f"job-item-{self.index}"
+
+    def is_enabled(self):
+        self._check()
+        return True
+
+    def is_displayed(self):
+        return self.is_enabled()
+
+    def click(self):
+        self._check()
+        self.driver.clicked.append(self.index)
+
+    def find_element(self, by, value):
+        return self
+
+    def send_keys(self, keys):
+        self.keys.append(keys)
+
+
+class SwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """Enough of a WebDriver for the recovery paths, without a browser
+
+    `elements` maps a locator value to what find_elements returns, cards
+    are numbered like the site's data-automation attributes.
+    """
+
+    name = "fake"
+    service = None
+
+    def __init__(self, cards=3):
+        self.render = 0
+        self.current_url = RESULTS_URL
+        self.current_window_handle = "results"
+        self.window_handles = ["results"]
+        self.switch_to = SwitchTo(self)
+        self.cookies = [{"name": "session", "value": "s3cret"}]
+        self.added_cookies = []
+        self.visited = []
+        self.clicked = []
+        self.closed = []
+        self.quit_called = False
+        self.elements = {}
+        self.body = FakeElement(self)
+        self.cards = cards
+        self.rerender()
+
+    def rerender(self):
+        """The page rendered the cards again, the old elements are stale"""
+        self.render += 1
+        self.body = FakeElement(self)
+        self.elements["[data-automation^='job-item-']"] = [
+            FakeElement(self, index) for index in range(self.cards, 0, -1)
+        ]
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = url
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.added_cookies.append(cookie)
+
+    def open_tab(self, handle):
+        self.window_handles.append(handle)
+        self.current_window_handle = handle
+
+    def close(self):
+        self.closed.append(self.current_window_handle)
+        self.window_handles.remove(self.current_window_handle)
+
+    def execute_script(self, script, *args):
+        return None
+
+    def find_elements(self, by, value):
+        return list(self.elements.get(value, []))
+
+    def find_element(self, by, value):
+        return self.body
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Profiles:
+    def __init__(self):
+        self.saved, self.released = [], []
+
+    def create(self, browser):
+        return f"profiles/{browser}-1"
+
+    def save_template(self, path):
+        self.saved.append(path)
+
+    def release(self, path):
+        self.released.append(path)
+
+
+class Watchdog:
+    """Runs watched blocks without a thread or a deadline"""
+
+    def __init__(self, *args, **kwargs):
+        self.watched = []
+
+    def watch(self, label, deadline=None):
+        self.watched.append(label)
+        return nullcontext()
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def fake_scraper(monkeypatch):
+    """A scraper on a FakeDriver, a fresh one for every (re)start
+
+    Nothing touches the real machine: profiles are the fake above instead
+    of a ProfileManager under /dev/shm, and the watchdog starts no thread.
+    """
+    drivers = []
+
+    def initialize(self):
+        self.profile_path = self.profiles.create(self.browser)
+        self.driver = FakeDriver()
+        drivers.append(self.driver)
+
+    monkeypatch.setattr(JobStreetScraper, "_initialize_driver", initialize)
+    monkeypatch.setattr(scraper_module, "Watchdog", Watchdog)
+    scraper = JobStreetScraper("user@example.com", headless=True, profiles=Profiles())
+    scraper.LONG_WAIT = scraper.SHORT_WAIT = 0.01
+    scraper.drivers = drivers
+    return scraper
@@ -0,0 +1,133 @@
+from api_client import JobStreetApiClient, load_session, save_session
+from cli import cli_scraper_parser
+import scraper as scraper_module
+import conftest
+import pytest
+import main
+import re
+
+# an applied job node in the shape APPLIED_JOBS_QUERY asks for
+NODE = {
+    "id": "application-1",
+    "isExpired": False,
+    "appliedAt": {"dateTimeUtc": "2025-03-05T02:00:00Z"},
+    "events": [
+        {
+            "status": "VIEWED",
+            "label": "Dilihat oleh perusahaan",
+            "timestamp": {"dateTimeUtc": "2025-03-09T08:30:00.000Z"},
+        },
+        {
+            "status": "APPLIED",
+            "label": None,
+            "timestamp": {"dateTimeUtc": "2025-03-05T02:00:00Z"},
+        },
+    ],
+    "attachments": {"resume": {"fileName": "CV_Budi_2025.pdf"}, "coverLetter": None},
+    "applicantCount": 37,
+    "job": {
+        "id": "81234567",
+        "title": "Data Analyst",
+        "advertiser": {"name": "PT Maju Jaya"},
+        "location": {"label": "Jakarta Selatan"},
+        "salary": {"label": "Rp 8.000.000 – Rp 10.000.000 per month"},
+        "classifications": [
+            {"label": "Information & Communication Technology"},
+            {"label": "Data Analysis"},
+        ],
+        "workTypes": [{"label": "Full time"}],
+        "listedAt": {"dateTimeUtc": "2025-03-03T04:15:00.000Z"},
+    },
+}
+
+
+def test_build_record():
+    record = JobStreetApiClient([])._build_record(NODE)
+    assert re.fullmatch(r"\d\d-\d\d-\d{4} \d\d:\d\d:\d\d", record["data_retrieved_at"])
+    del record["data_retrieved_at"]
+    assert record == {
+        "job_platform": "JobStreet",
+        "job_title": "Data Analyst",
+        "company_name": "PT Maju Jaya",
+        "job_location": "Jakarta Selatan",
+        "job_classification": "Information & Communication Technology, "
+        "Data Analysis",
+        "job_type": "Full time",
+        "job_posted_date": "03-03-2025",
+        "job_listed_at": "2025-03-03T04:15:00+00:00",
+        "salary_range": "Rp 8.000.000 – Rp 10.000.000 per month",
+        "job_url": "https://id.jobstreet.com/id/job/81234567",
+        "resume": "CV_Budi_2025.pdf",
+        "cover_letter": "N/A",
+        "total_applicants": 37,
+        "is_expired": False,
+        "application_status": [
+            {"status": "Dilihat oleh perusahaan", "updated_at": "9 Mar 2025"},
+            {"status": "APPLIED", "updated_at": "5 Mar 2025"},
+        ],
+    }
+
+
+def test_build_record_of_a_sparse_node():
+    record = JobStreetApiClient([])._build_record({"job": None, "events": None})
+    assert record["job_title"] == record["job_url"] == record["company_name"] == "N/A"
+    assert record["total_applicants"] == "N/A"
+    assert record["application_status"] == []
+
+
+@pytest.fixture
+def backend(fake_scraper, monkeypatch):
+    """The GraphQL endpoint, accepting only the cookies of a fresh login"""
+    monkeypatch.setattr(scraper_module, "ProfileManager", conftest.Profiles)
+    monkeypatch.setattr(scraper_module.JobStreetScraper, "login", lambda self: True)
+    requests = []
+
+    def post(self, payload):
+        requests.append(self.headers["Cookie"])
+        if self.headers["Cookie"] != "session=s3cret":
+            raise PermissionError("Session is not authenticated")
+        page_info = {"hasNextPage": False, "endCursor": None}
+        return {
+            "viewer": {
+                "appliedJobs": {"edges": [{"node": NODE}], "pageInfo": page_info}
+            }
+        }
+
+    monkeypatch.setattr(JobStreetApiClient, "_post", post)
+    return requests
+
+
+def api_args(session):
+    return cli_scraper_parser(
+        ["-e", "user@example.com", "--api", "--headless", "--session", str(session)]
+    )
+
+
+def test_expired_session_logs_in_again(backend, tmp_path):
+    session = tmp_path / "session.json"
+    save_session([{"name": "session", "value": "expired"}], str(session))
+    jobs = main.fetch_jobs_over_api(api_args(session), "user@example.com", False)
+    assert jobs["total_jobs"] == 1
+    assert backend == ["session=expired", "session=s3cret"]
+    # the fresh cookies replace the expired ones
+    assert load_session(str(session)) == [{"name": "session", "value": "s3cret"}]
+
+
+def test_valid_session_needs_no_browser(backend, tmp_path, monkeypatch):
+    session = tmp_path / "session.json"
+    save_session([{"name": "session", "value": "s3cret"}], str(session))
+
+    def no_browser(*args, **kwargs):
+        raise AssertionError("the browser was started")
+
+    monkeypatch.setattr(main, "_login_for_api", no_browser)
+    jobs = main.fetch_jobs_over_api(api_args(session), "user@example.com", False)
+    assert jobs["total_jobs"] == 1
+    assert backend == ["session=s3cret"]
+
+
+@pytest.mark.parametrize("flag", ["--profile", "--memprofile", "--refresh-from=latest"])
+def test_api_rejects_browser_only_flags(flag, capsys):
+    with pytest.raises(SystemExit):
+        cli_scraper_parser(["-e", "user@example.com", "--api", flag])
+    assert "not --api" in capsys.readouterr().err
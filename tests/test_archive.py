@@ -0,0 +1,86 @@
+from archive import HtmlArchive, extract_entry, reextract
+from pathlib import Path
+
+FIXTURES = Path(__file__).parent / "fixtures"
+DRAWER = (FIXTURES / "drawer.html").read_text(encoding="utf-8")
+DETAIL = (FIXTURES / "job_detail.html").read_text(encoding="utf-8")
+DETAIL_NO_STATE = (FIXTURES / "job_detail_no_state.html").read_text(encoding="utf-8")
+URL = "https://id.jobstreet.com/id/job/81234567"
+
+
+def job(job_id, url=URL):
+    return {"id": job_id, "job_url": url, "data_retrieved_at": "10-03-2025 09:30:00"}
+
+
+def test_extract_entry(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    entry = archive.add(job(3), DRAWER, DETAIL, site="id")
+    assert extract_entry(str(tmp_path), entry) == {
+        "id": 3,
+        "job_platform": "JobStreet",
+        "data_retrieved_at": "10-03-2025 09:30:00",
+        "job_title": "Data Analyst",
+        "company_name": "PT Maju Jaya",
+        "job_location": "Jakarta Selatan",
+        "job_classification": "Information & Communication Technology, "
+        "Data Analysis",
+        "job_type": "Full time",
+        "job_posted_date": "03-03-2025",
+        "job_listed_at": "2025-03-03T04:15:00+00:00",
+        "salary_range": "Rp 8.000.000 - Rp 10.000.000",
+        "job_url": URL,
+        "resume": "CV_Budi_2025.pdf",
+        "cover_letter": "Surat lamaran",
+        "total_applicants": 37,
+        "is_expired": False,
+        "application_status": [
+            {"status": "Dilihat oleh perusahaan", "updated_at": "Kemarin"},
+            {"status": "Dilamar di JobStreet", "updated_at": "5 Mar 2025"},
+        ],
+    }
+
+
+def test_extract_entry_without_page_state(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    entry = archive.add(job(1), DRAWER, DETAIL_NO_STATE, site="id")
+    record = extract_entry(str(tmp_path), entry)
+    assert record["job_classification"] == "Information & Communication Technology"
+    assert record["job_type"] == "Full time"
+    # counted back from data_retrieved_at, the listing time is unknown
+    assert record["job_posted_date"] == "07-03-2025"
+    assert record["job_listed_at"] == "N/A"
+
+
+def test_identical_pages_are_stored_once(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    first = archive.add(job(1), DRAWER, DETAIL)
+    second = archive.add(job(2, URL + "1"), DRAWER, DETAIL)
+    assert first["drawer"] == second["drawer"]
+    assert len(list((tmp_path / "objects").rglob("*.html.gz"))) == 2
+
+
+def test_runs_sharing_an_archive(tmp_path):
+    other = DRAWER.replace("Data Analyst", "Data Engineer").replace(
+        "81234567", "81234599"
+    )
+    first = HtmlArchive(str(tmp_path))
+    first.add(job(1, URL), DRAWER)
+    first.add(job(2, URL[:-2] + "99"), other)
+    # a later --limit run numbers its one job 1 again, a reused job is indexed
+    second = HtmlArchive(str(tmp_path))
+    second.run = first.run + "1"
+    second.add(job(1, URL[:-2] + "99"), other)
+    assert second.reuse(job(2, URL))["drawer"] == first.entries()[1]["drawer"]
+    assert second.reuse(job(3, URL + "/unknown")) is None
+
+    entries = HtmlArchive(str(tmp_path)).entries()
+    assert [(entry["id"], entry["job_url"]) for entry in entries] == [
+        (1, URL[:-2] + "99"),
+        (2, URL),
+    ]
+
+    records = reextract(str(tmp_path), workers=1)
+    assert [(record["id"], record["job_title"]) for record in records] == [
+        (1, "Data Engineer"),
+        (2, "Data Analyst"),
+    ]
@@ -0,0 +1,59 @@
+from benchmarks import ALLOCATION_SLACK, _regressions, benchmark_parser
+import benchmarks
+import exporter
+import pytest
+import json
+
+
+def result(records_per_s, peak_bytes):
+    return {"seconds": 1.0, "records_per_s": records_per_s, "peak_bytes": peak_bytes}
+
+
+def test_regressions_against_the_baseline():
+    baseline = {
+        "export_csv": {"1000": result(10_000, 1_000_000)},
+        "clean_text": {"1000": result(50_000, 1_000)},
+    }
+    results = {
+        # within the threshold either way
+        "export_csv": {"1000": result(8_500, 1_150_000), "100": result(1, 1)},
+        # small allocations get the slack instead of the threshold
+        "clean_text": {"1000": result(50_000, 1_000 + ALLOCATION_SLACK)},
+        "latest_update": {"1000": result(1, 10**9)},
+    }
+    assert _regressions(results, baseline, 0.2) == []
+
+    results["export_csv"]["1000"] = result(7_000, 1_300_000)
+    assert _regressions(results, baseline, 0.2) == [
+        "export_csv @ 1000: 7,000 records/s, baseline 10,000",
+        "export_csv @ 1000: 1,300,000 peak bytes, baseline 1,000,000",
+    ]
+
+
+@pytest.fixture
+def micro(tmp_path, monkeypatch):
+    """Run the micro benchmark on a small dataset, returning its exit code"""
+    # the cases point the exporter at a temporary directory
+    monkeypatch.setattr(exporter, "EXPORT_DIR", exporter.EXPORT_DIR)
+    monkeypatch.setattr(benchmarks, "MIN_TIMING", 0.01)
+
+    def run(*options):
+        argv = ["micro", "--sizes", "200", "--cases", "normalize_typed"]
+        args = benchmark_parser().parse_args([*argv, "--repeat", "1", *options])
+        return args.func(args)
+
+    return run
+
+
+def test_micro_compares_with_a_saved_baseline(micro, tmp_path):
+    baseline = tmp_path / "baseline.json"
+    assert micro("-o", str(baseline)) == 0
+    saved = json.loads(baseline.read_text(encoding="utf-8"))
+    assert saved["results"]["normalize_typed"]["200"]["records_per_s"] > 0
+
+    # the same code against its own numbers, timer noise aside
+    assert micro("--baseline", str(baseline), "--threshold", "0.9") == 0
+
+    saved["results"]["normalize_typed"]["200"]["records_per_s"] *= 100
+    baseline.write_text(json.dumps(saved), encoding="utf-8")
+    assert micro("--baseline", str(baseline)) == 1
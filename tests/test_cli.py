@@ -0,0 +1,37 @@
+from pathlib import Path
+import subprocess
+import pytest
+import json
+import sys
+
+ROOT = Path(__file__).parent.parent
+# runs a command in a fresh interpreter, printing the modules it loaded
+SCRIPT = """
+import json, sys
+sys.argv = ["main.py", *sys.argv[1:]]
+import main
+try:
+    main.main()
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)))
+"""
+HEAVY_MODULES = ("selenium", "rich", "scraper", "urllib3")
+
+
+@pytest.mark.parametrize(
+    "argv", [["--help"], ["export", "--help"], ["stats", "--help"]]
+)
+def test_help_does_not_load_the_browser_stack(argv):
+    process = subprocess.run(
+        [sys.executable, "-c", SCRIPT, *argv],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert process.returncode == 0, process.stderr
+    assert "usage:" in process.stdout
+    loaded = json.loads(process.stdout.strip().splitlines()[-1])
+    heavy = [name for name in loaded if name.split(".")[0] in HEAVY_MODULES]
+    assert heavy == []
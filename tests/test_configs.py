@@ -0,0 +1,56 @@
+import configs
+import pytest
+
+
+class Driver:
+    def __init__(self, options):
+        self.options = options
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    path = tmp_path / "chrome_selenium_1"
+
+    def mkdtemp(prefix):
+        path.mkdir()
+        return str(path)
+
+    monkeypatch.setattr(configs.tempfile, "mkdtemp", mkdtemp)
+    return path
+
+
+def test_throwaway_chrome_profile_is_removed_on_quit(profile_dir, monkeypatch):
+    monkeypatch.setattr(
+        configs, "_start_driver", lambda browser, options: Driver(options)
+    )
+    driver = configs.init_chrome_driver()
+    assert f"--user-data-dir={profile_dir}" in driver.options.arguments
+    assert profile_dir.is_dir()
+    driver.quit()
+    assert driver.quit_called
+    assert not profile_dir.exists()
+
+
+def test_throwaway_chrome_profile_is_removed_when_the_launch_fails(
+    profile_dir, monkeypatch
+):
+    def broken(browser, options):
+        raise RuntimeError("chrome not found")
+
+    monkeypatch.setattr(configs, "_start_driver", broken)
+    with pytest.raises(RuntimeError):
+        configs.init_chrome_driver()
+    assert not profile_dir.exists()
+
+
+def test_managed_chrome_profile_is_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        configs, "_start_driver", lambda browser, options: Driver(options)
+    )
+    driver = configs.init_chrome_driver(profile_dir=str(tmp_path))
+    driver.quit()
+    assert tmp_path.is_dir()
@@ -0,0 +1,65 @@
+from helpers import latest_update, take_recent
+from datetime import date
+
+RETRIEVED_AT = "10-06-2025 09:30:00"
+
+
+def job(*updated_at, retrieved_at=RETRIEVED_AT):
+    return {
+        "data_retrieved_at": retrieved_at,
+        "application_status": [
+            {"status": "Dilamar di JobStreet", "updated_at": text}
+            for text in updated_at
+        ],
+    }
+
+
+def test_latest_update_absolute():
+    assert latest_update(job("5 Mar 2025", "7 Mei 2025")) == date(2025, 5, 7)
+
+
+def test_latest_update_relative_counts_from_retrieval_day():
+    assert latest_update(job("5 Mar 2025", "Kemarin")) == date(2025, 6, 9)
+    assert latest_update(job("5 Mar 2025", "2 hari yang lalu")) == date(2025, 6, 8)
+    assert latest_update(job("Hari ini")) == date(2025, 6, 10)
+
+
+def test_latest_update_without_dates():
+    assert latest_update(job()) is None
+    assert latest_update(job("N/A")) is None
+
+
+def test_take_recent_keeps_relative_updates():
+    jobs = [
+        job("1 Jun 2025", "Kemarin"),
+        job("2 hari yang lalu"),
+        job("1 Jan 2099"),
+        job("5 Mar 2025"),
+    ]
+    kept = list(take_recent(jobs, since=date(2025, 6, 7)))
+    assert kept == jobs[:3]
+
+
+def test_take_recent_stops_after_a_window_of_misses():
+    pulled = []
+
+    def jobs():
+        for i in range(100):
+            pulled.append(i)
+            yield job("5 Mar 2025" if i >= 2 else "Kemarin")
+
+    kept = list(take_recent(jobs(), since=date(2025, 6, 1), window=20))
+    assert len(kept) == 2
+    assert len(pulled) == 22
+
+
+def test_take_recent_limit():
+    pulled = []
+
+    def jobs():
+        for i in range(100):
+            pulled.append(i)
+            yield job("Kemarin")
+
+    assert len(list(take_recent(jobs(), limit=5))) == 5
+    assert len(pulled) == 5
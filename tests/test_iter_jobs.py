@@ -0,0 +1,144 @@
+from api_client import JobStreetApiClient
+from scraper import PAGE_SIZE, JobStreetScraper
+from datetime import date
+import pytest
+
+OLD, NEW = "5 Mar 2025", "8 Jun 2025"
+
+
+def record(i, updated_at):
+    return {
+        "id": i,
+        "data_retrieved_at": "10-06-2025 09:30:00",
+        "application_status": [{"status": "Dilamar", "updated_at": updated_at}],
+    }
+
+
+@pytest.fixture
+def scraper(fake_scraper, monkeypatch):
+    monkeypatch.setattr(JobStreetScraper, "_login_and_navigate", lambda self: True)
+    fake_scraper.pulled = []
+
+    def iter_pages(self):
+        # five pages, only the first three records are recent
+        for i in range(5 * PAGE_SIZE):
+            self.pulled.append(i)
+            yield record(i, NEW if i < 3 else OLD)
+
+    monkeypatch.setattr(JobStreetScraper, "_iter_pages", iter_pages)
+    return fake_scraper
+
+
+def test_scraper_stops_at_limit(scraper):
+    jobs = list(scraper.iter_jobs(limit=5))
+    assert [job["id"] for job in jobs] == [0, 1, 2, 3, 4]
+    assert len(scraper.pulled) == 5
+
+
+def test_scraper_stops_a_page_after_the_last_recent_job(scraper):
+    jobs = list(scraper.iter_jobs(since=date(2025, 6, 1)))
+    assert [job["id"] for job in jobs] == [0, 1, 2]
+    assert len(scraper.pulled) == 3 + PAGE_SIZE
+
+
+def test_scraper_stops_when_the_consumer_does(scraper):
+    jobs = scraper.iter_jobs()
+    next(jobs)
+    jobs.close()
+    assert len(scraper.pulled) == 1
+
+
+def test_profile_template_saved_after_a_finished_run(scraper):
+    profiles = scraper.profiles
+    list(scraper.iter_jobs(limit=5))
+    scraper.close_browser()
+    assert profiles.saved == profiles.released == ["profiles/chrome-1"]
+    assert scraper.drivers[0].quit_called
+
+
+def test_profile_template_not_saved_after_a_failed_run(scraper, monkeypatch):
+    def broken_pages(self):
+        yield record(0, NEW)
+        raise RuntimeError("session expired")
+
+    monkeypatch.setattr(JobStreetScraper, "_iter_pages", broken_pages)
+    profiles = scraper.profiles
+    with pytest.raises(RuntimeError):
+        list(scraper.iter_jobs())
+    scraper.close_browser()
+    assert profiles.saved == []
+    assert profiles.released == ["profiles/chrome-1"]
+
+
+def node(i, timestamp):
+    return {
+        "job": {"id": str(i), "title": f"Job {i}"},
+        "events": [{"label": "Applied", "timestamp": {"dateTimeUtc": timestamp}}],
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = JobStreetApiClient([], page_size=10)
+    client.requests = []
+
+    def post(payload):
+        client.requests.append(payload)
+        start = len(client.requests) * 10 - 10
+        edges = [
+            {
+                "node": node(
+                    i, "2025-06-08T02:00:00Z" if i < 12 else "2025-03-05T02:00:00Z"
+                )
+            }
+            for i in range(start, start + 10)
+        ]
+        page_info = {"hasNextPage": True, "endCursor": str(start + 10)}
+        return {"viewer": {"appliedJobs": {"edges": edges, "pageInfo": page_info}}}
+
+    monkeypatch.setattr(client, "_post", post)
+    return client
+
+
+def test_api_stops_at_limit(client):
+    assert len(list(client.iter_jobs(limit=15))) == 15
+    assert len(client.requests) == 2
+
+
+def test_api_stops_a_page_after_the_last_recent_job(client):
+    jobs = list(client.iter_jobs(since=date(2025, 6, 1)))
+    assert len(jobs) == 12
+    # 12 recent jobs, then a page size of misses ends it in the third page
+    assert len(client.requests) == 3
+
+
+def test_scrape_all_jobs_reports_a_failed_run(scraper, monkeypatch):
+    def broken_pages(self):
+        yield record(0, NEW)
+        raise RuntimeError("session expired")
+
+    monkeypatch.setattr(JobStreetScraper, "_iter_pages", broken_pages)
+    jobs = scraper.scrape_all_jobs()
+    assert jobs["completed"] is False
+    assert jobs["error"] == "session expired"
+    # the records scraped before the failure are still returned
+    assert [job["id"] for job in jobs["jobs_data"]] == [1]
+
+
+def test_scrape_all_jobs_reports_a_finished_run(scraper):
+    jobs = scraper.scrape_all_jobs(limit=3)
+    assert jobs["completed"] is True
+    assert jobs["error"] is None
+    assert jobs["total_jobs"] == 3
+
+
+def test_failed_login_is_a_failed_run(scraper, monkeypatch):
+    monkeypatch.setattr(JobStreetScraper, "_login_and_navigate", lambda self: False)
+    jobs = scraper.scrape_all_jobs()
+    assert jobs["completed"] is False
+    assert jobs["error"] == "Could not log in to JobStreet"
+    assert scraper.pulled == []
+    # a profile that never logged in does not become the template
+    scraper.close_browser()
+    assert scraper.profiles.saved == []
+    assert scraper.profiles.released == ["profiles/chrome-1"]
@@ -0,0 +1,72 @@
+from jobstate import extra_info_from_job, job_from_html, job_from_script, label
+from pathlib import Path
+import json
+
+FIXTURES = Path(__file__).parent / "fixtures"
+DETAIL = (FIXTURES / "job_detail.html").read_text(encoding="utf-8")
+DETAIL_NO_STATE = (FIXTURES / "job_detail_no_state.html").read_text(encoding="utf-8")
+
+
+def test_job_from_html_with_undefined_values():
+    # the saved page leaves `undefined` in the store, which JSON rejects
+    assert "undefined" in DETAIL
+    job = job_from_html(DETAIL)
+    assert job["id"] == "81234567"
+    assert job["title"] == "Data Analyst"
+    assert job["salary"] is None and job["tracking"] is None
+
+
+def test_job_from_html_keeps_undefined_in_strings():
+    html = (
+        '<script>window.SEEK_REDUX_DATA = {"jobdetails":{"result":{"job":'
+        '{"title":"undefined behaviour","salary":undefined,"tags":[undefined]}}}};'
+        "</script>"
+    )
+    assert job_from_html(html) == {
+        "title": "undefined behaviour",
+        "salary": None,
+        "tags": [None],
+    }
+
+
+def test_job_from_html_without_a_state():
+    assert job_from_html(DETAIL_NO_STATE) is None
+    assert job_from_html(None) is None
+    assert job_from_html("<script>window.SEEK_REDUX_DATA = {broken</script>") is None
+    # a state without job details, e.g. an expired listing
+    assert job_from_html('window.SEEK_REDUX_DATA = {"jobdetails":{}};') is None
+
+
+def test_job_from_script():
+    job = {"id": "81234567", "workTypes": {"label": "Full time"}}
+    assert job_from_script(json.dumps(job)) == job
+    assert job_from_script(None) is None
+    assert job_from_script("not json") is None
+    assert job_from_script("[1, 2]") is None
+
+
+def test_extra_info_from_job():
+    assert extra_info_from_job(job_from_html(DETAIL)) == {
+        "job_classification": "Information & Communication Technology, "
+        "Data Analysis",
+        "job_type": "Full time",
+        "job_posted_date": "03-03-2025",
+        "job_listed_at": "2025-03-03T04:15:00+00:00",
+    }
+
+
+def test_extra_info_from_a_sparse_job():
+    assert extra_info_from_job({"listedAt": {"dateTimeUtc": "yesterday"}}) == {
+        "job_classification": "N/A",
+        "job_type": "N/A",
+        "job_posted_date": "N/A",
+        "job_listed_at": "N/A",
+    }
+
+
+def test_label():
+    assert label({"label": "Full time"}) == "Full time"
+    assert label({"name": "Jakarta"}) == "Jakarta"
+    assert label([{"label": "A"}, {}, "B", {"label": "C"}]) == "A, C"
+    assert label([]) == "N/A"
+    assert label(None) == "N/A"
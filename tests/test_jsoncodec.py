@@ -0,0 +1,46 @@
+import jsoncodec
+import pytest
+import json
+import io
+
+# the shapes a record holds, floats never reach the output (salaries are ints)
+RECORDS = [
+    {
+        "id": 1,
+        "job_title": "Staf Administrasi – Gudang ✓",
+        "company_name": 'PT "Maju" \\ Jaya\nTbk',
+        "total_applicants": 12345678901234567890,
+        "is_expired": False,
+        "salary_min": None,
+        "application_status": [
+            {"status": "Dilamar di JobStreet", "updated_at": "5 Mar 2025"},
+            {"status": "Dilihat oleh perusahaan", "updated_at": "Kemarin"},
+        ],
+        "tags": [],
+        "extra": {},
+    },
+    {"id": 2, "job_title": "N/A", "application_status": [], "nested": {"a": [1, {}]}},
+]
+
+
+@pytest.mark.parametrize("backend", jsoncodec.BACKENDS)
+@pytest.mark.parametrize("records", [RECORDS, RECORDS[:1], []])
+def test_write_array_matches_json_dump(backend, records):
+    f = io.BytesIO()
+    assert jsoncodec.write_array(f, iter(records), backend=backend) == len(records)
+    expected = json.dumps(records, indent=2, ensure_ascii=False).encode("utf-8")
+    assert f.getvalue() == expected
+
+
+@pytest.mark.parametrize("backend", jsoncodec.BACKENDS)
+def test_compact_array_and_lines_parse_back(backend):
+    f = io.BytesIO()
+    jsoncodec.write_array(f, RECORDS, indent=False, backend=backend)
+    assert json.loads(f.getvalue()) == RECORDS
+    # one record per line between the brackets
+    assert len(f.getvalue().splitlines()) == len(RECORDS) + 2
+
+    f = io.BytesIO()
+    assert jsoncodec.write_lines(f, RECORDS, backend=backend) == len(RECORDS)
+    lines = f.getvalue().decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
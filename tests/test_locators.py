@@ -0,0 +1,93 @@
+from locators import (
+    DEFAULT_LOCALE,
+    LOCALES,
+    MANY,
+    ONE,
+    OPTIONAL,
+    SELECTORS,
+    SITE_KEYS,
+    count_mismatch,
+    get_labels,
+    get_locators,
+    site_settings,
+)
+from pathlib import Path
+import configs
+import pytest
+
+DRAWER = (Path(__file__).parent / "fixtures" / "drawer.html").read_text(
+    encoding="utf-8"
+)
+
+
+@pytest.mark.parametrize("site", sorted(LOCALES))
+def test_every_locale_defines_the_same_keys(site):
+    default = LOCALES[DEFAULT_LOCALE]
+    assert LOCALES[site].keys() == default.keys()
+    assert set(SITE_KEYS) | {"labels"} == default.keys()
+    assert get_labels(site).keys() == get_labels(DEFAULT_LOCALE).keys()
+    assert all(get_labels(site).values())
+
+
+@pytest.mark.parametrize("site", sorted(LOCALES))
+def test_every_locale_fills_every_selector(site):
+    locators = get_locators(site)
+    assert locators.keys() == SELECTORS.keys()
+    for name, locator in locators.items():
+        assert locator.name == name
+        assert "{" not in locator.value
+        assert locator.expect in (ONE, OPTIONAL, MANY)
+        assert locator.page in ("list", "card", "drawer", "detail")
+
+
+def test_labels_are_filled_in():
+    assert get_locators("id")["applied_for"].value == (
+        ".//span[contains(text(), 'Lamaran untuk')]"
+    )
+    assert "Applied for" in get_locators("sg")["applied_for"].value
+
+
+def test_site_settings():
+    settings = site_settings("my")
+    assert settings == {
+        "site": "my",
+        "base_url": "https://my.jobstreet.com/my-activity/applied-jobs",
+        "api_url": "https://my.jobstreet.com/graphql",
+        "job_url": "https://my.jobstreet.com/job",
+        "country": "MY",
+        "locale": "en-MY",
+    }
+    assert site_settings()["site"] == DEFAULT_LOCALE
+    with pytest.raises(ValueError, match="Unsupported locale xx"):
+        site_settings("xx")
+
+
+def test_configure_locale(monkeypatch):
+    monkeypatch.setattr(configs, "configurations", dict(configs.configurations))
+    configured = configs.configure_locale("sg")
+    assert configured is configs.configurations
+    assert configured["base_url"] == site_settings("sg")["base_url"]
+    # the other settings are kept
+    assert configured["default_wait"] == 20
+
+
+def test_count_mismatch():
+    locators = get_locators()
+    assert count_mismatch(locators["drawer"], 1) is None
+    assert count_mismatch(locators["drawer"], 2) == "expected 1 match, got 2"
+    assert count_mismatch(locators["applicants"], 0) is None
+    assert count_mismatch(locators["applicants"], 2) is not None
+    assert count_mismatch(locators["job_cards"], 30) is None
+    assert count_mismatch(locators["job_cards"], 0) is not None
+
+
+def test_drawer_locators_match_the_saved_drawer():
+    etree = pytest.importorskip("lxml.etree")
+    from locators import _compile
+
+    document = etree.fromstring(DRAWER, etree.HTMLParser())
+    for locator in get_locators("id").values():
+        matcher = _compile(locator) if locator.page == "drawer" else None
+        if matcher is None:
+            continue
+        assert count_mismatch(locator, len(matcher(document))) is None, locator.name
@@ -0,0 +1,32 @@
+from configs import init_logging
+import logging
+import atexit
+import json
+
+
+def test_exceptions_reach_both_logs(tmp_path):
+    listener = init_logging(log_dir=str(tmp_path), log_json=True)
+    atexit.unregister(listener.stop)
+    logger = logging.getLogger("test_logging")
+    try:
+        {}["job_url"]
+    except KeyError:
+        logger.exception("Failed to scrape job %s", 7, extra={"job_id": 7})
+    logger.info("Done")
+    listener.stop()
+    logging.basicConfig(handlers=[logging.NullHandler()], force=True)
+
+    text = (tmp_path / "jobstreet_scraper.log").read_text(encoding="utf-8")
+    assert "[ERROR] test_logging - Failed to scrape job 7\nTraceback" in text
+    assert "KeyError: 'job_url'" in text
+
+    failed, done = [
+        json.loads(line)
+        for line in (tmp_path / "jobstreet_scraper.jsonl").read_text().splitlines()
+    ]
+    # the traceback is its own key, not part of the message
+    assert failed["message"] == "Failed to scrape job 7"
+    assert failed["job_id"] == 7
+    assert failed["exc_info"].startswith("Traceback")
+    assert "KeyError: 'job_url'" in failed["exc_info"]
+    assert "exc_info" not in done
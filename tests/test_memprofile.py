@@ -0,0 +1,76 @@
+from memprofile import CHECK_EVERY, MB, SPILL_BATCH, RecordSpool
+from benchmarks import _iter_synthetic_jobs
+from ordering import order_jobs
+import memprofile
+import exporter
+import pytest
+
+RECORDS = 12_000
+
+
+@pytest.fixture
+def rss_reads(monkeypatch):
+    reads = []
+    read_rss = memprofile.read_rss
+
+    def counted(pid="self"):
+        reads.append(pid)
+        return read_rss(pid)
+
+    if read_rss()[0] is None:
+        pytest.skip("needs /proc to read the resident size")
+    monkeypatch.setattr(memprofile, "read_rss", counted)
+    return reads
+
+
+def collect(spool, count):
+    spills = []
+    spill = spool.spill
+
+    def counted(records):
+        spills.append(len(records))
+        spill(records)
+
+    spool.spill = counted
+    jobs_data = []
+    for job in _iter_synthetic_jobs(count, description_kb=1):
+        jobs_data.append(job)
+        spool.add(jobs_data)
+    return jobs_data, spills
+
+
+def test_under_the_cap_nothing_is_spilled(tmp_path, rss_reads):
+    spool = RecordSpool(1024 * 1024, directory=str(tmp_path))
+    jobs_data, spills = collect(spool, 1000)
+    assert len(jobs_data) == 1000
+    assert spills == []
+    assert len(rss_reads) == 1000 // CHECK_EVERY
+
+
+def test_spool_over_the_cap_in_batches(tmp_path, monkeypatch, rss_reads):
+    # a cap below the current resident size starts spooling at the first check
+    cap_mb = memprofile.read_rss()[0] // MB // 2
+    rss_reads.clear()
+    spool = RecordSpool(cap_mb, directory=str(tmp_path))
+    jobs_data, spills = collect(spool, RECORDS)
+
+    # the resident size is read once, then records move a batch at a time
+    assert len(rss_reads) == 1
+    assert spills == [CHECK_EVERY] + [SPILL_BATCH] * (
+        (RECORDS - CHECK_EVERY) // SPILL_BATCH
+    )
+    assert len(jobs_data) == (RECORDS - CHECK_EVERY) % SPILL_BATCH
+
+    ordered = spool.ordered(jobs_data, descending=True)
+    assert len(ordered) == RECORDS
+    expected = order_jobs(
+        list(_iter_synthetic_jobs(RECORDS, description_kb=1)), descending=True
+    )
+    assert list(ordered) == expected
+
+    monkeypatch.setattr(exporter, "EXPORT_DIR", str(tmp_path))
+    path = exporter._export_to_jsonl(ordered, "spooled")
+    with open(path, encoding="utf-8") as f:
+        assert sum(1 for _ in f) == RECORDS
+    spool.cleanup()
+    assert spool.path is None
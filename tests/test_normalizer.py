@@ -0,0 +1,119 @@
+from normalizer import Status, denormalize_job, normalize_job, parse_date, parse_salary
+from datetime import date
+import pytest
+
+TODAY = date(2025, 6, 10)
+
+
+@pytest.mark.parametrize(
+    "text, site, expected",
+    [
+        (
+            "Rp 8.000.000 – Rp 10.000.000 per month",
+            None,
+            (8_000_000, 10_000_000, "IDR"),
+        ),
+        ("RM 5,500 - RM 7,000", None, (5_500, 7_000, "MYR")),
+        ("S$ 4k - 6k", None, (4_000, 6_000, "SGD")),
+        ("Rp 8,5 jt - 10 jt", None, (8_500_000, 10_000_000, "IDR")),
+        ("IDR 1.234,5 juta", None, (1_234_500_000, 1_234_500_000, "IDR")),
+        ("1,5k", None, (1_500, 1_500, None)),
+        # "$" is the currency of the site the job was listed on
+        ("$5,000 - $6,500 per month", "sg", (5_000, 6_500, "SGD")),
+        ("$5,000 - $6,500 per month", "my", (5_000, 6_500, "MYR")),
+        ("$5,000", None, (5_000, 5_000, None)),
+        ("Up to Rp 12.000.000", None, (None, 12_000_000, "IDR")),
+        ("Hingga 15 juta", None, (None, 15_000_000, None)),
+        ("Competitive", None, (None, None, None)),
+        ("N/A", None, (None, None, None)),
+        (None, None, (None, None, None)),
+    ],
+)
+def test_parse_salary(text, site, expected):
+    assert parse_salary(text, site) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("5 Mei 2025", "2025-05-05"),
+        ("5 Mar. 2025", "2025-03-05"),
+        ("05-03-2025", "2025-03-05"),
+        ("Hari ini", "2025-06-10"),
+        ("Just now", "2025-06-10"),
+        ("Kemarin", "2025-06-09"),
+        ("2 hari yang lalu", "2025-06-08"),
+        ("3d ago", "2025-06-07"),
+        ("5h ago", "2025-06-10"),
+        ("2w ago", "2025-05-27"),
+        ("Posted 3 minggu yang lalu", "2025-05-20"),
+        ("1 bulan yang lalu", "2025-05-11"),
+        # open ended and unknown texts are not guessed
+        ("30+ days ago", None),
+        ("31 Feb 2025", None),
+        ("whenever", None),
+        ("N/A", None),
+        ("", None),
+    ],
+)
+def test_parse_date(text, expected):
+    assert parse_date(text, TODAY) == expected
+
+
+def test_parse_date_defaults_to_today():
+    assert parse_date("Hari ini") == date.today().isoformat()
+
+
+def job(**fields):
+    return {
+        "id": 1,
+        "data_retrieved_at": "10-06-2025 09:30:00",
+        "job_url": "https://sg.jobstreet.com/job/81234567",
+        "salary_range": "$5,000 - $6,500 per month",
+        "job_posted_date": "3d ago",
+        "job_listed_at": "N/A",
+        "total_applicants": 37,
+        "application_status": [
+            {"status": "Dilamar di JobStreet", "updated_at": "5 Mei 2025"},
+            {"status": "Dilihat oleh perusahaan", "updated_at": "Kemarin"},
+        ],
+        **fields,
+    }
+
+
+def test_normalize_job():
+    normalized = normalize_job(job())
+    assert normalized["data_retrieved_at"] == "2025-06-10T09:30:00"
+    assert normalized["salary_min"] == 5_000
+    assert normalized["currency"] == "SGD"
+    assert normalized["posted_on"] == "2025-06-07"
+    assert normalized["applied_on"] == "2025-05-05"
+    # relative dates count from the day the record was scraped
+    assert normalized["updated_on"] == "2025-06-09"
+    assert normalized["status_code"] == Status.VIEWED
+    assert [step["status_code"] for step in normalized["application_status"]] == [
+        Status.APPLIED,
+        Status.VIEWED,
+    ]
+
+
+def test_normalize_job_prefers_the_listing_time():
+    normalized = normalize_job(job(job_listed_at="2025-06-06T23:15:00+00:00"))
+    assert normalized["posted_on"] == "2025-06-06"
+
+
+def test_total_applicants():
+    assert normalize_job(job())["total_applicants"] == 37
+    assert normalize_job(job(total_applicants="N/A"))["total_applicants"] is None
+    assert normalize_job(job(total_applicants=0))["total_applicants"] == 0
+    # the scraped text comes back on the way to a refresh
+    assert denormalize_job(normalize_job(job(total_applicants="N/A"))) == job(
+        total_applicants="N/A"
+    )
+    assert denormalize_job(normalize_job(job())) == job()
+
+
+def test_record_without_status():
+    normalized = normalize_job(job(application_status=[]))
+    assert normalized["status_code"] == Status.UNKNOWN
+    assert normalized["applied_on"] is normalized["updated_on"] is None
@@ -0,0 +1,59 @@
+from ordering import SpooledJobs, iter_lines_reversed, order_jobs
+import ordering
+import json
+import pytest
+
+LINES = ["first", "", "second line", "kedua ✓ dilamar", "x" * 40, "last"]
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 7, 64 * 1024])
+@pytest.mark.parametrize("ending", ["", "\n", "\n\n"])
+def test_iter_lines_reversed(tmp_path, monkeypatch, block_size, ending):
+    # small blocks split lines and multi-byte characters between reads
+    monkeypatch.setattr(ordering, "READ_BLOCK_SIZE", block_size)
+    path = tmp_path / "lines.txt"
+    path.write_text("\n".join(LINES) + ending, encoding="utf-8")
+    expected = [line for line in reversed(LINES) if line]
+    assert list(iter_lines_reversed(str(path))) == expected
+
+
+def test_iter_lines_reversed_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("", encoding="utf-8")
+    assert list(iter_lines_reversed(str(path))) == []
+
+
+def jobs():
+    return [
+        {"id": "x", "job_title": f"Lowongan {i} ✓", "company_name": f"PT {i}"}
+        for i in range(25)
+    ]
+
+
+def spool(tmp_path, records, descending):
+    path = tmp_path / "spool.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return SpooledJobs(str(path), len(records), descending)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_spooled_jobs_match_order_jobs(tmp_path, monkeypatch, descending):
+    monkeypatch.setattr(ordering, "READ_BLOCK_SIZE", 100)
+    spooled = spool(tmp_path, jobs(), descending)
+    expected = order_jobs(jobs(), descending=descending)
+    assert len(spooled) == len(expected)
+    assert list(spooled) == expected
+    # every pass reads the file again
+    assert list(spooled) == expected
+
+
+def test_spooled_jobs_map(tmp_path):
+    spooled = spool(tmp_path, jobs(), True)
+    mapped = spooled.map(lambda job: {**job, "seen": 1}).map(
+        lambda job: {**job, "seen": job["seen"] + 1}
+    )
+    expected = [{**job, "seen": 2} for job in order_jobs(jobs(), descending=True)]
+    assert list(mapped) == expected
+    assert list(spooled) == order_jobs(jobs(), descending=True)
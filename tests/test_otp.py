@@ -0,0 +1,164 @@
+from otp import ImapProvider, MailboxProvider, OtpProvider
+from email.message import EmailMessage
+from email.utils import formatdate
+from datetime import datetime
+import mailbox
+import imaplib
+import pytest
+
+SINCE = datetime(2025, 6, 10, 9, 30).timestamp()
+
+
+def email(code, minutes=1, sender="JobStreet <noreply@jobstreet.com>"):
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = "user@example.com"
+    message["Subject"] = "Your JobStreet verification code"
+    message["Date"] = formatdate(SINCE + minutes * 60)
+    message.set_content(f"Use {code} to sign in. It expires in 10 minutes.")
+    message.add_alternative(
+        f'<p style="color:#123456">Use <b>{code}</b> to sign in.</p>', subtype="html"
+    )
+    return message
+
+
+MESSAGES = [
+    email("111111", minutes=-60),  # sent before the login was requested
+    email("222222", sender="Newsletter <news@example.com>"),
+    email("333333", minutes=1),
+    email("444444", minutes=2),
+]
+
+
+class FakeImap:
+    """imaplib.IMAP4 over a list of messages, recording the commands
+
+    Messages appended to `messages` are delivered, their UID is their
+    position. FROM keys match like a server, a substring of the header.
+    """
+
+    error = imaplib.IMAP4.error
+    instances = []
+    messages = []
+
+    def __init__(self, host, port, timeout=None):
+        self.host, self.port = host, port
+        self.commands = []
+        FakeImap.instances.append(self)
+
+    def login(self, user, password):
+        self.commands.append(("login", user, password))
+        return "OK", [b"Logged in"]
+
+    def select(self, folder, readonly=False):
+        self.commands.append(("select", folder, readonly))
+        return "OK", [str(len(self.messages)).encode()]
+
+    def uid(self, command, *args):
+        self.commands.append((command, *args))
+        if command == "FETCH":
+            uid, parts = args
+            message = self.messages[int(uid) - 1]
+            return "OK", [(uid + b" (UID BODY[] {1})", message.as_bytes()), b")"]
+        markers = [args[i + 1] for i, key in enumerate(args) if key == "FROM"]
+        uids = [
+            str(uid)
+            for uid, message in enumerate(self.messages, 1)
+            if any(marker in message["From"].lower() for marker in markers)
+        ]
+        return "OK", [" ".join(uids).encode()]
+
+    def logout(self):
+        self.commands.append(("logout",))
+
+
+@pytest.fixture
+def fake_imap(monkeypatch):
+    FakeImap.instances = []
+    FakeImap.messages = list(MESSAGES)
+    monkeypatch.setattr(imaplib, "IMAP4", FakeImap)
+    return FakeImap
+
+
+def test_provider_is_abstract():
+    with pytest.raises(TypeError):
+        OtpProvider()
+
+
+def test_imap_searches_since_the_day_before_and_peeks(fake_imap):
+    provider = ImapProvider(
+        "localhost", "user", "secret", ssl=False, timeout=0, interval=0
+    )
+    assert provider.get_code(since=SINCE) == "444444"
+    (connection,) = fake_imap.instances
+    assert connection.port == imaplib.IMAP4_PORT
+    assert ("login", "user", "secret") in connection.commands
+    assert ("select", "INBOX", True) in connection.commands
+    assert (
+        "SEARCH",
+        "SINCE",
+        "09-Jun-2025",
+        "OR",
+        "FROM",
+        "jobstreet",
+        "FROM",
+        "seek",
+    ) in connection.commands
+    fetches = [command for command in connection.commands if command[0] == "FETCH"]
+    # the newsletter does not match the search and is never downloaded
+    assert [uid for _, uid, _ in fetches] == [b"1", b"3", b"4"]
+    assert all(parts == "(BODY.PEEK[])" for _, _, parts in fetches)
+    provider.close()
+    assert connection.commands[-1] == ("logout",)
+
+
+def test_imap_skips_used_codes(fake_imap):
+    provider = ImapProvider(
+        "localhost", "user", "secret", ssl=False, timeout=0, interval=0
+    )
+    assert provider.get_code(since=SINCE) == "444444"
+    assert provider.get_code(since=SINCE) == "333333"
+    assert provider.get_code(since=SINCE) is None
+    # the connection is kept between polls
+    assert len(fake_imap.instances) == 1
+
+
+def test_imap_fetches_each_message_once(fake_imap):
+    provider = ImapProvider(
+        "localhost", "user", "secret", ssl=False, timeout=0, interval=0
+    )
+    assert provider.get_code(since=SINCE) == "444444"
+    assert provider.get_code(since=SINCE) == "333333"
+    fake_imap.messages.append(email("555555", minutes=3))
+    assert provider.get_code(since=SINCE) == "555555"
+    (connection,) = fake_imap.instances
+    fetched = [command[1] for command in connection.commands if command[0] == "FETCH"]
+    assert fetched == [b"1", b"3", b"4", b"5"]
+
+
+def test_maildir(tmp_path):
+    box = mailbox.Maildir(str(tmp_path / "Maildir"), create=True)
+    # delivery order is not the order the codes were sent in
+    for message in reversed(MESSAGES):
+        box.add(message)
+    box.close()
+    provider = MailboxProvider(str(tmp_path / "Maildir"), timeout=0, interval=0)
+    assert provider.get_code(since=SINCE) == "444444"
+    assert provider.get_code(since=SINCE) == "333333"
+    assert provider.get_code(since=SINCE) is None
+
+
+def test_mbox(tmp_path):
+    box = mailbox.mbox(str(tmp_path / "inbox.mbox"))
+    for message in MESSAGES:
+        box.add(message)
+    box.close()
+    provider = MailboxProvider(str(tmp_path / "inbox.mbox"), timeout=0, interval=0)
+    assert provider.get_code(since=SINCE) == "444444"
+    assert provider.get_code(since=SINCE) == "333333"
+    assert provider.get_code(since=SINCE) is None
+
+
+def test_missing_mailbox_times_out(tmp_path):
+    provider = MailboxProvider(str(tmp_path / "missing.mbox"), timeout=0, interval=0)
+    assert provider.get_code(since=SINCE) is None
@@ -0,0 +1,77 @@
+from profiler import CommandProfiler
+
+# stands in for scraper.py, profiled frames are found by module name
+SOURCE = """
+class Scraper:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def _find_element(self, command):
+        return self.driver.execute(command)
+
+    def _locate(self, name):
+        return self._find_element(name)
+
+    def _wait_loaded(self, condition):
+        return condition(self)
+
+    def get_cards(self):
+        return self._locate("findElements")
+
+    def open_page(self):
+        return self._wait_loaded(lambda s: s._find_element("get"))
+
+    def get_title(self):
+        return (lambda: self._find_element("getTitle"))()
+
+    def get_rows(self):
+        return [self._find_element("findElements") for _ in range(2)]
+
+    def get_ids(self):
+        return list(self._find_element("getId") for _ in range(2))
+
+    def sort_cards(self, cards):
+        def get_index(card):
+            return self._find_element("getAttribute") or card
+
+        return sorted(cards, key=get_index)
+"""
+
+
+class Executor:
+    def execute(self, command, params):
+        return None
+
+
+class Driver:
+    def __init__(self):
+        self.command_executor = Executor()
+
+    def execute(self, command):
+        return self.command_executor.execute(command, {})
+
+
+def profiled_scraper():
+    namespace = {"__name__": "fake_scraper"}
+    exec(compile(SOURCE, "fake_scraper.py", "exec"), namespace)
+    profiler = CommandProfiler(source_module="fake_scraper")
+    return profiler, namespace["Scraper"](profiler.install(Driver()))
+
+
+def test_caller_skips_helpers_and_nested_functions():
+    profiler, scraper = profiled_scraper()
+    scraper.get_title()
+    scraper.get_rows()
+    scraper.get_ids()
+    scraper.get_cards()
+    scraper.open_page()
+    scraper.sort_cards([1, 2, 3])
+    calls = {key: stats["count"] for key, stats in profiler.calls.items()}
+    assert calls == {
+        ("get_title", "getTitle"): 1,
+        ("get_rows", "findElements"): 2,
+        ("get_ids", "getId"): 2,
+        ("get_cards", "findElements"): 1,
+        ("open_page", "get"): 1,
+        ("sort_cards", "getAttribute"): 3,
+    }
@@ -0,0 +1,34 @@
+from progress import PhaseStats, ScrapeProgress
+from rich.console import Console
+import threading
+import io
+
+
+def test_snapshot():
+    stats = PhaseStats()
+    stats.record("drawer", 1.0)
+    stats.record("drawer", 3.0)
+    stats.error("detail")
+    assert stats.snapshot() == [("drawer", 2, 2.0, 3.0, 0), ("detail", 0, 0.0, 0.0, 1)]
+    assert stats.total_errors() == 1
+
+
+def test_render_while_phases_are_added():
+    console = Console(file=io.StringIO(), width=120)
+    progress = ScrapeProgress(console=console)
+    done = threading.Event()
+
+    def scrape():
+        # every new phase inserts keys while the table is being built
+        for i in range(20000):
+            progress.stats.record(f"phase {i % 500}", 0.01)
+            progress.error(f"phase {i % 700}")
+        done.set()
+
+    thread = threading.Thread(target=scrape)
+    thread.start()
+    while not done.is_set():
+        console.print(progress)
+    thread.join()
+    console.print(progress)
+    assert "phase 499" in console.file.getvalue()
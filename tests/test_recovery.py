@@ -0,0 +1,122 @@
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.keys import Keys
+from scraper import JobStreetScraper
+from conftest import FakeElement
+import pytest
+
+DRAWER = "[role='dialog']"
+CLOSE = "[aria-label='Close']"
+
+
+def indices(cards):
+    return [card.get_attribute("data-automation") for card in cards]
+
+
+def test_cards_are_sorted_by_their_index(fake_scraper):
+    cards = fake_scraper._find_job_cards()
+    assert indices(cards) == ["job-item-1", "job-item-2", "job-item-3"]
+
+
+def test_idle_page_is_left_alone(fake_scraper):
+    driver = fake_scraper.driver
+    cards = fake_scraper._find_job_cards()
+    assert fake_scraper._restore_page_state("results", {"results"}, cards) == (
+        cards,
+        False,
+    )
+    assert driver.closed == driver.clicked == []
+    assert not fake_scraper.recoveries
+
+
+def test_stray_tab_and_drawer_are_closed(fake_scraper):
+    driver = fake_scraper.driver
+    cards = fake_scraper._find_job_cards()
+    driver.open_tab("prefetch")
+    driver.open_tab("detail")
+    close = FakeElement(driver, index=99)
+    driver.elements.update({DRAWER: [FakeElement(driver)], CLOSE: [close]})
+    fake_scraper.job_state = "detail"
+
+    restored, stale = fake_scraper._restore_page_state(
+        "results", {"results", "prefetch"}, cards
+    )
+    assert (restored, stale) == (cards, False)
+    # the prefetched page is kept, the detail tab is not
+    assert driver.closed == ["detail"]
+    assert driver.window_handles == ["results", "prefetch"]
+    assert driver.current_window_handle == "results"
+    assert driver.clicked == [99]
+    assert fake_scraper.recoveries == {"tab": 1, "drawer": 1}
+    assert fake_scraper.job_state == "idle"
+
+
+def test_drawer_without_a_close_button_gets_escape(fake_scraper):
+    driver = fake_scraper.driver
+    cards = fake_scraper._find_job_cards()
+    driver.elements[DRAWER] = [FakeElement(driver)]
+    fake_scraper.job_state = "drawer"
+    fake_scraper._restore_page_state("results", {"results"}, cards)
+    assert driver.body.keys == [Keys.ESCAPE]
+    assert fake_scraper.recoveries == {"drawer": 1}
+
+
+def test_rerendered_cards_are_located_again(fake_scraper):
+    driver = fake_scraper.driver
+    cards = fake_scraper._find_job_cards()
+    driver.rerender()
+    fake_scraper.job_state = "drawer"
+    restored, stale = fake_scraper._restore_page_state("results", {"results"}, cards)
+    assert stale
+    assert indices(restored) == ["job-item-1", "job-item-2", "job-item-3"]
+    assert restored[0] is not cards[0]
+    assert fake_scraper.recoveries == {"cards": 1}
+
+
+def test_failed_repair_still_moves_on(fake_scraper, monkeypatch):
+    def broken(self, *args):
+        raise WebDriverException("no such window")
+
+    monkeypatch.setattr(JobStreetScraper, "_repair_page", broken)
+    cards = fake_scraper._find_job_cards()
+    fake_scraper.job_state = "detail"
+    restored, stale = fake_scraper._restore_page_state("results", {"results"}, cards)
+    assert (restored, stale) == (cards, False)
+    assert fake_scraper.job_state == "idle"
+    assert fake_scraper.progress.stats.total_errors() == 1
+
+
+@pytest.fixture
+def rerendering(fake_scraper, monkeypatch):
+    """Cards fail and re-render the page as often as `rerenders` says"""
+    fake_scraper.attempts = []
+    fake_scraper.rerenders = {}
+
+    def scrape_card(self, i, card, job_info):
+        card.is_enabled()
+        self.attempts.append(card.index)
+        if self.rerenders.get(card.index):
+            self.rerenders[card.index] -= 1
+            self.job_state = "drawer"
+            self.driver.rerender()
+            return None
+        return {**job_info, "card": card.index}
+
+    monkeypatch.setattr(JobStreetScraper, "_scrape_card", scrape_card)
+    return fake_scraper
+
+
+def test_card_failing_on_a_rerender_is_retried(rerendering):
+    rerendering.rerenders = {2: 1}
+    jobs = list(rerendering._iter_page(1, 0))
+    # the cards before it are not scraped again on the new elements
+    assert rerendering.attempts == [1, 2, 2, 3]
+    assert [(job["id"], job["card"]) for job in jobs] == [(1, 1), (2, 2), (3, 3)]
+    assert rerendering.recoveries == {"cards": 1}
+
+
+def test_card_failing_twice_is_skipped(rerendering):
+    rerendering.rerenders = {2: 2}
+    jobs = list(rerendering._iter_page(1, 0))
+    assert rerendering.attempts == [1, 2, 2, 3]
+    assert [(job["id"], job["card"]) for job in jobs] == [(1, 1), (2, 3)]
+    assert rerendering.recoveries == {"cards": 2}
@@ -0,0 +1,134 @@
+from refresh import SCRAPED_FIELDS, RefreshPolicy, tier_of
+from normalizer import normalize_job
+from datetime import date
+import json
+
+TODAY = date(2025, 6, 10)
+
+
+def record(title, company, *updated_at, expired=False, **extra):
+    fields = {field: "N/A" for field in SCRAPED_FIELDS}
+    return {
+        **fields,
+        "id": 7,
+        "data_retrieved_at": "09-06-2025 08:00:00",
+        "job_title": title,
+        "company_name": company,
+        "is_expired": expired,
+        "application_status": [
+            {"status": "Dilamar di JobStreet", "updated_at": text}
+            for text in updated_at
+        ],
+        **extra,
+    }
+
+
+def card(job):
+    return job["job_title"], f"{job['job_title']}\n{job['company_name']}\nJakarta"
+
+
+def test_tier_of_expired_is_cold():
+    assert tier_of(record("A", "B", "8 Jun 2025", expired=True), TODAY) == "cold"
+
+
+def test_tier_of_by_last_status_change():
+    assert tier_of(record("A", "B", "1 Jan 2025", "1 Jun 2025"), TODAY) == "hot"
+    assert tier_of(record("A", "B", "1 Jan 2025", "1 May 2025"), TODAY) == "warm"
+    assert tier_of(record("A", "B", "1 Jan 2025", "1 Feb 2025"), TODAY) == "cold"
+
+
+def test_tier_of_recent_application_is_hot():
+    assert tier_of(record("A", "B", "1 Jun 2025"), TODAY) == "hot"
+
+
+def test_tier_of_relative_status_is_hot():
+    # "Kemarin" is the day before the record was scraped, not unknown
+    assert tier_of(record("A", "B", "1 Jan 2025", "Kemarin"), TODAY) == "hot"
+    assert tier_of(record("A", "B", "2 hari yang lalu"), TODAY) == "hot"
+
+
+def test_tier_of_without_status_is_hot():
+    assert tier_of(record("A", "B"), TODAY) == "hot"
+
+
+def policy(previous, tmp_path, **kwargs):
+    state_path = str(tmp_path / "refresh_state.json")
+    return RefreshPolicy(previous, state_path=state_path, today=TODAY, **kwargs)
+
+
+def test_lookup_reuses_cold_records_until_due(tmp_path):
+    cold = record("Data Analyst", "PT Cold", "1 Jan 2025", "1 Feb 2025")
+    reused = 0
+    for run in range(10):
+        refresh = policy([cold], tmp_path)
+        assert refresh.run == run + 1
+        found = refresh.lookup(*card(cold))
+        if found:
+            reused += 1
+            assert "id" not in found
+            assert found["job_title"] == "Data Analyst"
+        refresh.save()
+    # cold records are scraped once every COLD_EVERY runs
+    assert reused == 9
+
+
+def test_lookup_scrapes_hot_new_and_changed_cards(tmp_path):
+    hot = record("Backend Developer", "PT Hot", "Kemarin")
+    cold = record("Data Analyst", "PT Cold", "1 Feb 2025", expired=True)
+    refresh = policy([hot, cold], tmp_path, cold_every=1000)
+    assert refresh.lookup(*card(hot)) is None
+    assert refresh.lookup("QA Engineer", "QA Engineer\nPT New") is None
+    refresh.save()
+
+    refresh = policy([hot, cold], tmp_path, cold_every=1000)
+    title, text = card(cold)
+    assert refresh.lookup(title, text + "\nViewed") is None
+    assert refresh.counts["changed"] == 1
+
+
+def test_lookup_full_refresh_and_missing_fields(tmp_path):
+    cold = record("Data Analyst", "PT Cold", "1 Feb 2025", expired=True)
+    assert policy([cold], tmp_path, full=True).lookup(*card(cold)) is None
+
+    partial = {key: value for key, value in cold.items() if key != "resume"}
+    refresh = policy([partial], tmp_path, cold_every=1000)
+    assert refresh.lookup(*card(partial)) is None
+    assert refresh.counts["incomplete"] == 1
+    refresh = policy([partial], tmp_path, cold_every=1000, fields=["id", "job_title"])
+    assert refresh.lookup(*card(partial)) is not None
+
+
+def test_lookup_drops_typed_columns(tmp_path):
+    cold = record(
+        "Data Analyst",
+        "PT Cold",
+        "1 Feb 2025",
+        expired=True,
+        salary_min=1,
+        status_code="applied",
+    )
+    cold["application_status"][0]["updated_on"] = "2025-02-01"
+    found = policy([cold], tmp_path, cold_every=1000).lookup(*card(cold))
+    assert "salary_min" not in found and "status_code" not in found
+    assert found["application_status"] == [
+        {"status": "Dilamar di JobStreet", "updated_at": "1 Feb 2025"}
+    ]
+
+
+def test_typed_previous_export(tmp_path):
+    # scraped 09-06, "Kemarin" is 08-06, months before the day it is refreshed
+    cold = record("Data Analyst", "PT Cold", "1 Jan 2025", "Kemarin")
+    today = date(2025, 9, 30)
+    assert tier_of(cold, today) == "cold"
+    path = tmp_path / "jobstreet_jobs_typed.json"
+    path.write_text(json.dumps([normalize_job(cold)]), encoding="utf-8")
+
+    refresh = RefreshPolicy.from_export(
+        str(path),
+        state_path=str(tmp_path / "refresh_state.json"),
+        cold_every=1000,
+        today=today,
+    )
+    found = refresh.lookup(*card(cold))
+    assert refresh.counts["cold reused"] == 1
+    assert found == {key: value for key, value in cold.items() if key != "id"}
@@ -0,0 +1,136 @@
+from throttle import (
+    BACKOFF_FACTOR,
+    CHALLENGE_COOLDOWN,
+    RATE_STEP,
+    AdaptiveThrottle,
+    is_challenge_page,
+)
+import throttle as throttle_module
+import pytest
+
+
+class FakeClock:
+    """time.monotonic and time.sleep, sleeping only moves the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(throttle_module, "time", clock)
+    return clock
+
+
+def test_success_raises_rate_and_window(clock):
+    throttle = AdaptiveThrottle(rate=1.0, max_rate=1.2, max_concurrency=3)
+    throttle.success()
+    assert throttle.rate == pytest.approx(1.0 + RATE_STEP)
+    assert throttle.window == pytest.approx(2.5)
+    for _ in range(20):
+        throttle.success()
+    assert throttle.rate == 1.2
+    assert throttle.window == 3
+
+
+def test_backoff_cuts_rate_and_window(clock):
+    throttle = AdaptiveThrottle(rate=2.0, min_rate=0.5)
+    throttle.backoff("page", "timeout")
+    assert throttle.rate == 2.0 * BACKOFF_FACTOR
+    assert throttle.window == 1.0
+    assert throttle.tokens == 0
+    throttle.backoff("page", "slow")
+    throttle.backoff("page", "slow")
+    assert throttle.rate == 0.5
+    assert throttle.backoffs == {"timeout": 1, "slow": 2}
+
+
+def test_acquire_waits_for_a_token(clock):
+    throttle = AdaptiveThrottle(rate=0.5, burst=2)
+    throttle.acquire()
+    throttle.acquire()
+    assert clock.slept == []
+    # the bucket is empty, one token takes 1 / rate seconds
+    throttle.acquire()
+    assert clock.slept == [2.0]
+    assert throttle.waited == 2.0
+
+
+def test_request_outcomes(clock):
+    throttle = AdaptiveThrottle(rate=1.0, slow_after=8.0)
+    with throttle.request("page"):
+        clock.now += 1
+    assert throttle.completed == 1
+    with throttle.request("page"):
+        clock.now += 9
+    with pytest.raises(RuntimeError):
+        with throttle.request("detail"):
+            raise RuntimeError("tab crashed")
+    assert throttle.backoffs == {"slow": 1, "error": 1}
+    assert throttle.in_flight == 0
+
+
+def test_challenge_cooldown_grows_and_resets(clock):
+    throttle = AdaptiveThrottle(rate=1.0)
+    with throttle.request("page") as request:
+        request.fail("challenge")
+    assert throttle.blocked_until == clock.now + CHALLENGE_COOLDOWN
+
+    start = clock.now
+    with throttle.request("page") as request:
+        request.fail("challenge")
+    # the second request waited out the cooldown, the next one is doubled
+    assert clock.now - start >= CHALLENGE_COOLDOWN
+    assert throttle.blocked_until == clock.now + 2 * CHALLENGE_COOLDOWN
+
+    clock.now = throttle.blocked_until
+    with throttle.request("page"):
+        pass
+    assert throttle.challenge_streak == 0
+
+
+def test_try_background(clock):
+    throttle = AdaptiveThrottle(rate=4.0, max_concurrency=3)
+    with throttle.request("page"):
+        # window 2, the foreground request holds the only spare slot
+        assert not throttle.try_background()
+    for _ in range(3):
+        throttle.success()
+    assert int(throttle.window) == 3
+    with throttle.request("page"):
+        assert throttle.try_background()
+        assert not throttle.try_background()
+        throttle.release_background("challenge")
+    assert throttle.in_flight == 0
+    assert int(throttle.window) == 2
+    # paused by the challenge until its cooldown ran out
+    assert not throttle.try_background()
+    clock.now = throttle.blocked_until
+    assert throttle.try_background()
+
+
+class Driver:
+    def __init__(
+        self, title, url="https://id.jobstreet.com/id/my-activity", widget=False
+    ):
+        self.result = [title, url, widget]
+
+    def execute_script(self, script):
+        return self.result
+
+
+def test_is_challenge_page():
+    assert not is_challenge_page(Driver("Lamaran saya | JobStreet"))
+    assert is_challenge_page(Driver("Just a moment..."))
+    assert is_challenge_page(Driver("429 Too Many Requests"))
+    assert is_challenge_page(Driver("503 Service Unavailable"))
+    assert is_challenge_page(Driver("JobStreet", widget=True))
@@ -0,0 +1,162 @@
+from driver_watchdog import DriverWedged, Watchdog, _descendants, kill_driver
+from selenium.common.exceptions import WebDriverException
+from scraper import JobStreetScraper
+from conftest import RESULTS_URL
+from types import SimpleNamespace
+import driver_watchdog
+import subprocess
+import threading
+import pytest
+import time
+import os
+
+
+@pytest.fixture(autouse=True)
+def fast_polls(monkeypatch):
+    monkeypatch.setattr(driver_watchdog, "POLL_INTERVAL", 0.005)
+
+
+@pytest.fixture
+def watchdog():
+    kills = []
+    watchdog = Watchdog(kill=lambda: kills.append(1), deadline=0.05)
+    watchdog.kills = kills
+    yield watchdog
+    watchdog.stop()
+
+
+def test_block_past_its_deadline_is_killed(watchdog):
+    with pytest.raises(DriverWedged, match="job 1 hung"):
+        with watchdog.watch("job 1"):
+            time.sleep(0.3)
+    assert watchdog.kills == [1]
+    assert watchdog.expired == "job 1"
+
+
+def test_the_failing_webdriver_call_becomes_driver_wedged():
+    killed = threading.Event()
+    watchdog = Watchdog(kill=killed.set, deadline=0.05)
+    with pytest.raises(DriverWedged) as raised:
+        with watchdog.watch("job 1"):
+            # a pending command fails once the service is killed
+            assert killed.wait(5)
+            raise WebDriverException("connection refused")
+    assert isinstance(raised.value.__cause__, WebDriverException)
+
+    # the scraper catches most WebDriver errors itself, leaving still raises
+    killed.clear()
+    with pytest.raises(DriverWedged):
+        with watchdog.watch("job 2"):
+            try:
+                assert killed.wait(5)
+                raise WebDriverException("connection refused")
+            except WebDriverException:
+                pass
+    watchdog.stop()
+
+
+def test_block_within_its_deadline_is_left_alone(watchdog):
+    with watchdog.watch("page 1 navigation", deadline=5):
+        time.sleep(0.1)
+    with watchdog.watch("job 1"):
+        pass
+    time.sleep(0.1)
+    assert watchdog.kills == []
+    assert watchdog.expired is None
+
+
+def test_excused_time_does_not_count():
+    kills = []
+    # every second of the block is spent waiting for the throttle
+    watchdog = Watchdog(
+        kill=lambda: kills.append(1), deadline=0.05, excused=time.monotonic
+    )
+    with watchdog.watch("job 1"):
+        time.sleep(0.3)
+    watchdog.stop()
+    assert kills == []
+
+
+def alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            state = f.read().rsplit(b")", 1)[1].split()[0]
+    except OSError:
+        return False
+    return state != b"Z"
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="reads /proc")
+def test_kill_driver_kills_the_service_and_its_browser():
+    # the shell stands in for chromedriver, the sleep for the browser it started
+    process = subprocess.Popen(["sh", "-c", "sleep 30 & wait"])
+    started = time.monotonic()
+    while not _descendants(process.pid) and time.monotonic() - started < 5:
+        time.sleep(0.01)
+    children = _descendants(process.pid)
+    assert children
+
+    kill_driver(SimpleNamespace(service=SimpleNamespace(process=process)))
+    assert process.poll() is not None
+    assert not any(alive(pid) for pid in children)
+
+
+def test_kill_driver_without_a_running_service():
+    kill_driver(None)
+    kill_driver(SimpleNamespace(service=None))
+    process = subprocess.Popen(["true"])
+    process.wait()
+    kill_driver(SimpleNamespace(service=SimpleNamespace(process=process)))
+
+
+@pytest.fixture
+def hanging(fake_scraper, monkeypatch):
+    """A watched scraper whose cards hang on the attempts listed in `hangs`"""
+    scraper = fake_scraper
+    killed = []
+    scraper.watchdog = Watchdog(
+        kill=lambda: killed.append(scraper.driver), deadline=0.05
+    )
+    scraper.attempts = []
+    scraper.hangs = set()
+    scraper.killed = killed
+
+    def scrape_card(self, i, card, job_info):
+        self.attempts.append((card.index, self.driver))
+        if len(self.attempts) in self.hangs:
+            kills = len(killed)
+            while len(killed) == kills:
+                time.sleep(0.005)
+            raise WebDriverException("connection refused")
+        return {**job_info, "card": card.index}
+
+    monkeypatch.setattr(JobStreetScraper, "_scrape_card", scrape_card)
+    yield scraper
+    scraper.watchdog.stop()
+
+
+def test_hung_card_restarts_the_browser_and_is_retried(hanging):
+    scraper = hanging
+    scraper.hangs = {2}
+    jobs = list(scraper._iter_page(2, 20))
+    assert [(job["id"], job["card"]) for job in jobs] == [(21, 1), (22, 2), (23, 3)]
+
+    first, second = scraper.drivers
+    assert scraper.killed == [first]
+    assert scraper.attempts == [(1, first), (2, first), (2, second), (3, second)]
+    assert scraper.restarts == 1
+    assert scraper.profiles.released == ["profiles/chrome-1"]
+    # the new browser is back on the same page with the session cookies
+    assert second.visited == [scraper.base_url, RESULTS_URL]
+    assert second.added_cookies == first.cookies
+    assert scraper.job_state == "idle"
+
+
+def test_card_hanging_twice_is_skipped(hanging):
+    scraper = hanging
+    scraper.hangs = {2, 3}
+    jobs = list(scraper._iter_page(2, 20))
+    assert [(job["id"], job["card"]) for job in jobs] == [(21, 1), (22, 3)]
+    assert [index for index, _ in scraper.attempts] == [1, 2, 2, 3]
+    assert scraper.restarts == 2
+    assert len(scraper.drivers) == 3
@@ -0,0 +1,75 @@
+from workqueue import RemoteQueue, WorkQueue, is_loopback, serve_queue
+import threading
+import urllib3
+import socket
+import pytest
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_is_loopback():
+    assert is_loopback("127.0.0.1")
+    assert is_loopback("::1")
+    assert is_loopback("localhost")
+    assert not is_loopback("0.0.0.0")
+    assert not is_loopback("192.168.1.10")
+    assert not is_loopback("coordinator")
+
+
+def test_serve_refuses_open_address_without_token(tmp_path, monkeypatch):
+    monkeypatch.delenv("JOBSTREET_QUEUE_TOKEN", raising=False)
+    queue = WorkQueue(str(tmp_path / "jobs.db"))
+    with pytest.raises(ValueError):
+        serve_queue(queue, "0.0.0.0", free_port())
+    queue.close()
+
+
+def test_serve_checks_token(tmp_path):
+    queue = WorkQueue(str(tmp_path / "jobs.db"))
+    port = free_port()
+    threading.Thread(
+        target=serve_queue,
+        args=(queue, "127.0.0.1", port, "secret"),
+        daemon=True,
+    ).start()
+    url = f"http://127.0.0.1:{port}"
+    good = RemoteQueue(url, token="secret")
+    bad = RemoteQueue(url, token="wrong")
+    for _ in range(50):
+        try:
+            assert good.counts()["pending"] == 0
+            break
+        except urllib3.exceptions.MaxRetryError:
+            threading.Event().wait(0.1)
+    with pytest.raises(RuntimeError, match="403"):
+        bad.counts()
+
+
+def test_remote_queue_only_retries_connects():
+    retries = RemoteQueue("http://127.0.0.1:1").http.connection_pool_kw["retries"]
+    assert retries.connect == 5
+    # a claim that reached the server is never sent twice
+    assert retries.read == retries.status == retries.other == 0
+
+
+def test_complete_needs_the_lease(tmp_path):
+    queue = WorkQueue(str(tmp_path / "jobs.db"))
+    queue.publish("page", [{"key": "page-1"}, {"key": "page-2"}])
+    # worker a hangs past its lease, worker b takes the page over
+    stalled = queue.claim("a", lease=-1)
+    taken = queue.claim("b")
+    assert taken["id"] == stalled["id"]
+    assert not queue.complete(stalled["id"], "a", [{"job_url": "from a"}])
+    assert queue.complete(taken["id"], "b", [{"job_url": "from b"}])
+    assert not queue.complete(taken["id"], "b", [{"job_url": "again"}])
+
+    # an expired lease nobody took over still counts
+    late = queue.claim("a", lease=-1)
+    assert queue.complete(late["id"], "a", [{"job_url": "late"}])
+    assert list(queue.iter_results()) == [{"job_url": "from b"}, {"job_url": "late"}]
+    assert queue.counts()["done"] == 2
+    queue.close()
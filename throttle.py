@@ -0,0 +1,210 @@
+from collections import Counter
+from contextlib import contextmanager
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+INITIAL_RATE = 0.5  # requests per second
+MIN_RATE = 0.1
+MAX_RATE = 4.0
+BURST = 2
+RATE_STEP = 0.05  # additive increase per successful request
+BACKOFF_FACTOR = 0.5  # multiplicative decrease on trouble
+MAX_CONCURRENCY = 3  # foreground request plus background tabs
+SLOW_AFTER = 8.0  # seconds, slower responses count as pushback
+CHALLENGE_COOLDOWN = 30.0  # seconds, doubled for each consecutive challenge
+MAX_COOLDOWN = 300.0
+
+CHALLENGE_SCRIPT = """
+return [
+    document.title,
+    location.href,
+    !!document.querySelector(
+        "#challenge-form, #cf-challenge-running, iframe[src*='captcha'], "
+        + "iframe[src*='challenges'], [data-sitekey]"
+    ),
+];
+"""
+CHALLENGE_MARKERS = (
+    "just a moment",
+    "attention required",
+    "access denied",
+    "verify you are human",
+    "are you a robot",
+    "captcha",
+    "/cdn-cgi/challenge",
+    # rate limit pages (429, 503), the browser never exposes the status code
+    "too many requests",
+    "rate limited",
+    "service unavailable",
+)
+
+
+def is_challenge_page(driver):
+    """True when the current tab shows a bot check instead of the site"""
+    try:
+        title, url, has_widget = driver.execute_script(CHALLENGE_SCRIPT)
+    except Exception:
+        return False
+    page = f"{title} {url}".lower()
+    return has_widget or any(marker in page for marker in CHALLENGE_MARKERS)
+
+
+class Request:
+    """One gated request, marked failed by the caller on timeout or challenge"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.reason = None
+
+    def fail(self, reason):
+        self.reason = reason
+
+
+class AdaptiveThrottle:
+    """Token bucket request rate with AIMD controlled rate and concurrency
+
+    Every page navigation and detail fetch takes a token first. Each clean,
+    fast response raises the refill rate by RATE_STEP and grows the
+    concurrency window by 1/window, like TCP congestion avoidance. A
+    timeout, a slow response or a challenge page multiplies both by
+    BACKOFF_FACTOR, and a challenge also pauses all requests for a
+    cooldown. The scraper settles around the fastest rate the site accepts.
+
+    One request is always allowed in flight; slots above it are used by
+    background work such as the prefetched next page.
+    """
+
+    def __init__(
+        self,
+        rate=INITIAL_RATE,
+        min_rate=MIN_RATE,
+        max_rate=MAX_RATE,
+        burst=BURST,
+        max_concurrency=MAX_CONCURRENCY,
+        slow_after=SLOW_AFTER,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.rate = min(max(rate, min_rate), self.max_rate)
+        self.burst = burst
+        self.tokens = float(burst)
+        self.max_concurrency = max_concurrency
+        self.window = min(2.0, float(max_concurrency))
+        self.slow_after = slow_after
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.challenge_streak = 0
+        self.last_refill = time.monotonic()
+        self.started_at = None
+
+        self.completed = 0
+        self.waited = 0.0
+        self.backoffs = Counter()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.last_refill) * self.rate
+        )
+        self.last_refill = now
+        return now
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        now = self._refill()
+        if self.started_at is None:
+            self.started_at = now
+
+        delay = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            delay = max(delay, (1 - self.tokens) / self.rate)
+        if delay:
+            self.waited += delay
+            time.sleep(delay)
+            self._refill()
+        self.tokens = max(0.0, self.tokens - 1)
+
+    @contextmanager
+    def request(self, kind):
+        """Gate one foreground request and feed its outcome to the controller"""
+        self.acquire()
+        request = Request(kind)
+        self.in_flight += 1
+        start = time.monotonic()
+        try:
+            yield request
+        except Exception:
+            request.reason = request.reason or "error"
+            raise
+        finally:
+            self.in_flight -= 1
+            elapsed = time.monotonic() - start
+            if request.reason is None and elapsed > self.slow_after:
+                request.fail("slow")
+            if request.reason:
+                self.backoff(kind, request.reason)
+            else:
+                self.success()
+
+    def try_background(self):
+        """Take a slot for background work, False when the window is full"""
+        # keep one slot free for the foreground request
+        if (
+            self.in_flight + 1 >= int(self.window)
+            or time.monotonic() < self.blocked_until
+        ):
+            return False
+        self.acquire()
+        self.in_flight += 1
+        return True
+
+    def release_background(self, reason=None):
+        self.in_flight = max(0, self.in_flight - 1)
+        if reason:
+            self.backoff("background", reason)
+        else:
+            self.success()
+
+    def success(self):
+        self.completed += 1
+        self.challenge_streak = 0
+        self.rate = min(self.max_rate, self.rate + RATE_STEP)
+        self.window = min(self.max_concurrency, self.window + 1 / self.window)
+
+    def backoff(self, kind, reason):
+        self.backoffs[reason] += 1
+        self.rate = max(self.min_rate, self.rate * BACKOFF_FACTOR)
+        self.window = max(1.0, self.window * BACKOFF_FACTOR)
+        self.tokens = 0.0
+
+        if reason == "challenge":
+            cooldown = min(MAX_COOLDOWN, CHALLENGE_COOLDOWN * 2**self.challenge_streak)
+            self.challenge_streak += 1
+            self.blocked_until = time.monotonic() + cooldown
+            logger.warning(
+                "Challenge page on %s request, pausing %.0fs, rate %.2f req/s",
+                kind,
+                cooldown,
+                self.rate,
+            )
+        else:
+            logger.warning(
+                "Backing off after %s %s request, rate %.2f req/s, concurrency %s",
+                reason,
+                kind,
+                self.rate,
+                int(self.window),
+            )
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            "rate": round(self.rate, 2),
+            "concurrency": int(self.window),
+            "requests": self.completed + sum(self.backoffs.values()),
+            "achieved_rate": round(self.completed / elapsed, 2) if elapsed else 0.0,
+            "waited_s": round(self.waited, 1),
+            "backoffs": dict(self.backoffs),
+        }
@@ -0,0 +1,336 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from contextlib import contextmanager
+from helpers import record_key
+import ipaddress
+import threading
+import logging
+import sqlite3
+import socket
+import hmac
+import json
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = 300  # a worker that stops extending for this long loses its item
+MAX_ATTEMPTS = 3
+TOKEN_ENV = "JOBSTREET_QUEUE_TOKEN"
+TOKEN_HEADER = "X-Queue-Token"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    item_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (item_id, seq)
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def is_loopback(host):
+    """Whether host only accepts connections from this machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        # a hostname may resolve to any interface
+        return False
+
+
+class WorkQueue:
+    """Durable SQLite work queue with leases
+
+    Items are claimed with a lease that the worker extends while it works.
+    A lease that runs out (the worker died or hung) makes the item
+    claimable again, up to MAX_ATTEMPTS claims. Results are stored per
+    item and replaced when an item is done twice, so retries never
+    duplicate records.
+    """
+
+    METHODS = (
+        "publish",
+        "claim",
+        "extend",
+        "complete",
+        "fail",
+        "counts",
+        "set_meta",
+        "get_meta",
+    )
+
+    def __init__(self, path, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        # autocommit, transactions are opened explicitly where needed
+        self.db = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, two claims never race
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def publish(self, kind, items):
+        """Add work items, each a dict with a unique "key", known keys are skipped"""
+        added = 0
+        with self._transaction() as db:
+            (position,) = db.execute(
+                "SELECT COALESCE(MAX(position), 0) FROM items"
+            ).fetchone()
+            for item in items:
+                position += 1
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO items (kind, key, position, payload, "
+                    "updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (kind, item["key"], position, json.dumps(item), time.time()),
+                )
+                added += cursor.rowcount
+        return added
+
+    def claim(self, owner, lease=LEASE_SECONDS):
+        """Lease the next pending or expired item, None when nothing is left"""
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT id, kind, payload, attempts, status FROM items "
+                "WHERE (status = 'pending' OR (status = 'leased' AND lease_until < ?)) "
+                "AND attempts < ? ORDER BY position LIMIT 1",
+                (now, self.max_attempts),
+            ).fetchone()
+            if row is None:
+                return None
+            item_id, kind, payload, attempts, status = row
+            if status == "leased":
+                logger.warning("Lease of item %s expired, retrying it", item_id)
+            db.execute(
+                "UPDATE items SET status = 'leased', owner = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (owner, now + lease, now, item_id),
+            )
+        return {
+            "id": item_id,
+            "kind": kind,
+            "attempt": attempts + 1,
+            **json.loads(payload),
+        }
+
+    def extend(self, item_id, owner, lease=LEASE_SECONDS):
+        """Renew a lease, False when the item was taken over by another worker"""
+        cursor = self.db.execute(
+            "UPDATE items SET lease_until = ?, updated_at = ? "
+            "WHERE id = ? AND owner = ? AND status = 'leased'",
+            (time.time() + lease, time.time(), item_id, owner),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, item_id, owner, records):
+        """Store the records of an item and mark it done
+
+        False when the lease was taken over by another worker, whose
+        records count instead of these.
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE items SET status = 'done', lease_until = NULL, "
+                "error = NULL, updated_at = ? "
+                "WHERE id = ? AND owner = ? AND status = 'leased'",
+                (time.time(), item_id, owner),
+            )
+            if cursor.rowcount != 1:
+                return False
+            db.execute("DELETE FROM results WHERE item_id = ?", (item_id,))
+            db.executemany(
+                "INSERT INTO results (item_id, seq, record) VALUES (?, ?, ?)",
+                [
+                    (item_id, seq, json.dumps(record, ensure_ascii=False))
+                    for seq, record in enumerate(records)
+                ],
+            )
+        return True
+
+    def fail(self, item_id, owner, error):
+        """Give an item back, it is retried until MAX_ATTEMPTS claims"""
+        self.db.execute(
+            "UPDATE items SET status = CASE WHEN attempts < ? THEN 'pending' "
+            "ELSE 'failed' END, lease_until = NULL, error = ?, updated_at = ? "
+            "WHERE id = ? AND owner = ?",
+            (self.max_attempts, str(error), time.time(), item_id, owner),
+        )
+
+    def counts(self):
+        """Items per status, expired leases counted as pending"""
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        rows = self.db.execute(
+            "SELECT CASE WHEN status = 'leased' AND lease_until < ? THEN "
+            "CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END "
+            "ELSE status END, COUNT(*) FROM items GROUP BY 1",
+            (time.time(), self.max_attempts),
+        )
+        counts.update(dict(rows))
+        return counts
+
+    def set_meta(self, key, value):
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (key, json.dumps(value)),
+        )
+
+    def get_meta(self, key, default=None):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def iter_results(self):
+        """Stored records in publish order, then in order within their item"""
+        rows = self.db.execute(
+            "SELECT results.record FROM results JOIN items ON items.id = "
+            "results.item_id ORDER BY items.position, results.seq"
+        )
+        for (record,) in rows:
+            yield json.loads(record)
+
+    def close(self):
+        self.db.close()
+
+
+def collect_results(queue):
+    """Results of all done items, first occurrence of every job kept"""
+    seen = set()
+    records = []
+    for record in queue.iter_results():
+        key = record_key(record)
+        if key in seen:
+            continue
+        seen.add(key)
+        records.append(record)
+    return records
+
+
+class RemoteQueue:
+    """WorkQueue methods over HTTP, for workers on other machines"""
+
+    def __init__(self, url, token=None):
+        import urllib3
+
+        self.url = url.rstrip("/")
+        self.headers = {"Content-Type": "application/json"}
+        token = token or os.environ.get(TOKEN_ENV)
+        if token:
+            self.headers[TOKEN_HEADER] = token
+        # only failed connects are retried, the request never reached the
+        # server then. A replayed claim would lease a second item.
+        self.http = urllib3.PoolManager(
+            retries=urllib3.Retry(
+                total=5,
+                connect=5,
+                read=0,
+                status=0,
+                other=0,
+                backoff_factor=1,
+                allowed_methods=None,
+            )
+        )
+
+    def _call(self, method, *args):
+        response = self.http.request(
+            "POST",
+            f"{self.url}/{method}",
+            body=json.dumps(args),
+            headers=self.headers,
+        )
+        if response.status != 200:
+            raise RuntimeError(
+                f"Queue {method} failed: HTTP {response.status} {response.data[:200]!r}"
+            )
+        return json.loads(response.data)
+
+    def __getattr__(self, method):
+        if method not in WorkQueue.METHODS:
+            raise AttributeError(method)
+        return lambda *args: self._call(method, *args)
+
+    def close(self):
+        self.http.clear()
+
+
+def open_queue(target):
+    """A WorkQueue for a file path, a RemoteQueue for an http(s) url"""
+    if target.startswith(("http://", "https://")):
+        return RemoteQueue(target)
+    return WorkQueue(target)
+
+
+def serve_queue(queue, host="127.0.0.1", port=8765, token=None):
+    """Expose a WorkQueue over HTTP until interrupted
+
+    Any address but a loopback one needs a token, the queue hands out the
+    session cookies of the account.
+    """
+    token = token or os.environ.get(TOKEN_ENV)
+    if not token and not is_loopback(host):
+        raise ValueError(f"Serving on {host} needs a token in {TOKEN_ENV}")
+    # one sqlite connection serves every request thread, one call at a time
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            method = self.path.strip("/")
+            sent = self.headers.get(TOKEN_HEADER, "")
+            if token and not hmac.compare_digest(sent.encode(), token.encode()):
+                return self._reply(403, {"error": "bad token"})
+            if method not in WorkQueue.METHODS:
+                return self._reply(404, {"error": f"unknown method {method}"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                args = json.loads(self.rfile.read(length) or b"[]")
+                with lock:
+                    result = getattr(queue, method)(*args)
+            except (TypeError, ValueError, sqlite3.Error) as e:
+                return self._reply(400, {"error": str(e)})
+            self._reply(200, result)
+
+        def _reply(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            logger.debug("Queue request: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    logger.info("Serving work queue %s on http://%s:%s", queue.path, host, port)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()